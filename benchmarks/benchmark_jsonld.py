@@ -0,0 +1,91 @@
+"""Benchmark of the JSON-LD serialization of a Standard Name Table.
+
+Compares the direct serializer (`ssnolib.jsonld`) with the generic ontolutils
+serialization (`Thing.get_jsonld_dict`) and the rdflib graph round-trip
+(`model_dump_jsonld(rdflib_serialize=True)`) and checks that all of them
+describe the same RDF graph.
+
+Usage:
+
+    python benchmarks/benchmark_jsonld.py [--source cf-standard-name-table.xml] [--repeat 3] [--memory]
+
+By default, the current CF Standard Name Table is downloaded.
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+import rdflib
+from ontolutils import Thing
+
+from ssnolib import StandardNameTable, jsonld
+from ssnolib.dcat import Distribution
+
+CF_URL = 'http://cfconventions.org/Data/cf-standard-names/current/src/cf-standard-name-table.xml'
+
+
+def _generic(snt) -> str:
+    return json.dumps(Thing.get_jsonld_dict(snt, resolve_keys=True), indent=4)
+
+
+def _rdflib(snt) -> str:
+    jsonld_dict = Thing.get_jsonld_dict(snt, resolve_keys=True)
+    g = rdflib.Graph()
+    g.parse(data=json.dumps(jsonld_dict), format='json-ld')
+    return g.serialize(format='json-ld', context=jsonld_dict['@context'], indent=4)
+
+
+def _direct(snt) -> str:
+    return jsonld.dump_jsonld(snt)
+
+
+def _measure(func, snt, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = func(snt)
+        timings.append(time.perf_counter() - t0)
+    return result, min(timings)
+
+
+def _measure_memory(func, snt) -> int:
+    tracemalloc.start()
+    try:
+        func(snt)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--source', default=None, help='Table file (default: download the CF table)')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of repetitions (best is reported)')
+    parser.add_argument('--memory', action='store_true', help='Report the peak memory (slow)')
+    args = parser.parse_args()
+
+    if args.source is None:
+        source = Distribution(title='CF Standard Name Table', download_URL=CF_URL, media_type='text/xml')
+    else:
+        source = args.source
+    snt = StandardNameTable.parse(source)
+    print(f'Table with {len(snt.standard_names or [])} standard names')
+
+    results = {}
+    for name, func in (('direct', _direct), ('generic', _generic), ('rdflib', _rdflib)):
+        result, seconds = _measure(func, snt, args.repeat)
+        results[name] = result
+        line = f'{name:>8}: {seconds:8.3f} s'
+        if args.memory:
+            line += f', peak memory {_measure_memory(func, snt) / 1024 ** 2:8.1f} MiB'
+        print(line, flush=True)
+
+    # all paths use the IDs of the objects, so the triples (including blank nodes) are comparable
+    triples = {name: set(rdflib.Graph().parse(data=result, format='json-ld')) for name, result in results.items()}
+    for name in ('generic', 'rdflib'):
+        print(f'direct and {name} graphs are equal: {triples["direct"] == triples[name]}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Read-only view of zip archives, e.g. distributions like the PIV challenge datasets.
+
+The members are listed from the central directory of the archive, without
+reading the compressed data. Members are read lazily: `Archive.open()` returns a
+file object, which decompresses the member while it is read, so members are
+neither extracted to disk nor held in memory completely.
+"""
+import pathlib
+import zipfile
+from typing import BinaryIO, Iterator, List, Union
+
+
+class Archive:
+    """Read-only view of a zip archive
+
+    Parameters
+    ----------
+    file: Union[str, pathlib.Path, BinaryIO]
+        The zip file or a seekable binary file object
+    """
+
+    def __init__(self, file: Union[str, pathlib.Path, BinaryIO]):
+        try:
+            self._zipfile = zipfile.ZipFile(file, 'r')
+        except zipfile.BadZipFile as e:
+            raise ValueError(f'{file} is not a zip archive') from e
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self._zipfile.filename})'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Close the archive. Open members can no longer be read."""
+        self._zipfile.close()
+
+    def members(self) -> List[str]:
+        """Return the names of the files in the archive (without directories)"""
+        return [info.filename for info in self._zipfile.infolist() if not info.is_dir()]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.members())
+
+    def __len__(self) -> int:
+        return len(self.members())
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.members()
+
+    def info(self, name: str) -> zipfile.ZipInfo:
+        """Return the information of a member (size, compressed size, date, ...)"""
+        try:
+            return self._zipfile.getinfo(name)
+        except KeyError:
+            raise KeyError(f'No member "{name}" in the archive') from None
+
+    def open(self, name: str) -> BinaryIO:
+        """Return a binary file object of a member, which is decompressed while it is read"""
+        return self._zipfile.open(self.info(name), 'r')
+
+    def read(self, name: str) -> bytes:
+        """Return the content of a member"""
+        with self.open(name) as f:
+            return f.read()
+
+    def find(self, pattern: str) -> List[str]:
+        """Return the names of the members matching a glob pattern, e.g. "*.xml" """
+        return [name for name in self.members() if pathlib.PurePosixPath(name).match(pattern)]
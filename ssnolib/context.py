@@ -1 +1,232 @@
-SSNO = "https://raw.githubusercontent.com/matthiasprobst/ssno/main/ssno_context.jsonld"
\ No newline at end of file
+"""JSON-LD contexts and a resolver for remote contexts.
+
+Remote contexts (e.g. `ssnolib.CONTEXT`, usually referenced with `@import`) are
+fetched by the JSON-LD processor whenever a document is parsed or serialized.
+The `ContextResolver` keeps the context documents in a store in the cache
+directory and inlines them into the documents before they are handed to rdflib,
+so that no network access is needed once a context is stored. Stored contexts
+are revalidated after `ttl` seconds (conditional request with the ETag or the
+Last-Modified date). In offline mode, the network is never accessed.
+"""
+import hashlib
+import json
+import os
+import pathlib
+import time
+import uuid
+import warnings
+from typing import Dict, Optional, Union
+
+import requests
+
+from .utils import get_cache_dir
+
+SSNO = "https://raw.githubusercontent.com/matthiasprobst/ssno/main/ssno_context.jsonld"
+
+DEFAULT_TTL = 7 * 24 * 3600  # seconds
+OFFLINE_ENV = 'SSNOLIB_OFFLINE'
+
+
+def get_context_dir() -> pathlib.Path:
+    """Return the context store directory and create it if it does not exist"""
+    context_dir = get_cache_dir() / 'contexts'
+    context_dir.mkdir(parents=True, exist_ok=True)
+    return context_dir
+
+
+def _is_remote(iri) -> bool:
+    return isinstance(iri, str) and iri.startswith(('http://', 'https://'))
+
+
+class ContextResolver:
+    """Loads remote JSON-LD contexts from a local store and inlines them into documents.
+
+    Parameters
+    ----------
+    directory: Optional[Union[str, pathlib.Path]]
+        The directory of the store. Defaults to "contexts" in the cache directory.
+    ttl: Optional[float]=DEFAULT_TTL
+        Seconds after which a stored context is revalidated. If None, stored
+        contexts are never revalidated.
+    offline: Optional[bool]
+        Never access the network. Contexts, which are not stored, raise a KeyError.
+        Defaults to True if the environment variable SSNOLIB_OFFLINE is set to "1".
+    timeout: float=10
+        Timeout of a request in seconds
+    """
+
+    def __init__(self,
+                 directory: Optional[Union[str, pathlib.Path]] = None,
+                 ttl: Optional[float] = DEFAULT_TTL,
+                 offline: Optional[bool] = None,
+                 timeout: float = 10):
+        self.directory = get_context_dir() if directory is None else pathlib.Path(directory)
+        self.ttl = ttl
+        if offline is None:
+            offline = os.environ.get(OFFLINE_ENV, '0') == '1'
+        self.offline = offline
+        self.timeout = timeout
+        self._entries: Dict[str, Dict] = {}
+        self.stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'stale': 0}
+
+    def _filename(self, url: str) -> pathlib.Path:
+        return self.directory / f'{hashlib.sha256(url.encode()).hexdigest()}.json'
+
+    def _read_entry(self, url: str) -> Optional[Dict]:
+        entry = self._entries.get(url, None)
+        if entry is None:
+            try:
+                with open(self._filename(url), 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                return None
+            self._entries[url] = entry
+        return entry
+
+    def _write_entry(self, url: str, document: Dict, etag: Optional[str] = None,
+                     last_modified: Optional[str] = None) -> Dict:
+        entry = {'url': url, 'fetched': time.time(), 'etag': etag, 'last_modified': last_modified,
+                 'document': document}
+        self.directory.mkdir(parents=True, exist_ok=True)
+        filename = self._filename(url)
+        # write to a temporary file first, so that concurrent readers never see a partial entry
+        tmp_filename = filename.with_suffix(f'.{uuid.uuid4().hex}.tmp')
+        with open(tmp_filename, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp_filename, filename)
+        self._entries[url] = entry
+        return entry
+
+    def _fetch(self, url: str, entry: Optional[Dict] = None) -> Dict:
+        headers = {'Accept': 'application/ld+json, application/json;q=0.9, */*;q=0.1'}
+        if entry is not None:
+            if entry.get('etag', None):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified', None):
+                headers['If-Modified-Since'] = entry['last_modified']
+        response = requests.get(url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and entry is not None:
+            self.stats['revalidated'] += 1
+            return self._write_entry(url, entry['document'], etag=entry.get('etag', None),
+                                     last_modified=entry.get('last_modified', None))
+        response.raise_for_status()
+        document = json.loads(response.content)
+        if not isinstance(document, dict):
+            raise ValueError(f'The context document of {url} is not a JSON object')
+        return self._write_entry(url, document,
+                                 etag=response.headers.get('ETag', None),
+                                 last_modified=response.headers.get('Last-Modified', None))
+
+    def load(self, url: str) -> Dict:
+        """Return the context document of a URL (the document loader).
+
+        Parameters
+        ----------
+        url: str
+            The URL of the context document
+
+        Returns
+        -------
+        Dict
+            The context document, e.g. {"@context": {...}}
+        """
+        entry = self._read_entry(url)
+        if entry is None:
+            self.stats['misses'] += 1
+            if self.offline:
+                raise KeyError(f'Context "{url}" is not stored and the resolver is offline')
+            return self._fetch(url)['document']
+        if self.offline or self.ttl is None or time.time() - entry['fetched'] < self.ttl:
+            self.stats['hits'] += 1
+            return entry['document']
+        try:
+            return self._fetch(url, entry)['document']
+        except (requests.RequestException, ValueError) as e:
+            self.stats['stale'] += 1
+            warnings.warn(f'Could not revalidate context "{url}" ({e}). Using the stored context.', UserWarning)
+            return entry['document']
+
+    def preload(self, url: str, document: Optional[Union[Dict, str, pathlib.Path]] = None) -> Dict:
+        """Store a context document, e.g. to prepare a machine without network access.
+
+        Parameters
+        ----------
+        url: str
+            The URL of the context document
+        document: Optional[Union[Dict, str, pathlib.Path]]
+            The context document or the filename of it. If None, the document is
+            downloaded (even if it is already stored).
+
+        Returns
+        -------
+        Dict
+            The context document
+        """
+        if document is None:
+            if self.offline:
+                raise KeyError(f'Cannot download context "{url}", the resolver is offline')
+            return self._fetch(url)['document']
+        if not isinstance(document, dict):
+            with open(document, 'r', encoding='utf-8') as f:
+                document = json.load(f)
+        return self._write_entry(url, document)['document']
+
+    def _inline(self, context, imported: frozenset):
+        if _is_remote(context):
+            if context in imported:
+                raise ValueError(f'Recursive context inclusion of "{context}"')
+            return self._inline(self.load(context).get('@context', {}), imported | {context})
+        if isinstance(context, list):
+            contexts = []
+            for ctx in context:
+                ctx = self._inline(ctx, imported)
+                contexts.extend(ctx if isinstance(ctx, list) else [ctx])
+            return contexts
+        if not isinstance(context, dict):
+            return context
+        context = {k: ({**v, '@context': self._inline(v['@context'], imported)}
+                       if isinstance(v, dict) and '@context' in v else v)
+                   for k, v in context.items()}
+        if _is_remote(context.get('@import', None)):
+            base = self._inline(context.pop('@import'), imported)
+            if isinstance(base, dict):
+                # the local definitions override the imported ones
+                return {**base, **context}
+            return [*base, context]
+        return context
+
+    def resolve(self, document):
+        """Return a copy of a JSON-LD document, in which all remote contexts
+        (also the ones imported with "@import") are replaced by their content."""
+        if isinstance(document, list):
+            return [self.resolve(d) for d in document]
+        if not isinstance(document, dict):
+            return document
+        return {k: self._inline(v, frozenset()) if k == '@context' else self.resolve(v)
+                for k, v in document.items()}
+
+    def clear(self):
+        """Remove all stored contexts"""
+        self._entries.clear()
+        if self.directory.exists():
+            for filename in self.directory.glob('*.json'):
+                filename.unlink(missing_ok=True)
+
+
+_resolver: Optional[ContextResolver] = None
+
+
+def get_resolver() -> ContextResolver:
+    """Return the resolver used by ssnolib"""
+    global _resolver
+    if _resolver is None:
+        _resolver = ContextResolver()
+    return _resolver
+
+
+def set_resolver(resolver: ContextResolver) -> ContextResolver:
+    """Set the resolver used by ssnolib, e.g. an offline resolver. Returns the previous one."""
+    global _resolver
+    previous = get_resolver()
+    _resolver = resolver
+    return previous
@@ -79,9 +79,14 @@ class Thing(SSNOlibModel):
                        **_atemp_json_dict}
                   ]}
 
-        g.parse(data=json.dumps(jsonld), format='json-ld')
+        # remote contexts are taken from the context store instead of being fetched by rdflib
+        from .context import get_resolver
+        resolved = get_resolver().resolve(jsonld)
+        g.parse(data=json.dumps(resolved), format='json-ld')
         if context:
-            return g.serialize(format='json-ld',
-                               context={"@import": context},
-                               indent=4)
+            serialization = json.loads(g.serialize(format='json-ld',
+                                                   context=resolved['@context'],
+                                                   indent=4))
+            serialization['@context'] = {"@import": context}
+            return json.dumps(serialization, indent=4)
         return g.serialize(format='json-ld', indent=4)
@@ -1,3 +1,3 @@
-from .resource import Dataset, Distribution, Resource
+from .resource import Catalog, Dataset, Distribution, DownloadResult, Resource
 
-__all__ = ['Dataset', 'Distribution', 'Resource']
\ No newline at end of file
+__all__ = ['Catalog', 'Dataset', 'Distribution', 'DownloadResult', 'Resource']
@@ -2,20 +2,28 @@
 - dcat:Resource
 - dcat:Distribution
 - dcat:Dataset
+- dcat:Catalog
 """
+import asyncio
+import mmap
+import os
 import pathlib
 import re
 import shutil
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Union, List
+from typing import Callable, Union, List, NamedTuple, Optional
 
 import pydantic
+import requests
 from dateutil import parser
 from pydantic import HttpUrl, FileUrl, field_validator, Field
 
 from ontolutils import Thing
 from ontolutils import urirefs, namespaces
 from ..prov import Person, Organization, Agent
+from ssnolib.archive import Archive
+from ssnolib.download import run_download
 from ssnolib.utils import download_file
 
 
@@ -124,34 +132,99 @@ class Distribution(Resource):
                  exist_ok: bool = False,
                  **kwargs) -> pathlib.Path:
         """Downloads the distribution
-        kwargs are passed to the download_file function, which goes to requests.get()"""
+        kwargs are passed to the download_file function, which goes to requests.get().
+        Downloads are cached and revalidated with the server (see `ssnolib.download`)."""
 
         if self.download_URL is None:
             raise ValueError('The downloadURL is not defined')
 
-        def _parse_file_url(furl):
-            """in windows, we might need to strip the leading slash"""
-            fname = pathlib.Path(furl)
-            if fname.exists():
-                return fname
-            fname = pathlib.Path(self.download_URL.path[1:])
-            if fname.exists():
-                return fname
-            raise FileNotFoundError(f'File {self.download_URL.path} does not exist')
-
         if self.download_URL.scheme == 'file':
             if dest_filename is None:
-                return _parse_file_url(self.download_URL.path)
+                return self._file_url_path()
             else:
-                return shutil.copy(_parse_file_url(self.download_URL.path), dest_filename)
+                return shutil.copy(self._file_url_path(), dest_filename)
         dest_filename = pathlib.Path(dest_filename or self.download_URL.path.split('/')[-1])
-        if dest_filename.exists():
-            return dest_filename
+        # an existing file is only returned without revalidation if exist_ok is True
+        kwargs.setdefault('byte_size', self.byte_size)
         return download_file(self.download_URL,
                              dest_filename,
                              exist_ok=exist_ok,
                              **kwargs)
 
+    def _file_url_path(self) -> pathlib.Path:
+        """Return the path of a file:// download URL"""
+        fname = pathlib.Path(self.download_URL.path)
+        if fname.exists():
+            return fname
+        # in windows, we might need to strip the leading slash
+        fname = pathlib.Path(self.download_URL.path[1:])
+        if fname.exists():
+            return fname
+        raise FileNotFoundError(f'File {self.download_URL.path} does not exist')
+
+    def local_path(self, **kwargs) -> pathlib.Path:
+        """Return the path of a local copy of the distribution without copying it:
+        the file of a file:// URL or the file in the download cache, which is
+        revalidated (see `ssnolib.download`). The file must not be modified.
+        kwargs are passed to the download_file function."""
+        if self.download_URL is None:
+            raise ValueError('The downloadURL is not defined')
+        if self.download_URL.scheme == 'file':
+            return self._file_url_path()
+        kwargs.setdefault('byte_size', self.byte_size)
+        return download_file(self.download_URL, None, **kwargs)
+
+    def open(self, mode: str = 'rb', **kwargs):
+        """Open the local copy of the distribution (see `local_path()`).
+
+        Parameters
+        ----------
+        mode: str='rb'
+            "rb" returns a binary file object, "mmap" a read-only memory map of
+            the file, which can be sliced without copying and reading the file
+        **kwargs
+            Passed to `local_path()`
+
+        Returns
+        -------
+        Union[BinaryIO, mmap.mmap]
+            The file object or the memory map. Both can be used as context manager.
+        """
+        if mode not in ('rb', 'mmap'):
+            raise ValueError(f'Invalid mode "{mode}". Expected "rb" or "mmap"')
+        filename = self.local_path(**kwargs)
+        if mode == 'rb':
+            return open(filename, 'rb')
+        with open(filename, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                raise ValueError(f'Cannot map the empty file {filename}')
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def buffer(self, **kwargs) -> memoryview:
+        """Return a read-only memoryview of the memory-mapped local copy of the
+        distribution (see `open()`). The file is unmapped once the memoryview
+        (and all slices of it) are released or garbage collected."""
+        return memoryview(self.open('mmap', **kwargs))
+
+    def archive(self, **kwargs) -> Archive:
+        """Return a read-only view of the distribution, if it is a zip archive.
+        The members are listed and read from the local copy (see `local_path()`)
+        without extracting them. kwargs are passed to `local_path()`."""
+        return Archive(self.local_path(**kwargs))
+
+    async def adownload(self,
+                        dest_filename: Union[str, pathlib.Path] = None,
+                        exist_ok: bool = False,
+                        semaphore: asyncio.Semaphore = None,
+                        executor: Executor = None,
+                        **kwargs) -> pathlib.Path:
+        """Awaitable version of `download()`, which runs the download in an executor.
+        The number of concurrent downloads is bounded by `semaphore` (by default
+        one per event loop, see `ssnolib.download.run_download`). Cancelling the
+        task stops the download."""
+        return await run_download(self.download, dest_filename, exist_ok,
+                                  semaphore=semaphore, executor=executor, **kwargs)
+
     @field_validator('media_type', mode='before')
     @classmethod
     def _mediaType(cls, mediaType):
@@ -174,6 +247,104 @@ class Distribution(Resource):
         return downloadURL
 
 
+class DownloadResult(NamedTuple):
+    """Result of the download of a distribution by `Dataset.download_all()`
+
+    Parameters
+    ----------
+    distribution: Distribution
+        The distribution
+    filename: Optional[pathlib.Path]
+        The downloaded file or None, if the download failed
+    error: Optional[Exception]
+        The error, if the download failed
+    """
+    distribution: Distribution
+    filename: Optional[pathlib.Path]
+    error: Optional[Exception]
+
+
+def _dest_filenames(distributions: List[Distribution], dest_dir: pathlib.Path) -> List[pathlib.Path]:
+    """Return unique destination filenames based on the names in the download URLs"""
+    filenames = []
+    used = set()
+    for i, distribution in enumerate(distributions):
+        url = distribution.download_URL
+        name = url.path.split('/')[-1] if url is not None and url.path else ''
+        name = name or f'distribution_{i}'
+        unique_name, n = name, i
+        while unique_name in used:
+            unique_name = f'{n}_{name}'
+            n += 1
+        name = unique_name
+        used.add(name)
+        filenames.append(dest_dir / name)
+    return filenames
+
+
+def download_distributions(distributions: List[Distribution],
+                           dest_dir: Union[str, pathlib.Path],
+                           max_workers: int = 8,
+                           progress: Callable[[DownloadResult, int, int], None] = None,
+                           session: requests.Session = None,
+                           **kwargs) -> List[DownloadResult]:
+    """Downloads distributions in parallel threads, which share a pooled HTTP session.
+    A failed download does not abort the others.
+
+    Parameters
+    ----------
+    distributions: List[Distribution]
+        The distributions to download
+    dest_dir: Union[str, pathlib.Path]
+        The destination directory. The files are named like in the download URLs.
+    max_workers: int=8
+        The maximal number of parallel downloads
+    progress: Callable[[DownloadResult, int, int], None]=None
+        Called whenever a download finished with its result, the number of
+        finished downloads and the total number of downloads
+    session: requests.Session=None
+        The session to use. By default, a session with a connection pool of
+        size max_workers is created.
+    **kwargs
+        Additional keyword arguments passed to `Distribution.download()`
+
+    Returns
+    -------
+    List[DownloadResult]
+        The results in the order of the distributions
+    """
+    dest_dir = pathlib.Path(dest_dir)
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    n = len(distributions)
+    results: List[Optional[DownloadResult]] = [None] * n
+    if n == 0:
+        return []
+    own_session = session is None
+    if own_session:
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(distribution.download, filename, session=session, **kwargs): i
+                       for i, (distribution, filename) in enumerate(zip(distributions,
+                                                                        _dest_filenames(distributions, dest_dir)))}
+            for n_done, future in enumerate(as_completed(futures), 1):
+                i = futures[future]
+                try:
+                    result = DownloadResult(distributions[i], pathlib.Path(future.result()), None)
+                except Exception as e:
+                    result = DownloadResult(distributions[i], None, e)
+                results[i] = result
+                if progress is not None:
+                    progress(result, n_done, n)
+    finally:
+        if own_session:
+            session.close()
+    return results
+
+
 @namespaces(dcat="http://www.w3.org/ns/dcat#")
 @urirefs(DatasetSeries='dcat:DatasetSeries')
 class DatasetSeries(Resource):
@@ -252,3 +423,51 @@ class Dataset(Resource):
         if isinstance(modified, str):
             return parser.parse(modified)
         return modified
+
+    def download_all(self,
+                     dest_dir: Union[str, pathlib.Path],
+                     max_workers: int = 8,
+                     progress: Callable[[DownloadResult, int, int], None] = None,
+                     **kwargs) -> List[DownloadResult]:
+        """Downloads all distributions in parallel. See `download_distributions()`."""
+        return download_distributions(self.distribution or [], dest_dir,
+                                      max_workers=max_workers, progress=progress, **kwargs)
+
+
+@namespaces(dcat="http://www.w3.org/ns/dcat#")
+@urirefs(Catalog='dcat:Catalog',
+         dataset='dcat:dataset')
+class Catalog(Dataset):
+    """Pydantic implementation of dcat:Catalog
+
+    .. note::
+
+        More than the below parameters are possible but not explicitly defined here.
+
+
+    Parameters
+    ----------
+    dataset: List[Dataset] = None
+        Datasets of the catalog (dcat:dataset)
+    """
+    dataset: Optional[Union[Dataset, List[Dataset]]] = None  # dcat:dataset
+
+    @field_validator('dataset', mode='before')
+    @classmethod
+    def _dataset(cls, dataset):
+        if dataset is None or isinstance(dataset, list):
+            return dataset
+        return [dataset]
+
+    def download_all(self,
+                     dest_dir: Union[str, pathlib.Path],
+                     max_workers: int = 8,
+                     progress: Callable[[DownloadResult, int, int], None] = None,
+                     **kwargs) -> List[DownloadResult]:
+        """Downloads the distributions of the catalog and of all of its datasets in
+        parallel (in one thread pool). See `download_distributions()`."""
+        distributions = list(self.distribution or [])
+        for dataset in self.dataset or []:
+            distributions.extend(dataset.distribution or [])
+        return download_distributions(distributions, dest_dir,
+                                      max_workers=max_workers, progress=progress, **kwargs)
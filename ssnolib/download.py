@@ -0,0 +1,590 @@
+"""Download cache for remote files (e.g. distributions of Standard Name Tables).
+
+Downloaded files are stored content-addressed (by their SHA-256 hash) in the
+cache directory. For every URL, the hash of the last response and its ETag and
+Last-Modified headers are stored. A stored URL is revalidated with a conditional
+request (If-None-Match/If-Modified-Since) and the stored file is used if the
+server answers with "304 Not Modified". Interrupted downloads are kept in the
+cache directory and resumed with Range requests.
+
+Responses are streamed in chunks of `CHUNK_SIZE` bytes into a temporary file,
+while the hash and the size are computed, and the file is only renamed into
+place if the download is complete and matches the expected hash and size. The
+memory usage is therefore independent of the size of the file.
+
+Cached files are read-only and are hard linked to the destination of a
+download (see `link_file()`), so that a file is not stored twice. Files not
+used for `MAX_AGE` seconds, files no URL refers to any more (e.g. replaced after
+the file changed) and the least recently used files are evicted, until the
+cache is smaller than `MAX_SIZE` bytes (see `DownloadCache.evict()`).
+
+`run_download()` runs such a blocking download in an executor for asyncio
+applications. The number of concurrent downloads is bounded by a semaphore and
+cancelling the awaiting task stops the download at the next chunk.
+"""
+import asyncio
+import functools
+import hashlib
+import json
+import os
+import pathlib
+import re
+import shutil
+import stat
+import threading
+import time
+import uuid
+import weakref
+from concurrent.futures import Executor
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import requests
+
+from .utils import get_cache_dir
+
+CHUNK_SIZE = 2 ** 16  # bytes
+MAX_CONCURRENT_DOWNLOADS = 16
+MAX_SIZE = 4 * 1024 ** 3  # bytes
+MAX_AGE = 30 * 24 * 3600  # seconds
+_MIN_AGE = 60  # seconds, files written or used more recently are not evicted (they may be in use)
+
+
+class DownloadCancelled(Exception):
+    """The download was cancelled (see `run_download()`)"""
+
+
+def get_download_dir() -> pathlib.Path:
+    """Return the download cache directory and create it if it does not exist"""
+    download_dir = get_cache_dir() / 'downloads'
+    download_dir.mkdir(parents=True, exist_ok=True)
+    return download_dir
+
+
+def _tmp_filename(filename: pathlib.Path) -> pathlib.Path:
+    return filename.with_name(f'{filename.name}.{uuid.uuid4().hex}.tmp')
+
+
+def _write_atomic(filename: pathlib.Path, content: bytes):
+    """Write to a temporary file first, so that concurrent readers never see a partial file"""
+    tmp_filename = _tmp_filename(filename)
+    with open(tmp_filename, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_filename, filename)
+
+
+def _remove(filename: pathlib.Path):
+    """Remove a (read-only) file"""
+    try:
+        filename.unlink(missing_ok=True)
+    except PermissionError:
+        # read-only files cannot be removed on Windows
+        filename.chmod(stat.S_IWRITE)
+        filename.unlink(missing_ok=True)
+
+
+def link_file(src: Union[str, pathlib.Path], dest: Union[str, pathlib.Path]) -> pathlib.Path:
+    """Hard link `dest` to `src` (e.g. a cached file) or copy it, if a link is not
+    possible (e.g. another file system). `dest` is replaced atomically."""
+    dest = pathlib.Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp_filename = _tmp_filename(dest)
+    try:
+        os.link(src, tmp_filename)
+    except OSError:
+        shutil.copyfile(src, tmp_filename)
+    try:
+        os.replace(tmp_filename, dest)
+    except BaseException:
+        _remove(tmp_filename)
+        raise
+    return dest
+
+
+def _parse_content_range(content_range: str) -> Tuple[Optional[int], Optional[int]]:
+    """Return the first byte and the complete size of a Content-Range header, e.g. "bytes 100-199/1000" """
+    match = re.fullmatch(r'bytes (\d+)-\d+/(\d+|\*)', content_range.strip())
+    if match is None:
+        return None, None
+    return int(match.group(1)), None if match.group(2) == '*' else int(match.group(2))
+
+
+def _check_size(size: int, byte_size: Optional[int]):
+    if byte_size is not None and size != byte_size:
+        raise ValueError(f'The size of the file ({size} bytes) does not match '
+                         f'the expected size ({byte_size} bytes)')
+
+
+def _copy_chunks(response: requests.Response, f, content_hash, size: int, byte_size: Optional[int],
+                 chunk_size: int, cancel: Optional[threading.Event]) -> int:
+    """Write the body of a response to the open file f, update the hash and return
+    the size of the file (`size` is the size before)"""
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        if cancel is not None and cancel.is_set():
+            raise DownloadCancelled(f'The download of {response.url} was cancelled')
+        size += len(chunk)
+        if byte_size is not None and size > byte_size:
+            raise ValueError(f'The file is larger than the expected size ({byte_size} bytes)')
+        content_hash.update(chunk)
+        f.write(chunk)
+    return size
+
+
+def stream_to_file(response: requests.Response,
+                   filename: Union[str, pathlib.Path],
+                   byte_size: Optional[int] = None,
+                   chunk_size: int = CHUNK_SIZE,
+                   cancel: Optional[threading.Event] = None) -> str:
+    """Write the body of a (streamed) response to a file chunk by chunk and return its SHA-256 hash.
+
+    Parameters
+    ----------
+    response: requests.Response
+        The response, requested with stream=True
+    filename: Union[str, pathlib.Path]
+        The file to write to. It is removed if the download fails.
+    byte_size: Optional[int]
+        The expected size of the file in bytes. The download is aborted as soon
+        as more data arrives.
+    chunk_size: int=CHUNK_SIZE
+        The size of the chunks read from the response
+    cancel: Optional[threading.Event]
+        If set, the download is stopped and DownloadCancelled is raised
+
+    Returns
+    -------
+    str
+        The SHA-256 hash of the file
+    """
+    content_hash = hashlib.sha256()
+    size = 0
+    try:
+        content_length = response.headers.get('Content-Length', None)
+        if byte_size is not None and content_length is not None and not response.headers.get('Content-Encoding'):
+            # fail before downloading anything
+            if int(content_length) != byte_size:
+                raise ValueError(f'The size of the file ({content_length} bytes) does not match '
+                                 f'the expected size ({byte_size} bytes)')
+        with open(filename, 'wb') as f:
+            size = _copy_chunks(response, f, content_hash, size, byte_size, chunk_size, cancel)
+        _check_size(size, byte_size)
+    except BaseException:
+        pathlib.Path(filename).unlink(missing_ok=True)
+        raise
+    finally:
+        response.close()
+    return content_hash.hexdigest()
+
+
+def download_to_file(response: requests.Response,
+                     dest_filename: Union[str, pathlib.Path],
+                     known_hash: Optional[str] = None,
+                     byte_size: Optional[int] = None,
+                     cancel: Optional[threading.Event] = None) -> str:
+    """Stream a response into a temporary file and atomically rename it to
+    `dest_filename`, if the hash and the size match. Returns the SHA-256 hash."""
+    dest_filename = pathlib.Path(dest_filename)
+    dest_filename.parent.mkdir(parents=True, exist_ok=True)
+    tmp_filename = _tmp_filename(dest_filename)
+    sha256 = stream_to_file(response, tmp_filename, byte_size=byte_size, cancel=cancel)
+    if known_hash and sha256 != known_hash:
+        tmp_filename.unlink(missing_ok=True)
+        raise ValueError('File does not match the expected hash')
+    os.replace(tmp_filename, dest_filename)
+    return sha256
+
+
+class DownloadCache:
+    """Content-addressed cache of downloaded files, revalidated with conditional requests.
+
+    Parameters
+    ----------
+    directory: Optional[Union[str, pathlib.Path]]
+        The directory of the cache. Defaults to "downloads" in the cache directory.
+    max_size: int=MAX_SIZE
+        The size in bytes, to which the cache is reduced after every download (see `evict()`)
+    max_age: float=MAX_AGE
+        Files not used for this number of seconds are evicted (see `evict()`)
+    """
+
+    def __init__(self,
+                 directory: Optional[Union[str, pathlib.Path]] = None,
+                 max_size: int = MAX_SIZE,
+                 max_age: float = MAX_AGE):
+        self.directory = get_download_dir() if directory is None else pathlib.Path(directory)
+        self.max_size = max_size
+        self.max_age = max_age
+
+    def object_path(self, sha256: str) -> pathlib.Path:
+        """Return the path of the cached file with the given hash"""
+        return self.directory / 'objects' / sha256
+
+    def _entry_path(self, url: str) -> pathlib.Path:
+        return self.directory / 'urls' / f'{hashlib.sha256(url.encode()).hexdigest()}.json'
+
+    def get_entry(self, url: str) -> Optional[Dict]:
+        """Return the stored response information of a URL (the hash of the
+        content, ETag, Last-Modified) or None, if the URL is not cached"""
+        try:
+            with open(self._entry_path(url), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not self.object_path(entry['sha256']).exists():
+            return None
+        return entry
+
+    def _set_entry(self, url: str, entry: Dict):
+        filename = self._entry_path(url)
+        filename.parent.mkdir(parents=True, exist_ok=True)
+        _write_atomic(filename, json.dumps(entry).encode())
+
+    def _partial_path(self, url: str) -> pathlib.Path:
+        return self.directory / 'partial' / hashlib.sha256(url.encode()).hexdigest()
+
+    def _claim_partial(self, url: str) -> Tuple[pathlib.Path, Optional[Dict]]:
+        """Take the partial file of a URL (if any) by renaming it, so that no other
+        download of the URL writes to it. Returns the new path and the validators
+        (ETag, Last-Modified) of the partial file or None, if there is none."""
+        partial = self._partial_path(url)
+        partial.parent.mkdir(parents=True, exist_ok=True)
+        claimed = partial.with_name(f'{partial.name}.{uuid.uuid4().hex}.active')
+        try:
+            with open(partial.with_suffix('.json'), 'r', encoding='utf-8') as f:
+                validators = json.load(f)
+        except (OSError, ValueError):
+            validators = None
+        try:
+            os.replace(partial, claimed)
+        except FileNotFoundError:
+            return claimed, None
+        if not validators or not (validators.get('etag', None) or validators.get('last_modified', None)):
+            claimed.unlink(missing_ok=True)
+            return claimed, None
+        return claimed, validators
+
+    def _release_partial(self, url: str, claimed: pathlib.Path, validators: Optional[Dict]):
+        """Keep a partial file for the next download of the URL, if it can be resumed"""
+        if not claimed.exists():
+            return
+        if claimed.stat().st_size == 0 or not validators or \
+                not (validators.get('etag', None) or validators.get('last_modified', None)):
+            claimed.unlink(missing_ok=True)
+            return
+        partial = self._partial_path(url)
+        _write_atomic(partial.with_suffix('.json'), json.dumps(validators).encode())
+        os.replace(claimed, partial)
+
+    def _discard_partial(self, url: str, claimed: pathlib.Path):
+        """Remove a claimed partial file and its validators (unless another partial file was kept in between)"""
+        _remove(claimed)
+        if not self._partial_path(url).exists():
+            self._partial_path(url).with_suffix('.json').unlink(missing_ok=True)
+
+    @staticmethod
+    def _receive(response: requests.Response, filename: pathlib.Path, offset: int,
+                 byte_size: Optional[int], cancel: Optional[threading.Event]) -> str:
+        """Write the body of a response (the complete file or the range starting
+        at offset) to a file and return the SHA-256 hash of the complete file"""
+        try:
+            if response.status_code == 206:
+                start, total = _parse_content_range(response.headers.get('Content-Range', ''))
+                if start != offset:
+                    raise ValueError(f'Unexpected range of the response: {response.headers.get("Content-Range")}')
+                if byte_size is not None and total is not None and total != byte_size:
+                    raise ValueError(f'The size of the file ({total} bytes) does not match '
+                                     f'the expected size ({byte_size} bytes)')
+            else:
+                offset = 0
+                content_length = response.headers.get('Content-Length', None)
+                if byte_size is not None and content_length is not None and \
+                        not response.headers.get('Content-Encoding'):
+                    _check_size(int(content_length), byte_size)
+            content_hash = hashlib.sha256()
+            if offset:
+                with open(filename, 'rb') as f:
+                    for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                        content_hash.update(chunk)
+            with open(filename, 'r+b' if offset else 'wb') as f:
+                f.seek(offset)
+                f.truncate()
+                size = _copy_chunks(response, f, content_hash, offset, byte_size, CHUNK_SIZE, cancel)
+            _check_size(size, byte_size)
+            return content_hash.hexdigest()
+        finally:
+            response.close()
+
+    def fetch(self,
+              url: str,
+              known_hash: Optional[str] = None,
+              byte_size: Optional[int] = None,
+              session: Optional[requests.Session] = None,
+              cancel: Optional[threading.Event] = None,
+              retries: int = 3,
+              **kwargs) -> pathlib.Path:
+        """Return the path of the cached file of a URL after revalidating (or downloading) it.
+
+        An interrupted download is kept as partial file in the cache directory and
+        resumed with a Range request, if the server supports it and the file did
+        not change (If-Range with the ETag or Last-Modified date). If the server
+        rejects the Range request (e.g. 416 Range Not Satisfiable), the partial
+        file is discarded and the complete file is requested.
+
+        Parameters
+        ----------
+        url: str
+            The URL of the file
+        known_hash: Optional[str]
+            The expected SHA-256 hash of the file
+        byte_size: Optional[int]
+            The expected size of the file in bytes
+        session: Optional[requests.Session]
+            The session to use, e.g. one shared by several threads
+        cancel: Optional[threading.Event]
+            If set, the download is stopped and DownloadCancelled is raised
+        retries: int=3
+            Number of times a broken transfer is resumed, if data was received
+            before it broke
+        **kwargs
+            Additional keyword arguments passed to requests.get()
+
+        Returns
+        -------
+        pathlib.Path
+            The path to the cached file. It must not be modified.
+        """
+        url = str(url)
+        entry = self.get_entry(url)
+        base_headers = dict(kwargs.pop('headers', None) or {})
+        if entry is not None:
+            if entry.get('etag', None):
+                base_headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified', None):
+                base_headers['If-Modified-Since'] = entry['last_modified']
+        attempt = 0
+        while True:
+            claimed, validators = self._claim_partial(url)
+            offset = claimed.stat().st_size if validators else 0
+            if byte_size is not None and offset > byte_size:
+                claimed.unlink(missing_ok=True)
+                offset, validators = 0, None
+            headers = dict(base_headers)
+            if offset:
+                headers['Range'] = f'bytes={offset}-'
+                headers['If-Range'] = validators.get('etag', None) or validators['last_modified']
+            try:
+                response = (session or requests).get(url, stream=True, headers=headers, **kwargs)
+            except BaseException:
+                self._release_partial(url, claimed, validators)
+                raise
+            if response.status_code == 304 and entry is not None:
+                response.close()
+                self._release_partial(url, claimed, validators)
+                sha256 = entry['sha256']
+                if known_hash and sha256 != known_hash:
+                    raise ValueError('File does not match the expected hash')
+                filename = self.object_path(sha256)
+                _check_size(filename.stat().st_size, byte_size)
+                try:
+                    # mark as recently used
+                    os.utime(filename)
+                except OSError:
+                    pass
+                return filename
+            if not response.ok:
+                response.close()
+                if offset and 400 <= response.status_code < 500:
+                    # e.g. 416 Range Not Satisfiable: the partial file cannot be resumed,
+                    # the file is requested again without Range
+                    self._discard_partial(url, claimed)
+                    continue
+                self._release_partial(url, claimed, validators)
+                response.raise_for_status()
+            if response.status_code != 206:
+                # the complete file is sent
+                offset = 0
+                validators = {'etag': response.headers.get('ETag', None),
+                              'last_modified': response.headers.get('Last-Modified', None)}
+            try:
+                sha256 = self._receive(response, claimed, offset, byte_size, cancel)
+                break
+            except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError,
+                    DownloadCancelled):
+                # keep the partial file to resume the download
+                received = claimed.exists() and claimed.stat().st_size > offset
+                self._release_partial(url, claimed, validators)
+                if received and attempt < retries and (cancel is None or not cancel.is_set()):
+                    attempt += 1
+                    continue
+                raise
+            except BaseException:
+                claimed.unlink(missing_ok=True)
+                raise
+        if known_hash and sha256 != known_hash:
+            claimed.unlink(missing_ok=True)
+            raise ValueError('File does not match the expected hash')
+        filename = self.object_path(sha256)
+        filename.parent.mkdir(parents=True, exist_ok=True)
+        # cached files are read-only, as they may be hard linked to the destination of downloads
+        claimed.chmod(stat.S_IMODE(claimed.stat().st_mode) & ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH))
+        if filename.exists():
+            # the same content is cached already
+            self._discard_partial(url, claimed)
+            try:
+                os.utime(filename)
+            except OSError:
+                pass
+        else:
+            os.replace(claimed, filename)
+            self._discard_partial(url, claimed)
+        self._set_entry(url, {'url': url,
+                              'sha256': sha256,
+                              'etag': validators.get('etag', None),
+                              'last_modified': validators.get('last_modified', None)})
+        self.evict()
+        return filename
+
+    def evict(self, max_size: Optional[int] = None, max_age: Optional[float] = None):
+        """Delete cached files, which no URL refers to (e.g. replaced after the
+        file changed), files not used for `max_age` seconds and the least recently
+        used files, until the total size is below `max_size` bytes. Partial files
+        older than `max_age` seconds are deleted, too. Files written or used within
+        the last minute are kept.
+
+        Parameters
+        ----------
+        max_size: Optional[int]
+            The maximum size of the cached files in bytes. Defaults to `self.max_size`.
+        max_age: Optional[float]
+            The maximum age in seconds since the last use. Defaults to `self.max_age`.
+        """
+        max_size = self.max_size if max_size is None else max_size
+        max_age = self.max_age if max_age is None else max_age
+        now = time.time()
+        entries: Dict[str, List[pathlib.Path]] = {}
+        for entry_path in (self.directory / 'urls').glob('*.json'):
+            try:
+                with open(entry_path, 'r', encoding='utf-8') as f:
+                    entries.setdefault(json.load(f)['sha256'], []).append(entry_path)
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+        objects = []
+        total_size = 0
+        for filename in (self.directory / 'objects').glob('*'):
+            try:
+                st = filename.stat()
+            except FileNotFoundError:
+                continue
+            age = now - st.st_mtime
+            if age < _MIN_AGE:
+                total_size += st.st_size
+            elif filename.name not in entries or age > max_age:
+                self._remove_object(filename, entries)
+            else:
+                total_size += st.st_size
+                objects.append((st.st_mtime, st.st_size, filename))
+        for _, size, filename in sorted(objects):
+            if total_size <= max_size:
+                break
+            self._remove_object(filename, entries)
+            total_size -= size
+        for sha256, entry_paths in entries.items():
+            # URLs of which the file is gone
+            if not self.object_path(sha256).exists():
+                for entry_path in entry_paths:
+                    entry_path.unlink(missing_ok=True)
+        for filename in (self.directory / 'partial').glob('*'):
+            try:
+                if now - filename.stat().st_mtime > max_age:
+                    _remove(filename)
+                    if not filename.suffix:
+                        # the validators of the partial file
+                        filename.with_suffix('.json').unlink(missing_ok=True)
+            except FileNotFoundError:
+                continue
+
+    @staticmethod
+    def _remove_object(filename: pathlib.Path, entries: Dict[str, List[pathlib.Path]]):
+        for entry_path in entries.pop(filename.name, []):
+            entry_path.unlink(missing_ok=True)
+        _remove(filename)
+
+    def clear(self):
+        """Remove all cached (and partially downloaded) files"""
+        for sub_directory in ('urls', 'objects', 'partial'):
+            for filename in (self.directory / sub_directory).glob('*'):
+                _remove(filename)
+
+
+_download_cache: Optional[DownloadCache] = None
+
+
+def get_download_cache() -> DownloadCache:
+    """Return the download cache used by ssnolib"""
+    global _download_cache
+    if _download_cache is None:
+        _download_cache = DownloadCache()
+    return _download_cache
+
+
+def set_download_cache(cache: DownloadCache) -> DownloadCache:
+    """Set the download cache used by ssnolib. Returns the previous one."""
+    global _download_cache
+    previous = get_download_cache()
+    _download_cache = cache
+    return previous
+
+
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    """Return the semaphore of the running event loop, which bounds the number of concurrent downloads"""
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop, None)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+        _semaphores[loop] = semaphore
+    return semaphore
+
+
+async def run_download(func: Callable, *args,
+                       semaphore: Optional[asyncio.Semaphore] = None,
+                       executor: Optional[Executor] = None,
+                       **kwargs):
+    """Run a blocking download function, which accepts the keyword argument
+    `cancel` (like `ssnolib.utils.download_file()`), in an executor.
+
+    Parameters
+    ----------
+    func: Callable
+        The download function
+    *args
+        Positional arguments passed to func
+    semaphore: Optional[asyncio.Semaphore]
+        Bounds the number of concurrent downloads. Defaults to a semaphore of the
+        running loop with MAX_CONCURRENT_DOWNLOADS slots.
+    executor: Optional[Executor]
+        The (thread) executor. Defaults to the default executor of the loop.
+    **kwargs
+        Keyword arguments passed to func
+
+    Returns
+    -------
+    The return value of func
+
+    If the awaiting task is cancelled, the download is stopped at the next chunk
+    and the slot of the semaphore is released after the download stopped.
+    """
+    loop = asyncio.get_running_loop()
+    cancel = threading.Event()
+    async with semaphore or _get_semaphore():
+        future = loop.run_in_executor(executor, functools.partial(func, *args, cancel=cancel, **kwargs))
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            cancel.set()
+            try:
+                await future
+            except BaseException:
+                pass
+            raise
@@ -0,0 +1,229 @@
+"""Index structures built on top of the standard names of a StandardNameTable"""
+import bisect
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+from .standard_name import StandardName
+
+_MAX_CHAR = chr(0x10FFFF)
+
+
+def _name_of(item: Union[StandardName, Dict]) -> str:
+    """Return the standard name string of a StandardName object or of a raw record"""
+    if isinstance(item, dict):
+        return item.get('standard_name', item.get('standardName', None))
+    return item.standard_name
+
+
+class StandardNameList(list):
+    """List of StandardName objects, which caches the indexes built on top of it.
+
+    Indexes are built lazily with `get_index()`. Appending or extending the list
+    updates the cached indexes which implement an `add()` method. Any other
+    modification drops the cached indexes, so they are rebuilt on next access.
+    """
+
+    def __init__(self, iterable: Iterable = ()):
+        super().__init__(iterable)
+        self._indexes: Dict[str, object] = {}
+
+    def __reduce__(self):
+        # cached indexes are not copied or pickled
+        return self.__class__, (list(self),)
+
+    def iter_raw(self) -> Iterator:
+        """Iterate over the items as they are stored"""
+        return super().__iter__()
+
+    def get_index(self, key: str, factory: Callable):
+        """Return the cached index `key`. If not yet available, it is built
+        by calling `factory` with this list."""
+        index = self._indexes.get(key, None)
+        if index is None:
+            index = factory(self)
+            self._indexes[key] = index
+        return index
+
+    def invalidate(self):
+        """Drop all cached indexes"""
+        self._indexes.clear()
+
+    def _added(self, position: int, item):
+        for key, index in list(self._indexes.items()):
+            add = getattr(index, 'add', None)
+            if add is None:
+                self._indexes.pop(key)
+            else:
+                add(position, item)
+
+    def append(self, item):
+        super().append(item)
+        if self._indexes:
+            self._added(len(self) - 1, item)
+
+    def extend(self, iterable: Iterable):
+        for item in iterable:
+            self.append(item)
+
+    def __iadd__(self, other: Iterable):
+        self.extend(other)
+        return self
+
+    def __imul__(self, n: int):
+        self.invalidate()
+        return super().__imul__(n)
+
+    def __setitem__(self, key, value):
+        self.invalidate()
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self.invalidate()
+        super().__delitem__(key)
+
+    def insert(self, index: int, item):
+        self.invalidate()
+        super().insert(index, item)
+
+    def remove(self, item):
+        self.invalidate()
+        super().remove(item)
+
+    def pop(self, index: int = -1):
+        self.invalidate()
+        return super().pop(index)
+
+    def clear(self):
+        self.invalidate()
+        super().clear()
+
+    def sort(self, *args, **kwargs):
+        self.invalidate()
+        super().sort(*args, **kwargs)
+
+    def reverse(self):
+        self.invalidate()
+        super().reverse()
+
+
+class LazyStandardNameList(StandardNameList):
+    """StandardNameList holding raw standard name records (dictionaries), which
+    are validated and converted into StandardName objects only when accessed by
+    indexing or iteration. The indexes of the list are built from the raw
+    records without validating them."""
+
+    def __reduce__(self):
+        return self.__class__, (list(self.iter_raw()),)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self[i] for i in range(*key.indices(len(self)))]
+        item = super().__getitem__(key)
+        if not isinstance(item, StandardName):
+            item = StandardName.model_validate(item)
+            # the item is not modified but replaced by its validated version:
+            list.__setitem__(self, key, item)
+        return item
+
+    def __iter__(self) -> Iterator[StandardName]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __contains__(self, item) -> bool:
+        return any(sn == item for sn in self)
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def index(self, item, *args) -> int:
+        return list(self).index(item, *args)
+
+    def count(self, item) -> int:
+        return list(self).count(item)
+
+    def copy(self) -> 'LazyStandardNameList':
+        return self.__class__(self.iter_raw())
+
+    def materialize(self) -> 'LazyStandardNameList':
+        """Validate all standard names, which have not been accessed yet"""
+        for i in range(len(self)):
+            _ = self[i]
+        return self
+
+
+class NameIndex:
+    """Hash index mapping a standard name string to its position in a
+    StandardNameList. If a name occurs multiple times, the first
+    position is kept."""
+
+    def __init__(self, standard_names: StandardNameList):
+        self._positions: Dict[str, int] = {}
+        for i, sn in enumerate(standard_names.iter_raw()):
+            self.add(i, sn)
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __contains__(self, standard_name: str) -> bool:
+        return standard_name in self._positions
+
+    def add(self, position: int, standard_name):
+        """Add a standard name at the given position of the list"""
+        self._positions.setdefault(_name_of(standard_name), position)
+
+    def get(self, standard_name: str) -> Optional[int]:
+        """Return the position of the standard name or None"""
+        return self._positions.get(standard_name, None)
+
+
+class SortedNameIndex:
+    """Sorted array index of standard name strings supporting prefix, suffix and
+    lexicographic range queries by binary search. The positions refer to the
+    StandardNameList the index was built from."""
+
+    def __init__(self, standard_names: StandardNameList):
+        names = [(_name_of(sn), i) for i, sn in enumerate(standard_names.iter_raw())]
+        names.sort()
+        self._names: List[str] = [n for n, _ in names]
+        self._positions: List[int] = [i for _, i in names]
+        rnames = sorted((n[::-1], i) for n, i in names)
+        self._rnames: List[str] = [n for n, _ in rnames]
+        self._rpositions: List[int] = [i for _, i in rnames]
+
+    def __len__(self):
+        return len(self._names)
+
+    def add(self, position: int, standard_name):
+        """Add a standard name at the given position of the list"""
+        name = _name_of(standard_name)
+        i = bisect.bisect_right(self._names, name)
+        self._names.insert(i, name)
+        self._positions.insert(i, position)
+        rname = name[::-1]
+        i = bisect.bisect_right(self._rnames, rname)
+        self._rnames.insert(i, rname)
+        self._rpositions.insert(i, position)
+
+    def positions(self) -> List[int]:
+        """Return all positions in lexicographic order of the names"""
+        return list(self._positions)
+
+    def range(self, start: Optional[str] = None, stop: Optional[str] = None) -> List[int]:
+        """Return the positions of all names n with start <= n < stop in
+        lexicographic order. None means unbounded."""
+        lo = 0 if start is None else bisect.bisect_left(self._names, start)
+        hi = len(self._names) if stop is None else bisect.bisect_left(self._names, stop)
+        return self._positions[lo:hi]
+
+    def prefix(self, prefix: str) -> List[int]:
+        """Return the positions of all names starting with prefix in lexicographic order"""
+        lo = bisect.bisect_left(self._names, prefix)
+        hi = bisect.bisect_right(self._names, prefix + _MAX_CHAR, lo)
+        return self._positions[lo:hi]
+
+    def suffix(self, suffix: str) -> List[int]:
+        """Return the positions of all names ending with suffix in lexicographic order"""
+        rsuffix = suffix[::-1]
+        lo = bisect.bisect_left(self._rnames, rsuffix)
+        hi = bisect.bisect_right(self._rnames, rsuffix + _MAX_CHAR, lo)
+        matches = sorted((self._rnames[i][::-1], self._rpositions[i]) for i in range(lo, hi))
+        return [p for _, p in matches]
@@ -0,0 +1,302 @@
+"""Direct JSON-LD serialization of Thing objects.
+
+`Thing.model_dump_jsonld()` dumps every (nested) object with `model_dump()` and
+resolves every key through a JSON-LD context object, optionally followed by an
+rdflib graph round-trip. For large Standard Name Tables this is slow. This module
+walks the model fields directly and writes compact JSON-LD using the
+`@namespaces`/`@urirefs` mappings of the classes, which are looked up once per
+class. The output describes the same RDF graph.
+
+The reverse direction, `from_jsonld_dict()`, maps JSON-LD documents shaped like
+the ones written by ssnolib straight to model fields without building an rdflib
+graph. Documents of another shape are rejected (None is returned), so that the
+caller can fall back to the generic `Thing.from_jsonld()`.
+"""
+import json
+import typing
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Type
+
+import rdflib
+from ontolutils import Thing
+from ontolutils.classes.decorator import NamespaceManager, URIRefManager
+
+_class_cache: Dict[type, Tuple[str, Dict[str, str], Dict[str, str]]] = {}
+
+
+def _class_info(cls: type) -> Tuple[str, Dict[str, str], Dict[str, str]]:
+    """Return the type IRI, the namespaces and the keys (compact IRIs) of the fields of a class"""
+    info = _class_cache.get(cls, None)
+    if info is None:
+        urirefs = URIRefManager.get(cls, {})
+        keys = {field: urirefs.get(field, field) for field in cls.model_fields}
+        info = (urirefs.get(cls.__name__, cls.__name__), dict(NamespaceManager.get(cls, {})), keys)
+        _class_cache[cls] = info
+    return info
+
+
+class _PrefixConflict(Exception):
+    """Two classes map the same prefix to different namespaces"""
+
+
+class _Serializer:
+
+    def __init__(self, context: Dict, namespaces: Dict, assign_bnode: bool):
+        self.context = context
+        self.namespaces = dict(namespaces)
+        self.assign_bnode = assign_bnode
+        self._visited_classes = set()
+
+    def serialize(self, obj):
+        if isinstance(obj, (str, int, float, bool)):
+            return obj
+        if isinstance(obj, datetime):
+            return obj.isoformat()
+        if isinstance(obj, Thing):
+            return self.serialize_thing(obj)
+        if isinstance(obj, (list, tuple)):
+            return [self.serialize(v) for v in obj]
+        return str(obj)
+
+    def serialize_thing(self, obj: Thing) -> Dict:
+        cls = obj.__class__
+        type_iri, namespaces, keys = _class_info(cls)
+        if cls not in self._visited_classes:
+            self._visited_classes.add(cls)
+            for prefix, iri in namespaces.items():
+                if self.namespaces.setdefault(prefix, iri) != iri:
+                    raise _PrefixConflict(prefix)
+                self.context.setdefault(prefix, iri)
+        out = {'@type': type_iri}
+        values = obj.__dict__
+        for field, key in keys.items():
+            if field == 'id':
+                continue
+            value = values.get(field, None)
+            if value is None:
+                continue
+            out[key] = self.serialize(value)
+        if obj.__pydantic_extra__:
+            for field, value in obj.__pydantic_extra__.items():
+                if value is not None:
+                    out[field] = self.serialize(value)
+        if obj.id is not None:
+            out['@id'] = obj.id
+        elif self.assign_bnode:
+            out['@id'] = rdflib.BNode().n3()
+        return out
+
+
+def to_jsonld_dict(thing: Thing,
+                   context: Optional[Dict] = None,
+                   exclude_none: bool = True,
+                   assign_bnode: bool = True) -> Dict:
+    """Return the JSON-LD dictionary of a Thing, equivalent to `Thing.get_jsonld_dict(resolve_keys=True)`.
+
+    Parameters
+    ----------
+    thing: Thing
+        The object to serialize
+    context: Optional[Dict]
+        Additional context entries
+    exclude_none: bool=True
+        Only for compatibility with `Thing.get_jsonld_dict()`. Fields with None
+        values have no triples and are always excluded.
+    assign_bnode: bool=True
+        Assigns a blank node if no ID is set.
+
+    Returns
+    -------
+    Dict
+        The JSON-LD dictionary
+
+    Notes
+    -----
+    If nested classes map the same prefix to different namespaces (e.g. "schema"
+    to "http://schema.org/" and "https://schema.org/"), a single compact context
+    cannot describe the graph of the generic path. In this case the generic
+    `Thing.get_jsonld_dict()` is used.
+    """
+    if context is not None and not isinstance(context, dict):
+        raise TypeError(f"Context must be a dict, not {type(context)}")
+    namespaces = NamespaceManager.get(thing.__class__, {})
+    at_context = dict(namespaces)
+    at_context.update(context or {})
+    try:
+        serialization = _Serializer(at_context, namespaces, assign_bnode).serialize_thing(thing)
+    except _PrefixConflict:
+        return Thing.get_jsonld_dict(thing, context=context, exclude_none=exclude_none,
+                                     assign_bnode=assign_bnode, resolve_keys=True)
+    return {'@context': at_context, **serialization}
+
+
+def dump_jsonld(thing: Thing,
+                context: Optional[Dict] = None,
+                exclude_none: bool = True,
+                assign_bnode: bool = True,
+                indent: Optional[int] = 4) -> str:
+    """Return the JSON-LD string of a Thing without an rdflib graph round-trip. See `to_jsonld_dict()`."""
+    return json.dumps(to_jsonld_dict(thing, context=context, exclude_none=exclude_none, assign_bnode=assign_bnode),
+                      indent=indent)
+
+
+class UnexpectedShape(Exception):
+    """The JSON-LD document is not shaped like expected by `from_jsonld_dict()`"""
+
+
+_field_cache: Dict[type, Tuple[str, Dict[str, str]]] = {}
+
+
+def _expand(iri: str, prefixes: Dict[str, str]) -> str:
+    prefix, sep, local = iri.partition(':')
+    if sep and not local.startswith('//') and prefix in prefixes:
+        return prefixes[prefix] + local
+    return iri
+
+
+def _field_info(cls: type) -> Tuple[str, Dict[str, str]]:
+    """Return the expanded type IRI and a map of expanded IRIs (including the
+    internal form "<field namespace><field name>"), field names and aliases to
+    the field names of a class"""
+    info = _field_cache.get(cls, None)
+    if info is None:
+        urirefs = URIRefManager.get(cls, {})
+        namespaces = NamespaceManager.get(cls, {})
+        fields = {}
+        for field, field_info in cls.model_fields.items():
+            fields[field] = field
+            if field_info.alias:
+                fields[field_info.alias] = field
+            if field in urirefs:
+                fields[_expand(urirefs[field], namespaces)] = field
+                # the field name in the namespace of the field IRI, e.g. "ssno:standard_names"
+                prefix = urirefs[field].partition(':')[0]
+                fields[_expand(f'{prefix}:{field}', namespaces)] = field
+        info = (_expand(urirefs.get(cls.__name__, cls.__name__), namespaces), fields)
+        _field_cache[cls] = info
+    return info
+
+
+def _thing_classes(annotation) -> List[Type[Thing]]:
+    """Return the Thing classes of a field annotation, e.g. Optional[List[StandardName]]"""
+    if isinstance(annotation, type):
+        return [annotation] if issubclass(annotation, Thing) else []
+    classes = []
+    for arg in typing.get_args(annotation):
+        classes.extend(cls for cls in _thing_classes(arg) if cls not in classes)
+    return classes
+
+
+def _prefixes(context) -> Dict[str, str]:
+    """Return the prefix definitions of a (local) @context"""
+    prefixes = {}
+    for ctx in context if isinstance(context, list) else [context]:
+        if isinstance(ctx, dict):
+            for k, v in ctx.items():
+                if isinstance(v, str) and not k.startswith('@'):
+                    prefixes[k] = v
+                elif isinstance(v, dict) and isinstance(v.get('@id', None), str):
+                    prefixes[k] = v['@id']
+    return prefixes
+
+
+class _Reader:
+
+    def __init__(self, prefixes: Dict[str, str]):
+        self.prefixes = prefixes
+
+    def _types(self, node: Dict) -> List[str]:
+        types = node.get('@type', [])
+        return [_expand(t, self.prefixes) for t in (types if isinstance(types, list) else [types])]
+
+    def _field(self, key: str, fields: Dict[str, str]) -> Optional[str]:
+        field = fields.get(key, None) or fields.get(_expand(key, self.prefixes), None)
+        prefix, sep, local = key.partition(':')
+        if field is None and sep and not local.startswith('//') and prefix not in self.prefixes:
+            # an undefined prefix, e.g. "dcterms:description". A prefix defined in
+            # @context, which expands to another IRI, is another vocabulary and is
+            # not matched by its local name.
+            field = fields.get(local, None)
+        return field
+
+    def _value(self, value, classes: List[Type[Thing]]):
+        if isinstance(value, list):
+            return [self._value(v, classes) for v in value]
+        if isinstance(value, dict):
+            if classes:
+                return self.read(value, classes)
+            if '@value' in value:
+                return value['@value']
+            if set(value) == {'@id'}:
+                return value['@id']
+            raise UnexpectedShape(f'Unexpected object {value}')
+        return value
+
+    def read(self, node: Dict, classes: List[Type[Thing]]):
+        """Return the fields of a node, which is an instance of one of the classes"""
+        types = self._types(node)
+        if len(classes) == 1 and not types:
+            cls = classes[0]
+        else:
+            matches = [cls for cls in classes if _field_info(cls)[0] in types]
+            if len(matches) != 1:
+                raise UnexpectedShape(f'Cannot determine the class of {types}')
+            cls = matches[0]
+        fields = _field_info(cls)[1]
+        data = {}
+        for key, value in node.items():
+            if key == '@id':
+                data['id'] = value
+                continue
+            if key.startswith('@'):
+                if key != '@type':
+                    raise UnexpectedShape(f'Unexpected keyword {key}')
+                continue
+            field = self._field(key, fields)
+            if field is None:
+                if ':' in key:
+                    raise UnexpectedShape(f'Unknown key {key} of {cls.__name__}')
+                # extra field, as written by `to_jsonld_dict()`
+                data[key] = self._value(value, [])
+                continue
+            data[field] = self._value(value, _thing_classes(cls.model_fields[field].annotation))
+        if len(classes) > 1:
+            # keep the class determined by @type, e.g. Person or Organization
+            return cls(**data)
+        return data
+
+
+def from_jsonld_dict(data: Dict, cls: Type[Thing]) -> Optional[Dict]:
+    """Map a JSON-LD document (a single, possibly nested node or a @graph with
+    a single node) to the fields of the class `cls`, without building an RDF graph.
+
+    Parameters
+    ----------
+    data: Dict
+        The JSON-LD document
+    cls: Type[Thing]
+        The class of the (root) node
+
+    Returns
+    -------
+    Optional[Dict]
+        The (not yet validated) fields of the node or None, if the document is
+        shaped differently (e.g. flattened, other classes, unknown IRIs as keys)
+    """
+    if not isinstance(data, dict):
+        return None
+    prefixes = _prefixes(data.get('@context', {}))
+    node = data
+    if '@graph' in data:
+        graph = data['@graph']
+        if not isinstance(graph, list) or len(graph) != 1 or not isinstance(graph[0], dict):
+            return None
+        node = graph[0]
+    node = {k: v for k, v in node.items() if k != '@context'}
+    reader = _Reader(prefixes)
+    if _field_info(cls)[0] not in reader._types(node):
+        return None
+    try:
+        return reader.read(node, [cls])
+    except UnexpectedShape:
+        return None
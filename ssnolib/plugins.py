@@ -1,64 +1,120 @@
 import abc
+import contextlib
 import pathlib
-import warnings
-from typing import Dict, Union
+from typing import BinaryIO, ContextManager, Dict, Iterator, Tuple, Union
+from xml.etree import ElementTree
 
 
 class TableReader(abc.ABC):
-    """Abstract Standard Name Table Reader"""
-
-    def __init__(self, filename: Union[str, pathlib.Path]):
+    """Abstract Standard Name Table Reader
+
+    Reads a file or a binary file-like object, e.g. a member of an archive (see
+    `ssnolib.archive`). A file-like object is read once from its current position.
+    """
+
+    def __init__(self, filename: Union[str, pathlib.Path, BinaryIO]):
+        if hasattr(filename, 'read'):
+            self.file = filename
+            # the name is only used for defaults like the title
+            self.filename = pathlib.Path(getattr(filename, 'name', None) or 'table')
+            return
+        self.file = None
         self.filename = pathlib.Path(filename)
         assert self.filename.exists(), f'{self.filename} does not exist'
         assert self.filename.is_file(), f'{self.filename} is not a file'
 
+    def open(self) -> ContextManager[BinaryIO]:
+        """Return the binary file object to read from. A file-like object passed
+        to the reader is not closed."""
+        if self.file is not None:
+            return contextlib.nullcontext(self.file)
+        return open(self.filename, 'rb')
+
     @abc.abstractmethod
     def parse(self) -> Dict:
         """Parse the file"""
 
+    def iter_standard_names(self) -> Iterator[Dict]:
+        """Yields the standard name entries one by one. Readers, which can
+        stream the entries, should overwrite this method."""
+        yield from self.parse().get('standard_names', None) or []
+
+
+def _local_tag(tag: str) -> str:
+    """strip the namespace from a tag"""
+    return tag.rsplit('}', 1)[-1]
+
 
 class XMLReader(TableReader):
+    """Reader for XML standard name tables like the one of the CF conventions.
+
+    The file is parsed incrementally. Processed elements are cleared, so the
+    XML tree is never held in memory completely.
+    """
+
+    def _iterparse(self) -> Iterator[Tuple[str, Union[Dict, str, None]]]:
+        """Yields ('entry', dict) for every standard name entry and (tag, text)
+        for all other top-level elements (version, contact, ...)"""
+        with self.open() as f:
+            context = ElementTree.iterparse(f, events=('start', 'end'))
+            _, root = next(context)
+            depth = 1
+            for event, elem in context:
+                if event == 'start':
+                    depth += 1
+                    continue
+                depth -= 1
+                if depth != 1:
+                    continue
+                tag = _local_tag(elem.tag)
+                if tag == 'entry':
+                    yield tag, self._parse_entry(elem)
+                elif len(elem) == 0:
+                    yield tag, elem.text
+                root.clear()
+
+    @staticmethod
+    def _parse_entry(elem: ElementTree.Element) -> Dict:
+        sndict = {_local_tag(child.tag): child.text for child in elem}
+        canonical_units = sndict.get('canonical_units', '')
+        if canonical_units == '1':
+            canonical_units = ''
+        elif canonical_units is None:
+            canonical_units = ''
+        description = sndict.get('description', '')
+        if description is None:
+            description = ''
+        standard_name = elem.get('id')
+        assert standard_name is not None, 'Expected attribute "id" in the XML file.'
+        return dict(standard_name=standard_name,
+                    canonical_units=canonical_units,
+                    description=description)
+
+    def iter_standard_names(self) -> Iterator[Dict]:
+        """Yields the standard name entries one by one"""
+        for tag, value in self._iterparse():
+            if tag == 'entry':
+                yield value
 
     def parse(self) -> Dict:
         """Parse the file"""
-        try:
-            import xmltodict
-        except ImportError:
-            raise ImportError('Package "xmltodict" is missing, but required to import from XML files.')
-
-        with open(str(self.filename), 'r', encoding='utf-8') as file:
-            my_xml = file.read()
-        xmldict = xmltodict.parse(my_xml)
-        _name = list(xmldict.keys())[0]
-
-        xmldata = xmldict[_name]
-
-        def _parse_standard_name(sndict):
-            canonical_units = sndict.get('canonical_units', '')
-            if canonical_units == '1':
-                canonical_units = ''
-            elif canonical_units is None:
-                canonical_units = ''
-            description = sndict.get('description', '')
-            if description is None:
-                description = ''
-            standard_name = sndict.get('@id')
-            assert standard_name is not None, 'Expected key "@id" in the XML file.'
-            assert canonical_units is not None, 'Expected key "canonical_units" in the XML file.'
-            assert description is not None, 'Expected key "description" in the XML file.'
-            return dict(standard_name=standard_name,
-                        canonical_units=canonical_units,
-                        description=description)
-
-        version = xmldata.get('version', None)
+        header = {}
+        sndata = []
+        for tag, value in self._iterparse():
+            if tag == 'entry':
+                sndata.append(value)
+            else:
+                header[tag] = value
+
+        version = header.get('version', None)
         if version is None:
-            version = xmldata.get('version_number', None)
+            version = header.get('version_number', None)
 
-        # last_modified = xmldata.get('last_modified', None)
+        # last_modified = header.get('last_modified', None)
 
-        contact = xmldata.get('contact', None)
-        institution = xmldata.get('institution', None)
-        if "@" in contact and institution is not None:
+        contact = header.get('contact', None)
+        institution = header.get('institution', None)
+        if contact and "@" in contact and institution is not None:
             # it is an email address
             from ssnolib.prov import Organization
             creator = Organization(mbox=contact, name=institution)
@@ -67,23 +123,15 @@ class XMLReader(TableReader):
 
             # else cannot be parsed
 
-        sn_data = xmldata.get('entry', None)
-        if sn_data is None:
+        if not sndata:
             raise KeyError('Expected key "entry" in the XML file.')
-        data = {'standard_name': [_parse_standard_name(sn) for sn in sn_data],
-                'version': version,
+        data = {'version': version,
                 # 'modified': last_modified,
                 'creator': creator}
 
-        if 'title' not in xmldata:
+        if 'title' not in header:
             data['title'] = self.filename.stem
 
-        sndata = data.pop('standard_name')
-        for sn in sndata:
-            if sn['description'] is None:
-                name = sn['standard_name']
-                warnings.warn(f'Description of "{name}" is None. Setting to empty string.', UserWarning)
-                sn['description'] = ""
         data['standard_names'] = sndata
         return data
 
@@ -96,7 +144,7 @@ class YAMLReader(TableReader):
         except ImportError as e:
             raise ImportError('Package "pyyaml" is missing, but required to import from YAML files.') from e
 
-        with open(self.filename, 'r') as f:
+        with self.open() as f:
             data = yaml.safe_load(f)
         standard_names = data['standard_names']
 
@@ -152,12 +200,27 @@ class YAMLReader(TableReader):
 
 
 class JSONLDReader(TableReader):
+    """Reader for JSON-LD standard name tables.
+
+    Documents shaped like the ones written by ssnolib are mapped directly to the
+    fields of the table (see `ssnolib.jsonld.from_jsonld_dict`). All other documents
+    are loaded into an RDF graph and queried (`StandardNameTable.from_jsonld`). Remote
+    contexts are inlined from the context store before (see `ssnolib.context`).
+    """
+
     def parse(self) -> Dict:
+        import json
+        from .context import get_resolver
+        from .jsonld import from_jsonld_dict
         from .standard_name_table import StandardNameTable
-        with open(self.filename, 'r') as f:
-            import json
-            snt = StandardNameTable.from_jsonld(data=json.load(f), limit=1)
-            return snt.model_dump(exclude_none=True)
+        with self.open() as f:
+            data = json.load(f)
+        fields = from_jsonld_dict(data, StandardNameTable)
+        if fields is not None:
+            return fields
+        # inline remote contexts, so that rdflib does not fetch them
+        snt = StandardNameTable.from_jsonld(data=get_resolver().resolve(data), limit=1)
+        return snt.model_dump(exclude_none=True)
 
 
 _plugins = {
@@ -0,0 +1,117 @@
+"""Decomposition of qualified standard names into the base standard name and its qualifications.
+
+A qualified standard name is built like
+
+    [<component>_]<standard_name>[_of_<medium>][_across_<device>][_at_<location>][_with_<condition>][_in_<reference_frame>]
+
+e.g. "static_pressure_difference_across_fan_at_fan_inlet" or "x_velocity_in_rotating_frame".
+"""
+import re
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# (field of the StandardNameTable, name of the qualification, preposition) in the order
+# the qualifications follow the base standard name
+QUALIFICATIONS: Tuple[Tuple[str, str, str], ...] = (
+    ('media', 'medium', 'of'),
+    ('devices', 'device', 'across'),
+    ('locations', 'location', 'at'),
+    ('conditions', 'condition', 'with'),
+    ('reference_frames', 'reference_frame', 'in'),
+)
+
+
+class QualifiedName(NamedTuple):
+    """Result of the decomposition of a qualified standard name"""
+    standard_name: str
+    component: Optional[str] = None
+    medium: Optional[str] = None
+    device: Optional[str] = None
+    location: Optional[str] = None
+    condition: Optional[str] = None
+    reference_frame: Optional[str] = None
+
+
+def _alternation(names: Iterable[str]) -> str:
+    # longest names first, so that e.g. "fan_inlet" is preferred over "fan"
+    return '|'.join(re.escape(n) for n in sorted(set(names), key=lambda n: (-len(n), n)))
+
+
+class QualificationDecomposer:
+    """Compiles the qualifications of a Standard Name Table into a regular expression
+    and decomposes qualified standard names with it.
+
+    Parameters
+    ----------
+    qualifications: Dict[str, Iterable[str]]
+        The qualification names per field of the StandardNameTable, e.g.
+        {'locations': ['fan_inlet', 'fan_outlet'], 'devices': ['fan']}
+    components: Iterable[str]
+        The names of the vector components, which may prefix a standard name, e.g. ['x', 'y', 'z']
+    """
+
+    def __init__(self, qualifications: Dict[str, Iterable[str]], components: Iterable[str] = ()):
+        suffix = ''
+        for field, group, preposition in QUALIFICATIONS:
+            names = qualifications.get(field, None)
+            if names:
+                suffix += f'(?:_{preposition}_(?P<{group}>{_alternation(names)}))?'
+        self.components = frozenset(components)
+        prefix = f'(?:(?P<component>{_alternation(self.components)})_)?' if self.components else ''
+        self.pattern = re.compile(f'{prefix}(?P<standard_name>\\w+?){suffix}')
+        self.suffix_pattern = re.compile(suffix)
+
+    def _decompose_slow(self, name: str, known: Callable[[str], bool]) -> Optional[QualifiedName]:
+        """Try all possible splits of the name into base name and qualifications"""
+        starts = [0]
+        component, sep, _ = name.partition('_')
+        if sep and component in self.components:
+            starts.insert(0, len(component) + 1)
+        for start in starts:
+            splits = [m.start() for m in re.finditer('_', name) if m.start() > start] + [len(name)]
+            for split in splits:
+                base = name[start:split]
+                if not known(base):
+                    continue
+                m = self.suffix_pattern.fullmatch(name, split)
+                if m is not None:
+                    return QualifiedName(standard_name=base,
+                                         component=name[:start - 1] if start else None,
+                                         **m.groupdict())
+        return None
+
+    def decompose(self, name: str, known: Optional[Callable[[str], bool]] = None) -> Optional[QualifiedName]:
+        """Decompose a qualified standard name.
+
+        Parameters
+        ----------
+        name: str
+            The (qualified) standard name
+        known: Optional[Callable[[str], bool]]
+            If given, the base standard name must be known, i.e. known(base) must return
+            True. All possible decompositions are tried.
+
+        Returns
+        -------
+        Optional[QualifiedName]
+            The decomposed name or None, if the name cannot be decomposed
+        """
+        m = self.pattern.fullmatch(name)
+        if m is not None:
+            qn = QualifiedName(**m.groupdict())
+            if known is None or known(qn.standard_name):
+                return qn
+        if known is None:
+            return None
+        return self._decompose_slow(name, known)
+
+    def decompose_many(self,
+                       names: Iterable[str],
+                       known: Optional[Callable[[str], bool]] = None) -> List[Optional[QualifiedName]]:
+        """Decompose multiple qualified standard names. Every distinct name is decomposed only once."""
+        results = {}
+        out = []
+        for name in names:
+            if name not in results:
+                results[name] = self.decompose(name, known)
+            out.append(results[name])
+        return out
@@ -1,4 +1,2 @@
 # noinspection PyUnresolvedReferences
-from ontolutils import parse_unit
-
-# TODO: remove this in future versions
+from ..units import parse_unit
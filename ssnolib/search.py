@@ -0,0 +1,213 @@
+"""In-memory search indexes over the standard names of a StandardNameTable"""
+import heapq
+import math
+import re
+from typing import Dict, List, Optional, Tuple, Union
+
+from .index import StandardNameList, _name_of
+from .standard_name import StandardName
+
+_TOKEN_PATTERN = re.compile(r'[^\W_]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Split a text or a standard name into lower case tokens"""
+    if not text:
+        return []
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def _description_of(item: Union[StandardName, Dict]) -> str:
+    if isinstance(item, dict):
+        return item.get('description', None) or ''
+    return item.description or ''
+
+
+class TextIndex:
+    """Inverted index over the tokens of the standard names and their descriptions,
+    which ranks the documents (standard names) with BM25.
+
+    Parameters
+    ----------
+    standard_names: StandardNameList
+        The standard names to index
+    name_weight: float=2.0
+        Weight of a token of the standard name compared to a token of the description
+    k1: float=1.2
+        BM25 term frequency saturation
+    b: float=0.75
+        BM25 document length normalization
+    """
+
+    def __init__(self,
+                 standard_names: StandardNameList,
+                 name_weight: float = 2.0,
+                 k1: float = 1.2,
+                 b: float = 0.75):
+        self.name_weight = name_weight
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._lengths: Dict[int, float] = {}
+        self._total_length = 0.
+        for i, sn in enumerate(standard_names.iter_raw()):
+            self.add(i, sn)
+
+    def __len__(self):
+        return len(self._lengths)
+
+    def add(self, position: int, standard_name: Union[StandardName, Dict]):
+        """Add a standard name at the given position of the list"""
+        frequencies: Dict[str, float] = {}
+        for token in tokenize(_name_of(standard_name)):
+            frequencies[token] = frequencies.get(token, 0.) + self.name_weight
+        for token in tokenize(_description_of(standard_name)):
+            frequencies[token] = frequencies.get(token, 0.) + 1.
+        length = sum(frequencies.values())
+        self._lengths[position] = length
+        self._total_length += length
+        for token, frequency in frequencies.items():
+            self._postings.setdefault(token, {})[position] = frequency
+
+    def search(self, text: str, k: int = 10) -> List[Tuple[int, float]]:
+        """Return the positions and scores of the k best matching standard names
+
+        Parameters
+        ----------
+        text: str
+            The search text, e.g. "pressure at the surface"
+        k: int=10
+            Maximal number of results
+
+        Returns
+        -------
+        List[Tuple[int, float]]
+            The positions and scores, best match first
+        """
+        n = len(self._lengths)
+        if n == 0:
+            return []
+        avg_length = self._total_length / n
+        k1, b = self.k1, self.b
+        scores: Dict[int, float] = {}
+        for token in set(tokenize(text)):
+            postings = self._postings.get(token, None)
+            if not postings:
+                continue
+            idf = math.log(1. + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for position, frequency in postings.items():
+                norm = k1 * (1. - b + b * self._lengths[position] / avg_length)
+                scores[position] = scores.get(position, 0.) + idf * frequency * (k1 + 1.) / (frequency + norm)
+        return heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+
+
+def levenshtein(a: str, b: str, max_distance: Optional[int] = None) -> Optional[int]:
+    """Return the edit distance between two strings. If `max_distance` is given,
+    only the band of the distance matrix within max_distance is computed and
+    None is returned if the distance exceeds max_distance."""
+    la, lb = len(a), len(b)
+    if la > lb:
+        a, b, la, lb = b, a, lb, la
+    if max_distance is None:
+        max_distance = lb
+    if lb - la > max_distance:
+        return None
+    inf = max_distance + 1
+    previous = [j if j <= max_distance else inf for j in range(lb + 1)]
+    for i in range(1, la + 1):
+        lo = max(1, i - max_distance)
+        hi = min(lb, i + max_distance)
+        current = [inf] * (lb + 1)
+        if i <= max_distance:
+            current[0] = i
+        row_min = current[0]
+        ca = a[i - 1]
+        for j in range(lo, hi + 1):
+            d = min(previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (ca != b[j - 1]))
+            if d > inf:
+                d = inf
+            current[j] = d
+            if d < row_min:
+                row_min = d
+        if row_min > max_distance:
+            return None
+        previous = current
+    distance = previous[lb]
+    return distance if distance <= max_distance else None
+
+
+class NGramIndex:
+    """Character n-gram index over the standard names to find similar names
+    (within an edit distance) without comparing against all names.
+
+    Candidates are filtered by the q-gram lemma: two strings with an edit distance
+    of at most d share at least max(len(a), len(b)) + q - 1 - q * d q-grams (of
+    the padded strings). Only the candidates are compared by their edit distance.
+    """
+
+    def __init__(self, standard_names: StandardNameList, q: int = 3):
+        self.q = q
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        self._names: Dict[int, str] = {}
+        for i, sn in enumerate(standard_names.iter_raw()):
+            self.add(i, sn)
+
+    def __len__(self):
+        return len(self._names)
+
+    def _ngrams(self, name: str) -> Dict[str, int]:
+        padding = '\x00' * (self.q - 1)
+        padded = f'{padding}{name}{padding}'
+        ngrams: Dict[str, int] = {}
+        for i in range(len(padded) - self.q + 1):
+            ngram = padded[i:i + self.q]
+            ngrams[ngram] = ngrams.get(ngram, 0) + 1
+        return ngrams
+
+    def add(self, position: int, standard_name: Union[StandardName, Dict]):
+        """Add a standard name at the given position of the list"""
+        name = _name_of(standard_name)
+        self._names[position] = name
+        for ngram, count in self._ngrams(name).items():
+            self._postings.setdefault(ngram, []).append((position, count))
+
+    def search(self, name: str, max_distance: int = 2, k: Optional[int] = None) -> List[Tuple[int, int]]:
+        """Return the positions and edit distances of the names within max_distance,
+        closest first (ties sorted by name).
+
+        Parameters
+        ----------
+        name: str
+            The (possibly misspelled) name
+        max_distance: int=2
+            Maximal edit distance
+        k: Optional[int]
+            Maximal number of results
+
+        Returns
+        -------
+        List[Tuple[int, int]]
+            The positions and edit distances
+        """
+        q = self.q
+        if len(name) + q - 1 - q * max_distance <= 0:
+            # too short to filter by n-grams
+            candidates = self._names.keys()
+        else:
+            shared: Dict[int, int] = {}
+            for ngram, count in self._ngrams(name).items():
+                for position, doc_count in self._postings.get(ngram, ()):
+                    shared[position] = shared.get(position, 0) + min(count, doc_count)
+            candidates = [position for position, n in shared.items()
+                          if n >= max(len(name), len(self._names[position])) + q - 1 - q * max_distance]
+        results = []
+        for position in candidates:
+            distance = levenshtein(name, self._names[position], max_distance)
+            if distance is not None:
+                results.append((distance, self._names[position], position))
+        results.sort()
+        if k is not None:
+            results = results[:k]
+        return [(position, distance) for distance, _, position in results]
@@ -0,0 +1,161 @@
+"""Persistent cache of parsed Standard Name Tables.
+
+Parsing a table file (reader + validation) is expensive for large tables. The
+already validated table is stored as a compact snapshot in the cache directory,
+keyed by the hash of the file content, the reader (format), the library version
+and the Python version. Loading a snapshot skips the reader and the validation
+of the standard names.
+
+Snapshots only contain builtin types and are serialized with `marshal`.
+"""
+import hashlib
+import marshal
+import os
+import pathlib
+import sys
+import time
+import uuid
+from typing import Dict, Optional, Type, Union
+
+from ._version import __version__
+from .index import StandardNameList
+from .standard_name import StandardName
+from .utils import get_cache_dir
+
+SNAPSHOT_SUFFIX = '.snapshot'
+MAX_SIZE = 256 * 1024 ** 2  # bytes
+MAX_AGE = 30 * 24 * 3600  # seconds
+_LOCK_TIMEOUT = 60  # seconds after which a lock file is considered stale
+
+
+def get_snapshot_dir() -> pathlib.Path:
+    """Return the snapshot directory and create it if it does not exist"""
+    snapshot_dir = get_cache_dir() / 'snapshots'
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+    return snapshot_dir
+
+
+def get_key(filename: Union[str, pathlib.Path], fmt: str) -> str:
+    """Return the snapshot key of a table file read with the given format (reader)"""
+    content_hash = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(2 ** 20), b''):
+            content_hash.update(chunk)
+    python_version = '.'.join(map(str, sys.version_info[:2]))
+    return hashlib.sha256(
+        f'{content_hash.hexdigest()}:{fmt}:{__version__}:{python_version}'.encode()
+    ).hexdigest()
+
+
+def to_snapshot(snt) -> Dict:
+    """Return the compact snapshot of a (validated) Standard Name Table. The standard
+    names are stored as rows of a table, of which the columns are the fields."""
+    table = snt.model_dump(mode='json', exclude_none=True, exclude={'standard_names'})
+    records = [sn.model_dump(mode='json', exclude_none=True) for sn in snt.standard_names or []]
+    columns = sorted({k for r in records for k in r})
+    rows = [tuple(r.get(c, None) for c in columns) for r in records]
+    return {'table': table,
+            'columns': tuple(columns),
+            'rows': rows,
+            'has_standard_names': snt.standard_names is not None}
+
+
+def construct_standard_name(record: Dict) -> StandardName:
+    """Build a StandardName from an already validated record (see `to_snapshot()`)"""
+    if any(isinstance(v, (dict, list)) for v in record.values()):
+        # nested objects need to be validated
+        return StandardName.model_validate(record)
+    return StandardName.model_construct(**record)
+
+
+def from_snapshot(snapshot: Dict, cls: Type = None):
+    """Build a Standard Name Table from a snapshot without validating the standard names"""
+    if cls is None:
+        from .standard_name_table import StandardNameTable
+        cls = StandardNameTable
+    columns = snapshot['columns']
+    data = dict(snapshot['table'])
+    if snapshot['has_standard_names']:
+        data['standard_names'] = StandardNameList(
+            construct_standard_name({c: v for c, v in zip(columns, row) if v is not None})
+            for row in snapshot['rows']
+        )
+    return cls(**data)
+
+
+def load(key: str) -> Optional[Dict]:
+    """Return the snapshot for the key or None, if it is not cached"""
+    filename = get_snapshot_dir() / f'{key}{SNAPSHOT_SUFFIX}'
+    try:
+        with open(filename, 'rb') as f:
+            snapshot = marshal.load(f)
+    except (FileNotFoundError, EOFError, ValueError, TypeError):
+        return None
+    try:
+        # mark as recently used
+        os.utime(filename)
+    except OSError:
+        pass
+    return snapshot
+
+
+def store(key: str, snapshot: Dict, max_size: int = MAX_SIZE, max_age: float = MAX_AGE) -> Optional[pathlib.Path]:
+    """Store a snapshot and evict old snapshots afterward.
+
+    The snapshot is written to a temporary file first, which is atomically moved
+    in place. A lock file prevents concurrent writers from writing the same
+    snapshot. If the snapshot is locked by another writer, nothing is written
+    and None is returned.
+    """
+    snapshot_dir = get_snapshot_dir()
+    filename = snapshot_dir / f'{key}{SNAPSHOT_SUFFIX}'
+    lock_filename = snapshot_dir / f'{key}.lock'
+    try:
+        fd = os.open(lock_filename, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        try:
+            if time.time() - lock_filename.stat().st_mtime > _LOCK_TIMEOUT:
+                lock_filename.unlink(missing_ok=True)  # stale lock
+        except FileNotFoundError:
+            pass
+        return None
+    try:
+        os.close(fd)
+        tmp_filename = snapshot_dir / f'{key}.{uuid.uuid4().hex}.tmp'
+        try:
+            with open(tmp_filename, 'wb') as f:
+                marshal.dump(snapshot, f)
+            os.replace(tmp_filename, filename)
+        finally:
+            tmp_filename.unlink(missing_ok=True)
+    finally:
+        lock_filename.unlink(missing_ok=True)
+    evict(max_size=max_size, max_age=max_age)
+    return filename
+
+
+def evict(max_size: int = MAX_SIZE, max_age: float = MAX_AGE):
+    """Delete snapshots older than `max_age` seconds (not used since) and the
+    least recently used snapshots, until the total size is below `max_size` bytes."""
+    now = time.time()
+    snapshots = []
+    for filename in get_snapshot_dir().glob(f'*{SNAPSHOT_SUFFIX}'):
+        try:
+            stat = filename.stat()
+        except FileNotFoundError:
+            continue
+        if now - stat.st_mtime > max_age:
+            filename.unlink(missing_ok=True)
+        else:
+            snapshots.append((stat.st_mtime, stat.st_size, filename))
+    total_size = sum(size for _, size, _ in snapshots)
+    for _, size, filename in sorted(snapshots):
+        if total_size <= max_size:
+            break
+        filename.unlink(missing_ok=True)
+        total_size -= size
+
+
+def clear():
+    """Delete all snapshots"""
+    evict(max_size=0, max_age=0)
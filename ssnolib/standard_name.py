@@ -5,6 +5,7 @@ from ontolutils import namespaces, urirefs
 from pydantic import HttpUrl, field_validator, Field
 
 from ssnolib.dcat import Dataset
+from ssnolib.units import convert as convert_units
 from ssnolib.qudt import parse_unit
 from ssnolib.skos import Concept
 
@@ -55,3 +56,31 @@ class StandardName(Concept):
                 warnings.warn(f'Could not parse canonical_units: "{canonical_units}".', UserWarning)
             return str(canonical_units)
         return str(HttpUrl(canonical_units))
+
+    def convert(self, data, units: Union[HttpUrl, str], out=None):
+        """Convert array data given in `units` to the canonical units of the standard name.
+        Scale and offset are computed once per pair of units and cached.
+
+        Parameters
+        ----------
+        data: array_like
+            The values in the given units
+        units: Union[HttpUrl, str]
+            The units of the values, e.g. "mm" or "hPa"
+        out: Optional[np.ndarray]
+            The array to write the result to. Pass `data` itself to convert in place.
+            For chunk-wise conversion of large (HDF5) datasets see `ssnolib.units.iter_convert()`.
+
+        Returns
+        -------
+        np.ndarray
+            The values in the canonical units
+
+        Raises
+        ------
+        KeyError
+            If a unit is unknown
+        ValueError
+            If the units are not compatible with the canonical units
+        """
+        return convert_units(data, str(units), self.canonical_units, out=out)
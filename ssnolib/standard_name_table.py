@@ -1,15 +1,96 @@
+import asyncio
+import functools
+import marshal
+import os
 import pathlib
-from typing import List, Union, Dict, Optional
+import pickle
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, BinaryIO, Iterable, Iterator, List, NamedTuple, Tuple, Union, Dict, Optional
 
+import pydantic
 from ontolutils import namespaces, urirefs, Thing
-from pydantic import field_validator, Field
-
-from . import plugins
+from pydantic import field_serializer, field_validator, Field, PrivateAttr
+
+from . import jsonld, plugins, snapshot
+from .archive import Archive
+from .download import run_download
+from .index import LazyStandardNameList, NameIndex, SortedNameIndex, StandardNameList
+from .qualification import QUALIFICATIONS, QualificationDecomposer, QualifiedName
+from .search import NGramIndex, TextIndex
+from .units import Dimension, DimensionIndex, get_dimension
+from .utils import LRUCache
 from ssnolib.dcat import Dataset, Distribution
 from ssnolib.prov import Person, Organization
 from .standard_name import StandardName
 
 
+def _distribution_format(distribution: Distribution) -> Optional[str]:
+    """Return the format of a distribution: the media type or the suffix of the download URL"""
+    if distribution.media_type is not None:
+        return str(distribution.media_type)
+    if distribution.download_URL is not None and distribution.download_URL.path:
+        return pathlib.PurePosixPath(distribution.download_URL.path).suffix[1:].lower() or None
+    return None
+
+
+def _parse_to_snapshot(cls, source, fmt: Optional[str], kwargs: Dict) -> Tuple[bool, Union[bytes, Exception]]:
+    """Parse a table in a worker process and return the marshalled snapshot
+    (see `ssnolib.snapshot`) or the error"""
+    try:
+        return True, marshal.dumps(snapshot.to_snapshot(cls.parse(source, fmt=fmt, **kwargs)))
+    except Exception as e:
+        try:
+            pickle.dumps(e)
+        except Exception:
+            e = RuntimeError(f'{type(e).__name__}: {e}')
+        return False, e
+
+
+def _validate_chunk(start: int, records: List[Dict]) -> Tuple[bytes, List[Dict]]:
+    """Validate standard name records in a worker process. Returns the marshalled
+    validated records (like the rows of a snapshot, see `ssnolib.snapshot`) and
+    the errors, located by the position of the records in the table"""
+    validated = []
+    errors = []
+    for i, record in enumerate(records, start):
+        try:
+            validated.append(StandardName.model_validate(record).model_dump(mode='json', exclude_none=True))
+        except pydantic.ValidationError as e:
+            errors.extend({**error, 'loc': ('standard_names', i, *error['loc'])}
+                          for error in e.errors(include_url=False))
+    return marshal.dumps(validated), errors
+
+
+def _validation_error(title: str, errors: List[Dict]) -> Exception:
+    """Return one error for the errors of all chunks"""
+    line_errors = [{'type': error['type'], 'loc': error['loc'], 'input': error['input'],
+                    **({'ctx': error['ctx']} if 'ctx' in error else {})} for error in errors]
+    try:
+        return pydantic.ValidationError.from_exception_data(title, line_errors)
+    except Exception:
+        # e.g. custom error types, which cannot be rebuilt
+        messages = '\n'.join(f'{".".join(map(str, error["loc"]))}\n  {error["msg"]}' for error in errors)
+        return ValueError(f'{len(errors)} validation errors for {title}\n{messages}')
+
+
+def _validate_standard_names(records: List, max_workers: int, chunk_size: int = None,
+                             title: str = 'StandardNameTable') -> StandardNameList:
+    """Validate standard name records in chunks in a process pool and return the
+    standard names in the order of the records"""
+    n = len(records)
+    if chunk_size is None:
+        # a few chunks per worker to balance the load
+        chunk_size = max(1, -(-n // (max_workers * 4)))
+    starts = range(0, n, chunk_size)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(_validate_chunk, starts, [records[i:i + chunk_size] for i in starts]))
+    errors = [error for _, chunk_errors in results for error in chunk_errors]
+    if errors:
+        raise _validation_error(title, errors)
+    return StandardNameList(snapshot.construct_standard_name(record)
+                            for validated, _ in results for record in marshal.loads(validated))
+
+
 @namespaces(ssno="https://matthiasprobst.github.io/ssno#",
             schema="http://schema.org/",
             dcterms="http://purl.org/dc/terms/")
@@ -82,6 +163,29 @@ class ReferenceFrame(Qualification):
         return f'{self.__class__.__name__}("{self.name}")'
 
 
+class NameValidationResult(NamedTuple):
+    """Result of `StandardNameTable.validate_names()`
+
+    Parameters
+    ----------
+    codes: numpy.ndarray
+        One code (uint8) per validated name: UNKNOWN, EXACT or QUALIFIED
+    failures: numpy.ndarray
+        The indexes of the unknown names
+    """
+    codes: Any
+    failures: Any
+
+    UNKNOWN = 0  # neither a standard name nor a qualified standard name of the table
+    EXACT = 1  # a standard name of the table
+    QUALIFIED = 2  # a qualified standard name, of which the base name is part of the table
+
+    @property
+    def valid(self):
+        """Boolean mask of the valid names"""
+        return self.codes != self.UNKNOWN
+
+
 @namespaces(ssno="https://matthiasprobst.github.io/ssno#",
             dcterms="http://purl.org/dc/terms/")
 @urirefs(StandardNameTable='ssno:StandardNameTable',
@@ -134,6 +238,9 @@ class StandardNameTable(Dataset):
     conditions: List[Condition] = None
     reference_frames: List[ReferenceFrame] = None
 
+    _decomposer: Optional[QualificationDecomposer] = PrivateAttr(default=None)
+    _decomposer_key: Optional[tuple] = PrivateAttr(default=None)
+
     def __str__(self) -> str:
         if self.identifier:
             return self.identifier
@@ -141,43 +248,255 @@ class StandardNameTable(Dataset):
             return self.title
         return ''
 
-    @classmethod
-    def parse(cls,
-              source: Union[str, pathlib.Path, Distribution],
-              fmt: str = None):
-        """Call the reader plugin for the given format.
-        Format will select the reader plugin to use. Currently, 'xml' is supported."""
+    @staticmethod
+    def _get_reader(source: Union[str, pathlib.Path, Distribution],
+                    fmt: str = None) -> plugins.TableReader:
+        """Return the reader plugin instance for the source"""
         if isinstance(source, (str, pathlib.Path)):
             filename = source
             if fmt is None:
                 filename = source
                 fmt = pathlib.Path(source).suffix[1:].lower()
+        elif hasattr(source, 'read'):
+            # a binary file object, e.g. a member of an archive
+            filename = source
+            if fmt is None:
+                fmt = pathlib.PurePosixPath(getattr(source, 'name', None) or '').suffix[1:].lower()
         else:
             if fmt is None:
-                fmt = source.media_type
-            filename = source.download()
+                fmt = _distribution_format(source)
+            # the cached (or file://) copy is read in place
+            filename = source.local_path()
         reader = plugins.get(fmt, None)
         if reader is None:
             raise ValueError(
                 f'No plugin found for the file. The reader was determined based on the suffix: {fmt}. '
                 'You may overwrite this by providing the parameter fmt'
             )
+        return reader(filename)
+
+    @classmethod
+    def parse(cls,
+              source: Union[str, pathlib.Path, Distribution, BinaryIO],
+              fmt: str = None,
+              lazy: bool = False,
+              use_cache: bool = True,
+              member: str = None,
+              validation_workers: int = None):
+        """Call the reader plugin for the given format.
+        Format will select the reader plugin to use. Currently, 'xml' is supported.
+
+        If `lazy` is True, the standard names are kept as raw records and validated
+        only when accessed (by lookup, iteration or indexing). Call
+        `validate_standard_names()` to validate all of them.
+
+        If `use_cache` is True, the parsed table is stored as a snapshot in the
+        cache directory (see `ssnolib.snapshot`). Parsing the same file content
+        again loads the snapshot and skips the reader and the validation. As the
+        snapshot is already validated, it is also preferred over lazy parsing.
+
+        The source may also be a binary file object. If `member` is given, the
+        source is a zip archive and the table is read from the member of the
+        archive (see `ssnolib.archive`) without extracting it. The format is then
+        determined from the name of the member.
+
+        If `validation_workers` is given (opt-in), the standard names are split
+        into chunks, which are validated in that many worker processes. The order
+        of the standard names is kept and all invalid standard names are reported
+        in one pydantic.ValidationError."""
+        if member is not None:
+            with (source.archive() if isinstance(source, Distribution) else Archive(source)) as archive:
+                with archive.open(member) as f:
+                    return cls.parse(f, fmt=fmt, lazy=lazy, use_cache=use_cache,
+                                     validation_workers=validation_workers)
+        reader = cls._get_reader(source, fmt)
+        key = None
+        if use_cache and reader.file is None:
+            key = snapshot.get_key(reader.filename, fmt=type(reader).__name__)
+            cached = snapshot.load(key)
+            if cached is not None:
+                return snapshot.from_snapshot(cached, cls)
+
+        data: Dict = reader.parse()
+        if lazy and data.get('standard_names', None) is not None:
+            data['standard_names'] = LazyStandardNameList(data['standard_names'])
+            return cls(**data)
+
+        if validation_workers is not None and data.get('standard_names', None):
+            data['standard_names'] = _validate_standard_names(data['standard_names'], validation_workers,
+                                                              title=cls.__name__)
+        snt = cls(**data)
+        if key is not None:
+            snapshot.store(key, snapshot.to_snapshot(snt))
+        return snt
+
+    @classmethod
+    async def aparse(cls,
+                     source: Union[str, pathlib.Path, Distribution],
+                     fmt: str = None,
+                     semaphore: asyncio.Semaphore = None,
+                     executor: Executor = None,
+                     **kwargs):
+        """Awaitable version of `parse()`.
+
+        A distribution is downloaded into the download cache in an executor (the
+        number of concurrent downloads is bounded by `semaphore`, see
+        `ssnolib.download.run_download`). The (CPU-bound) parsing
+        runs in `executor`, e.g. a ProcessPoolExecutor, or by default in the default
+        executor of the event loop.
+
+        Parameters
+        ----------
+        source: Union[str, pathlib.Path, Distribution]
+            The table file or distribution
+        fmt: str=None
+            The format. If None, it is determined from the suffix or the media type.
+        semaphore: asyncio.Semaphore=None
+            Bounds the number of concurrent downloads
+        executor: Executor=None
+            The executor to parse in
+        **kwargs
+            Additional keyword arguments passed to `parse()`
+
+        Returns
+        -------
+        StandardNameTable
+            The parsed table
+        """
+        if isinstance(source, Distribution):
+            if fmt is None:
+                fmt = _distribution_format(source)
+            source = await run_download(source.local_path, semaphore=semaphore)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, functools.partial(cls.parse, source, fmt=fmt, **kwargs))
+
+    @classmethod
+    def parse_many(cls,
+                   sources: Iterable[Union[str, pathlib.Path, Distribution]],
+                   fmt: str = None,
+                   max_workers: int = None,
+                   **kwargs) -> List[Union["StandardNameTable", Exception]]:
+        """Parse several tables in a process pool.
+
+        The workers send the parsed tables back as marshalled snapshots (see
+        `ssnolib.snapshot`), which only contain builtin types and are much
+        cheaper to transfer than the pickled models. The standard names are not
+        validated again in the calling process.
+
+        Parameters
+        ----------
+        sources: Iterable[Union[str, pathlib.Path, Distribution]]
+            The table files or distributions
+        fmt: str=None
+            The format of all sources. If None, it is determined per source.
+        max_workers: int=None
+            The number of worker processes. Defaults to the number of CPUs. With
+            one worker (or one source), the tables are parsed in this process.
+        **kwargs
+            Additional keyword arguments passed to `parse()`, e.g. use_cache
 
-        data: Dict = reader(filename).parse()
+        Returns
+        -------
+        List[Union[StandardNameTable, Exception]]
+            The tables, or the errors raised while parsing them, in the order of the sources
+        """
+        sources = list(sources)
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        max_workers = min(max_workers, len(sources))
+        if max_workers <= 1:
+            results = [_parse_to_snapshot(cls, source, fmt, kwargs) for source in sources]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(_parse_to_snapshot, cls, source, fmt, kwargs) for source in sources]
+                results = []
+                for future in futures:
+                    try:
+                        results.append(future.result())
+                    except Exception as e:
+                        # e.g. the source cannot be sent to the worker process
+                        results.append((False, e))
+        return [snapshot.from_snapshot(marshal.loads(result), cls) if ok else result
+                for ok, result in results]
+
+    @classmethod
+    def iter_parse(cls,
+                   source: Union[str, pathlib.Path, Distribution],
+                   fmt: str = None) -> Iterator[StandardName]:
+        """Yields the standard names of a table file one by one without building
+        the table. Readers supporting it (e.g. the XML reader) stream the entries
+        from the file, so the full table is never held in memory.
+
+        Parameters
+        ----------
+        source: Union[str, pathlib.Path, Distribution]
+            The table file or distribution
+        fmt: str=None
+            The format. If None, it is determined from the suffix or the media type.
 
-        return cls(**data)
+        Yields
+        ------
+        StandardName
+            The standard names of the table
+        """
+        for sndata in cls._get_reader(source, fmt).iter_standard_names():
+            yield StandardName(**sndata)
 
-    @field_validator('standard_names')
+    @field_validator('standard_names', mode='wrap')
     @classmethod
-    def _standard_names(cls, standard_names: Union[StandardName, List[StandardName]]) -> List[StandardName]:
+    def _standard_names(cls, standard_names: Union[StandardName, List[StandardName]], handler) -> List[StandardName]:
+        if isinstance(standard_names, LazyStandardNameList):
+            # validated on access
+            return standard_names
         if not isinstance(standard_names, list):
-            return [standard_names]
-        return standard_names
+            standard_names = [standard_names]
+        return StandardNameList(handler(standard_names))
+
+    @field_serializer('standard_names', mode='wrap')
+    def _serialize_standard_names(self, standard_names: List[StandardName], handler):
+        if isinstance(standard_names, LazyStandardNameList):
+            standard_names.materialize()
+        return handler(standard_names)
+
+    def validate_standard_names(self):
+        """Validate all standard names of the table. Only needed for lazily parsed
+        tables, see `parse()`.
+
+        Raises
+        ------
+        pydantic.ValidationError
+            If a standard name is invalid
+        """
+        if isinstance(self.standard_names, LazyStandardNameList):
+            self.standard_names.materialize()
+
+    def _get_index(self, key: str, factory):
+        """Return the (cached) index `key` of the standard names"""
+        if not self.standard_names:
+            return None
+        if not isinstance(self.standard_names, StandardNameList):
+            # e.g. if the model was constructed without validation
+            self.__dict__['standard_names'] = StandardNameList(self.standard_names)
+        return self.standard_names.get_index(key, factory)
+
+    def _get_name_index(self) -> Optional[NameIndex]:
+        """Return the (cached) name index of the standard names"""
+        return self._get_index('name', NameIndex)
+
+    def _get_sorted_index(self) -> Optional[SortedNameIndex]:
+        """Return the (cached) sorted name index of the standard names"""
+        return self._get_index('sorted', SortedNameIndex)
+
+    def _from_positions(self, positions: List[int]) -> List[StandardName]:
+        return [self.standard_names[i] for i in positions]
 
     def get_standard_name(self, standard_name: str) -> Union[StandardName, None]:
         """Check if the Standard Name Table has a given standard name. The
         standard name object is returned if found, otherwise None.
 
+        The lookup uses a name index, which is built on the first call and
+        kept up to date when the standard names are reassigned or appended to.
+
         Parameters
         ----------
         standard_name: str
@@ -188,10 +507,331 @@ class StandardNameTable(Dataset):
         Union[StandardName, None]
             The standard name object if found, otherwise None
         """
-        for sn in self.standard_names:
-            if sn.standard_name == standard_name:
-                return sn
-        return
+        index = self._get_name_index()
+        if index is None:
+            return
+        position = index.get(standard_name)
+        if position is None:
+            return
+        sn = self.standard_names[position]
+        if sn.standard_name != standard_name:
+            # the standard name object was renamed in place. Rebuild the index:
+            self.standard_names.invalidate()
+            return self.get_standard_name(standard_name)
+        return sn
+
+    def get_many(self, standard_names: Iterable[str]) -> List[Union[StandardName, None]]:
+        """Return the standard name objects for multiple standard names at once.
+
+        Parameters
+        ----------
+        standard_names: Iterable[str]
+            The standard names to look for
+
+        Returns
+        -------
+        List[Union[StandardName, None]]
+            The standard name objects in the order of the input. None is
+            returned for standard names, which are not part of the table.
+        """
+        return [self.get_standard_name(sn) for sn in standard_names]
+
+    def contains(self, standard_names: Iterable[str]) -> List[bool]:
+        """Check for multiple standard names at once, whether they are part of the table.
+
+        Parameters
+        ----------
+        standard_names: Iterable[str]
+            The standard names to look for
+
+        Returns
+        -------
+        List[bool]
+            True for every standard name, which is part of the table
+        """
+        index = self._get_name_index()
+        if index is None:
+            return [False for _ in standard_names]
+        return [sn in index for sn in standard_names]
+
+    def _get_decomposer(self) -> QualificationDecomposer:
+        """Return the compiled qualification decomposer. It is only recompiled
+        if the qualifications of the table have changed."""
+        qualifications = {field: tuple(q.name for q in getattr(self, field) or ())
+                          for field, _, _ in QUALIFICATIONS}
+        components = tuple(c.name for rf in self.reference_frames or () for c in rf.components or ())
+        key = (tuple(qualifications.values()), components)
+        if self._decomposer is None or self._decomposer_key != key:
+            self._decomposer = QualificationDecomposer(qualifications, components)
+            self._decomposer_key = key
+        return self._decomposer
+
+    def _is_standard_name(self, standard_name: str) -> bool:
+        index = self._get_name_index()
+        return index is not None and standard_name in index
+
+    def decompose(self, standard_name: str, validate: bool = True) -> Optional[QualifiedName]:
+        """Decompose a qualified standard name into the base standard name and
+        the qualifications (component, medium, device, location, condition and
+        reference frame) of this table.
+
+        Parameters
+        ----------
+        standard_name: str
+            The qualified standard name, e.g. "static_pressure_difference_across_fan_at_fan_inlet"
+        validate: bool=True
+            If True, the base standard name must be part of the table.
+
+        Returns
+        -------
+        Optional[QualifiedName]
+            The decomposed name or None if the name cannot be decomposed
+        """
+        known = self._is_standard_name if validate else None
+        return self._get_decomposer().decompose(standard_name, known)
+
+    def decompose_many(self, standard_names: Iterable[str], validate: bool = True) -> List[Optional[QualifiedName]]:
+        """Decompose multiple qualified standard names at once. See `decompose()`."""
+        known = self._is_standard_name if validate else None
+        return self._get_decomposer().decompose_many(standard_names, known)
+
+    def validate_names(self, standard_names: Iterable[str], maxsize: int = 2 ** 16) -> NameValidationResult:
+        """Validate many (possibly repeated) names at once. Every distinct name is
+        resolved only once: as a standard name of the table, as a qualified standard
+        name (see `decompose()`) or as unknown. Resolved names are kept in a memo
+        cache for subsequent calls.
+
+        Parameters
+        ----------
+        standard_names: Iterable[str]
+            The names to validate
+        maxsize: int=2**16
+            Maximal number of names kept in the memo cache
+
+        Returns
+        -------
+        NameValidationResult
+            The codes per name and the indexes of the unknown names
+        """
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError('Package "numpy" is missing, but required to validate names in bulk.') from e
+
+        uniques: Dict[str, int] = {}
+        inverse = [uniques.setdefault(name, len(uniques)) for name in standard_names]
+
+        index = self._get_name_index()
+        if index is None:
+            unique_codes = np.zeros(len(uniques), dtype=np.uint8)
+        else:
+            decomposer = self._get_decomposer()
+            memo = self.standard_names.get_index('validation', lambda _: LRUCache(maxsize))
+            if getattr(memo, 'decomposer', None) is not decomposer:
+                # the qualifications have changed
+                memo.clear()
+                memo.decomposer = decomposer
+            memo.maxsize = maxsize
+
+            def _resolve(name: str) -> int:
+                code = memo.get(name)
+                if code is None:
+                    if name in index:
+                        code = NameValidationResult.EXACT
+                    elif decomposer.decompose(name, index.__contains__) is not None:
+                        code = NameValidationResult.QUALIFIED
+                    else:
+                        code = NameValidationResult.UNKNOWN
+                    memo[name] = code
+                return code
+
+            unique_codes = np.fromiter((_resolve(name) for name in uniques), dtype=np.uint8, count=len(uniques))
+        codes = unique_codes[np.asarray(inverse, dtype=np.intp)]
+        return NameValidationResult(codes=codes, failures=np.flatnonzero(codes == NameValidationResult.UNKNOWN))
+
+    def search(self, text: str, k: int = 10) -> List[StandardName]:
+        """Full-text search over the standard names and their descriptions. The
+        results are ranked by relevance (BM25). The underlying inverted index is
+        built on the first search and updated when standard names are appended.
+
+        Parameters
+        ----------
+        text: str
+            The search text, e.g. "pressure at the surface"
+        k: int=10
+            Maximal number of results
+
+        Returns
+        -------
+        List[StandardName]
+            The matching standard names, best match first
+        """
+        index = self._get_index('text', TextIndex)
+        if index is None:
+            return []
+        return self._from_positions([i for i, _ in index.search(text, k)])
+
+    def suggest(self, standard_name: str, max_distance: int = 2, k: int = 5) -> List[StandardName]:
+        """Return the standard names closest to a (misspelled) name ("did you mean"),
+        i.e. the standard names within an edit distance of `max_distance`. Only
+        similar names, found via a character n-gram index, are compared. The index
+        is built on the first call and updated when standard names are appended.
+
+        Parameters
+        ----------
+        standard_name: str
+            The (misspelled) standard name, e.g. "air_temprature"
+        max_distance: int=2
+            Maximal edit distance (Levenshtein) to the suggested standard names
+        k: int=5
+            Maximal number of suggestions
+
+        Returns
+        -------
+        List[StandardName]
+            The suggested standard names, closest first
+        """
+        return self.suggest_many([standard_name], max_distance=max_distance, k=k)[0]
+
+    def suggest_many(self,
+                     standard_names: Iterable[str],
+                     max_distance: int = 2,
+                     k: int = 5) -> List[List[StandardName]]:
+        """Return suggestions for many names at once, e.g. for all unknown names of
+        `validate_names()`. Every distinct name is looked up only once. See `suggest()`."""
+        index = self._get_index('fuzzy', NGramIndex)
+        suggestions: Dict[str, List[StandardName]] = {}
+        out = []
+        for name in standard_names:
+            if name not in suggestions:
+                if index is None:
+                    suggestions[name] = []
+                else:
+                    suggestions[name] = self._from_positions(
+                        [i for i, _ in index.search(name, max_distance=max_distance, k=k)]
+                    )
+            out.append(suggestions[name])
+        return out
+
+    def get_by_prefix(self, prefix: str) -> List[StandardName]:
+        """Return all standard names starting with `prefix` in lexicographic order,
+        e.g. for autocompletion.
+
+        Parameters
+        ----------
+        prefix: str
+            The prefix of the standard names, e.g. "x_velocity_"
+
+        Returns
+        -------
+        List[StandardName]
+            The matching standard name objects
+        """
+        index = self._get_sorted_index()
+        if index is None:
+            return []
+        return self._from_positions(index.prefix(prefix))
+
+    def get_by_suffix(self, suffix: str) -> List[StandardName]:
+        """Return all standard names ending with `suffix` in lexicographic order.
+
+        Parameters
+        ----------
+        suffix: str
+            The suffix of the standard names, e.g. "_at_fan_inlet"
+
+        Returns
+        -------
+        List[StandardName]
+            The matching standard name objects
+        """
+        index = self._get_sorted_index()
+        if index is None:
+            return []
+        return self._from_positions(index.suffix(suffix))
+
+    def get_by_range(self, start: Optional[str] = None, stop: Optional[str] = None) -> List[StandardName]:
+        """Return all standard names `n` with `start <= n < stop` in lexicographic order.
+
+        Parameters
+        ----------
+        start: Optional[str]
+            Lower bound (inclusive). None means unbounded.
+        stop: Optional[str]
+            Upper bound (exclusive). None means unbounded.
+
+        Returns
+        -------
+        List[StandardName]
+            The matching standard name objects
+        """
+        index = self._get_sorted_index()
+        if index is None:
+            return []
+        return self._from_positions(index.range(start, stop))
+
+    def iter_sorted(self) -> Iterator[StandardName]:
+        """Iterate over the standard names in lexicographic order without
+        sorting the list of standard names."""
+        index = self._get_sorted_index()
+        if index is None:
+            return
+        for i in index.positions():
+            yield self.standard_names[i]
+
+    def compatible_with(self, units: Union[str, StandardName]) -> List[StandardName]:
+        """Return all standard names with the same SI dimension as the given units,
+        e.g. all standard names measured in pressure units for "Pa", "N m-2" or
+        "http://qudt.org/vocab/unit/PA". The dimension vectors of the canonical
+        units are cached as one NumPy array, which is compared vectorized.
+
+        Parameters
+        ----------
+        units: Union[str, StandardName]
+            A unit string, a unit IRI or a standard name, whose canonical units are used
+
+        Returns
+        -------
+        List[StandardName]
+            The standard names with the same dimension in the order of the table
+
+        Raises
+        ------
+        KeyError
+            If the dimension of the units is unknown
+        """
+        if isinstance(units, StandardName):
+            units = units.canonical_units
+        dimension = get_dimension(units)
+        if dimension is None:
+            raise KeyError(f'Unknown dimension of units "{units}".')
+        index = self._get_index('dimension', DimensionIndex)
+        if index is None:
+            return []
+        return self._from_positions(index.compatible(dimension).tolist())
+
+    def group_by_dimension(self) -> Dict[Dimension, List[StandardName]]:
+        """Group the standard names by the SI dimension of their canonical units.
+        The keys are the dimension vectors (see `ssnolib.units.DIMENSIONS`).
+        Standard names of unknown dimension are omitted."""
+        index = self._get_index('dimension', DimensionIndex)
+        if index is None:
+            return {}
+        return {dimension: self._from_positions(positions) for dimension, positions in index.groups().items()}
+
+    def get_jsonld_dict(self,
+                        context: Optional[Union[Dict, str]] = None,
+                        exclude_none: bool = True,
+                        resolve_keys: bool = False,
+                        assign_bnode: bool = True) -> Dict:
+        """Return the JSON-LD dictionary of the table. With `resolve_keys=True` (used by
+        `model_dump_jsonld()`), the fields are serialized directly (see `ssnolib.jsonld`),
+        which is much faster for large tables."""
+        if resolve_keys:
+            return jsonld.to_jsonld_dict(self, context=context, exclude_none=exclude_none,
+                                         assign_bnode=assign_bnode)
+        return super().get_jsonld_dict(context=context, exclude_none=exclude_none,
+                                       resolve_keys=resolve_keys, assign_bnode=assign_bnode)
 
     def to_yaml(self, filename: Union[str, pathlib.Path], overwrite: bool = False, exists_ok=False) -> pathlib.Path:
         """Dump the Standard Name Table to a file.
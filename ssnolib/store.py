@@ -0,0 +1,278 @@
+"""SQLite storage backend for Standard Name Tables.
+
+Tables are persisted into a SQLite database, in which the standard names are
+indexed by name and canonical units, the qualifications by name and the
+descriptions by a FTS5 full-text index. Queries run against the database and
+only the matching standard names are turned into StandardName objects.
+"""
+import json
+import pathlib
+import re
+import sqlite3
+from typing import Dict, Iterator, List, Optional, Union
+
+from .index import StandardNameList
+from .qualification import QUALIFICATIONS
+from .qudt import parse_unit
+from .snapshot import construct_standard_name
+from .standard_name import StandardName
+
+_QUALIFICATION_FIELDS = tuple(field for field, _, _ in QUALIFICATIONS)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tables (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS standard_names (
+    id INTEGER PRIMARY KEY,
+    table_id INTEGER NOT NULL REFERENCES tables(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    standard_name TEXT NOT NULL,
+    canonical_units TEXT,
+    description TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_standard_names_name ON standard_names(standard_name, table_id);
+CREATE INDEX IF NOT EXISTS ix_standard_names_units ON standard_names(canonical_units, table_id);
+CREATE INDEX IF NOT EXISTS ix_standard_names_table ON standard_names(table_id, position);
+CREATE TABLE IF NOT EXISTS qualifications (
+    id INTEGER PRIMARY KEY,
+    table_id INTEGER NOT NULL REFERENCES tables(id) ON DELETE CASCADE,
+    field TEXT NOT NULL,
+    name TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_qualifications_name ON qualifications(name, field, table_id);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS standard_names_fts USING fts5(
+    standard_name, description, content='standard_names', content_rowid='id'
+);
+"""
+
+
+def _parse_units(canonical_units: str) -> str:
+    """Return the canonical units the way they are stored by StandardName"""
+    if canonical_units.startswith('http'):
+        return canonical_units
+    try:
+        return str(parse_unit(canonical_units))
+    except KeyError:
+        return canonical_units
+
+
+class SQLiteStore:
+    """Stores Standard Name Tables in a SQLite database.
+
+    Parameters
+    ----------
+    filename: Union[str, pathlib.Path]
+        The database file. Defaults to an in-memory database.
+
+    Examples
+    --------
+    >>> with SQLiteStore('tables.db') as store:
+    >>>     store.add(snt, name='cf')
+    >>>     store.get_standard_name('air_temperature', table='cf')
+    >>>     store.search('pressure at the surface', limit=5)
+    """
+
+    def __init__(self, filename: Union[str, pathlib.Path] = ':memory:'):
+        self.filename = filename
+        self.connection = sqlite3.connect(str(filename))
+        self.connection.execute('PRAGMA foreign_keys = ON')
+        self.connection.executescript(_SCHEMA)
+        try:
+            self.connection.executescript(_FTS_SCHEMA)
+            self.fts = True
+        except sqlite3.OperationalError:
+            # SQLite was compiled without FTS5. Fall back to LIKE queries
+            self.fts = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Close the database connection"""
+        self.connection.close()
+
+    def _table_id(self, name: str) -> int:
+        row = self.connection.execute('SELECT id FROM tables WHERE name = ?', (name,)).fetchone()
+        if row is None:
+            raise KeyError(f'No table "{name}" in the store.')
+        return row[0]
+
+    def tables(self) -> List[str]:
+        """Return the names of the stored tables"""
+        return [row[0] for row in self.connection.execute('SELECT name FROM tables ORDER BY id')]
+
+    def add(self, snt, name: Optional[str] = None, overwrite: bool = False) -> str:
+        """Store a Standard Name Table.
+
+        Parameters
+        ----------
+        snt: StandardNameTable
+            The table to store
+        name: Optional[str]
+            The name of the table in the store. Defaults to the string
+            representation of the table (identifier or title).
+        overwrite: bool=False
+            Overwrite an existing table with the same name.
+
+        Returns
+        -------
+        str
+            The name of the table in the store
+
+        Raises
+        ------
+        ValueError
+            If the name is not given and cannot be determined from the table or
+            if the table exists and overwrite is False.
+        """
+        name = name or str(snt)
+        if not name:
+            raise ValueError('The table has neither an identifier nor a title. Please provide a name.')
+        with self.connection:
+            if name in self.tables():
+                if not overwrite:
+                    raise ValueError(f'Table "{name}" exists and overwrite is False.')
+                self.remove(name)
+            table_data = snt.model_dump(mode='json', exclude_none=True,
+                                        exclude={'standard_names', *_QUALIFICATION_FIELDS})
+            table_id = self.connection.execute('INSERT INTO tables (name, data) VALUES (?, ?)',
+                                               (name, json.dumps(table_data))).lastrowid
+            self.connection.executemany(
+                'INSERT INTO standard_names (table_id, position, standard_name, canonical_units, description, data) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                ((table_id, i, sn.standard_name, sn.canonical_units, sn.description,
+                  json.dumps(sn.model_dump(mode='json', exclude_none=True)))
+                 for i, sn in enumerate(snt.standard_names or []))
+            )
+            for field in _QUALIFICATION_FIELDS:
+                self.connection.executemany(
+                    'INSERT INTO qualifications (table_id, field, name, data) VALUES (?, ?, ?, ?)',
+                    ((table_id, field, q.name, json.dumps(q.model_dump(mode='json', exclude_none=True)))
+                     for q in getattr(snt, field) or [])
+                )
+            if self.fts:
+                self.connection.execute(
+                    'INSERT INTO standard_names_fts (rowid, standard_name, description) '
+                    'SELECT id, standard_name, description FROM standard_names WHERE table_id = ?',
+                    (table_id,)
+                )
+        return name
+
+    def remove(self, name: str):
+        """Remove a table from the store"""
+        table_id = self._table_id(name)
+        with self.connection:
+            if self.fts:
+                self.connection.execute(
+                    "INSERT INTO standard_names_fts (standard_names_fts, rowid, standard_name, description) "
+                    "SELECT 'delete', id, standard_name, description FROM standard_names WHERE table_id = ?",
+                    (table_id,)
+                )
+            self.connection.execute('DELETE FROM tables WHERE id = ?', (table_id,))
+
+    def get_table(self, name: str):
+        """Load a complete Standard Name Table from the store"""
+        from .standard_name_table import StandardNameTable
+        table_id = self._table_id(name)
+        data = json.loads(self.connection.execute('SELECT data FROM tables WHERE id = ?',
+                                                  (table_id,)).fetchone()[0])
+        data['standard_names'] = StandardNameList(self._hydrate(self.connection.execute(
+            'SELECT data FROM standard_names WHERE table_id = ? ORDER BY position', (table_id,)
+        )))
+        for field, qualifications in self.get_qualifications(table=name).items():
+            data[field] = qualifications
+        return StandardNameTable(**data)
+
+    def get_qualifications(self, table: str) -> Dict[str, List[Dict]]:
+        """Return the qualifications of a table per field of the StandardNameTable"""
+        qualifications = {}
+        for field, data in self.connection.execute(
+                'SELECT field, data FROM qualifications WHERE table_id = ? ORDER BY id', (self._table_id(table),)):
+            qualifications.setdefault(field, []).append(json.loads(data))
+        return qualifications
+
+    def has_qualification(self, name: str, field: Optional[str] = None, table: Optional[str] = None) -> bool:
+        """Check whether a qualification (e.g. a location) is defined"""
+        query = 'SELECT 1 FROM qualifications WHERE name = ?'
+        query, params = self._filter(query, [name], table)
+        if field is not None:
+            query += ' AND field = ?'
+            params.append(field)
+        return self.connection.execute(query + ' LIMIT 1', params).fetchone() is not None
+
+    @staticmethod
+    def _hydrate(rows) -> Iterator[StandardName]:
+        for row in rows:
+            yield construct_standard_name(json.loads(row[0]))
+
+    def _filter(self, query: str, params: List, table: Optional[str], column: str = 'table_id'):
+        if table is not None:
+            query += f' AND {column} = ?'
+            params.append(self._table_id(table))
+        return query, params
+
+    def get_standard_name(self, standard_name: str, table: Optional[str] = None) -> Optional[StandardName]:
+        """Return the standard name object or None if not found. If no table is
+        given, the first table containing the standard name is used."""
+        query, params = self._filter('SELECT data FROM standard_names WHERE standard_name = ?',
+                                     [standard_name], table)
+        row = self.connection.execute(query + ' ORDER BY table_id LIMIT 1', params).fetchone()
+        if row is None:
+            return None
+        return next(self._hydrate([row]))
+
+    def filter_by_units(self, canonical_units: str, table: Optional[str] = None) -> Iterator[StandardName]:
+        """Yields all standard names with the given canonical units, e.g. "Pa" or
+        "http://qudt.org/vocab/unit/PA"."""
+        query, params = self._filter('SELECT data FROM standard_names WHERE canonical_units = ?',
+                                     [_parse_units(canonical_units)], table)
+        yield from self._hydrate(self.connection.execute(query + ' ORDER BY table_id, position', params))
+
+    def search(self, text: str, table: Optional[str] = None, limit: int = 10) -> List[StandardName]:
+        """Full-text search over the standard names and their descriptions. The
+        results are ranked by relevance (bm25).
+
+        Parameters
+        ----------
+        text: str
+            The search text, e.g. "pressure at the surface"
+        table: Optional[str]
+            Restrict the search to a table
+        limit: int=10
+            Maximal number of results
+
+        Returns
+        -------
+        List[StandardName]
+            The matching standard names, best match first
+        """
+        terms = re.findall(r'[^\W_]+', text)
+        if not terms:
+            return []
+        if self.fts:
+            match = ' OR '.join(f'"{t}"' for t in terms)
+            query, params = self._filter(
+                'SELECT s.data FROM standard_names_fts f JOIN standard_names s ON s.id = f.rowid '
+                'WHERE standard_names_fts MATCH ?', [match], table, column='s.table_id')
+            query += ' ORDER BY bm25(standard_names_fts) LIMIT ?'
+        else:
+            # rank by the number of matching terms
+            score = ' + '.join('(s.standard_name LIKE ? OR s.description LIKE ?)' for _ in terms)
+            query, params = self._filter(
+                f'SELECT s.data FROM standard_names s WHERE ({score}) > 0',
+                [f'%{t}%' for t in terms for _ in range(2)], table, column='s.table_id')
+            query += f' ORDER BY ({score}) DESC LIMIT ?'
+            params += [f'%{t}%' for t in terms for _ in range(2)]
+        params.append(limit)
+        return list(self._hydrate(self.connection.execute(query, params)))
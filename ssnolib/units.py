@@ -0,0 +1,588 @@
+"""Parsing of unit strings into QUDT unit IRIs.
+
+A unit string is tokenized and parsed into a product of (prefixed) unit symbols
+with integer powers, e.g.
+
+    "m s-1", "m/s", "m*s^-1", "m s**-1" -> [("m", 1), ("s", -1)]
+
+and normalized into the local name of the QUDT unit, which is composed of the
+factors with positive powers, followed by "PER" and the factors with negative
+powers, e.g. "M-PER-SEC" or "KiloGM-PER-M3". The local name must exist in the
+QUDT unit vocabulary.
+
+Grammar::
+
+    expression := term ("/" term)*
+    term       := factor (["*" | "." | " "] factor)*
+    factor     := (symbol | number | "(" expression ")") [power]
+    power      := ["^" | "**"] integer
+"""
+import functools
+import itertools
+import re
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple, Union
+
+from ontolutils import QUDT_UNIT
+from rdflib import URIRef
+
+# unit symbols and names -> QUDT local names
+_UNITS: Dict[str, str] = {
+    'm': 'M', 'g': 'GM', 's': 'SEC', 'K': 'K', 'A': 'A', 'mol': 'MOL', 'cd': 'CD',
+    'Hz': 'HZ', 'N': 'N', 'Pa': 'PA', 'J': 'J', 'W': 'W', 'C': 'C', 'V': 'V', 'F': 'FARAD',
+    'ohm': 'OHM', 'Ω': 'OHM', 'S': 'S', 'T': 'T', 'Wb': 'WB', 'H': 'H', 'lm': 'LM', 'lx': 'LUX',
+    'Bq': 'BQ', 'Gy': 'GRAY', 'Sv': 'SV', 'sr': 'SR', 'rad': 'RAD', 'L': 'L', 'l': 'L',
+    'bar': 'BAR', 'eV': 'EV', 't': 'TONNE', 'min': 'MIN', 'h': 'HR', 'day': 'DAY', 'year': 'YR',
+    'yr': 'YR', 'degree': 'DEG', 'deg': 'DEG', '°': 'DEG', 'degree_C': 'DEG_C', 'degC': 'DEG_C',
+    'degree_Celsius': 'DEG_C', '°C': 'DEG_C', 'percent': 'PERCENT', '%': 'PERCENT',
+    'dB': 'DeciB', 'dBZ': 'DeciB_Z', 'px': 'PIXEL', 'pixel': 'PIXEL',
+}
+# unit names, which are matched case-insensitive
+_UNIT_NAMES: Dict[str, str] = {
+    'meter': 'M', 'metre': 'M', 'second': 'SEC', 'kelvin': 'K', 'gram': 'GM', 'kilogram': 'KiloGM',
+    'kilograms': 'KiloGM', 'joule': 'J', 'watt': 'W', 'pascal': 'PA', 'newton': 'N', 'hertz': 'HZ',
+    'radian': 'RAD', 'mole': 'MOL', 'celsius': 'DEG_C',
+}
+_PREFIXES: Dict[str, str] = {
+    'Y': 'Yotta', 'Z': 'Zetta', 'E': 'Exa', 'P': 'Peta', 'T': 'Tera', 'G': 'Giga', 'M': 'Mega',
+    'k': 'Kilo', 'h': 'Hecto', 'da': 'Deca', 'd': 'Deci', 'c': 'Centi', 'm': 'Milli', 'u': 'Micro',
+    'µ': 'Micro', 'μ': 'Micro', 'n': 'Nano', 'p': 'Pico', 'f': 'Femto', 'a': 'Atto',
+}
+# symbols, which may be prefixed
+_PREFIXABLE: FrozenSet[str] = frozenset(('m', 'g', 's', 'K', 'A', 'mol', 'cd', 'Hz', 'N', 'Pa', 'J', 'W', 'C',
+                                         'V', 'F', 'ohm', 'Ω', 'S', 'T', 'Wb', 'H', 'Bq', 'Gy', 'Sv', 'L', 'l',
+                                         'bar', 'eV', 'rad', 'sr'))
+_DIMENSIONLESS_STRINGS: FrozenSet[str] = frozenset(('', '1', 'dimensionless', 'unitless', 'none'))
+# units, which are not part of the QUDT vocabulary
+_EXTRA_UNITS: Dict[str, str] = {
+    'PER-PIXEL': 'https://matthiasprobst.github.io/pivmeta#PER-PIXEL',
+    'MilliM-PER-PIXEL': 'https://matthiasprobst.github.io/pivmeta#MilliM-PER-PIXEL',
+}
+_MAX_PERMUTED_FACTORS = 4
+
+# SI base dimensions in the order of the dimension vectors
+DIMENSIONS: Tuple[str, ...] = ('length', 'mass', 'time', 'electric_current', 'temperature',
+                               'amount_of_substance', 'luminous_intensity')
+Dimension = Tuple[int, int, int, int, int, int, int]
+DIMENSIONLESS: Dimension = (0, 0, 0, 0, 0, 0, 0)
+# dimension vectors of the (unprefixed) QUDT units
+_DIMENSIONS: Dict[str, Dimension] = {
+    'M': (1, 0, 0, 0, 0, 0, 0), 'GM': (0, 1, 0, 0, 0, 0, 0), 'SEC': (0, 0, 1, 0, 0, 0, 0),
+    'A': (0, 0, 0, 1, 0, 0, 0), 'K': (0, 0, 0, 0, 1, 0, 0), 'MOL': (0, 0, 0, 0, 0, 1, 0),
+    'CD': (0, 0, 0, 0, 0, 0, 1), 'HZ': (0, 0, -1, 0, 0, 0, 0), 'N': (1, 1, -2, 0, 0, 0, 0),
+    'PA': (-1, 1, -2, 0, 0, 0, 0), 'J': (2, 1, -2, 0, 0, 0, 0), 'W': (2, 1, -3, 0, 0, 0, 0),
+    'C': (0, 0, 1, 1, 0, 0, 0), 'V': (2, 1, -3, -1, 0, 0, 0), 'FARAD': (-2, -1, 4, 2, 0, 0, 0),
+    'OHM': (2, 1, -3, -2, 0, 0, 0), 'S': (-2, -1, 3, 2, 0, 0, 0), 'T': (0, 1, -2, -1, 0, 0, 0),
+    'WB': (2, 1, -2, -1, 0, 0, 0), 'H': (2, 1, -2, -2, 0, 0, 0), 'LM': (0, 0, 0, 0, 0, 0, 1),
+    'LUX': (-2, 0, 0, 0, 0, 0, 1), 'BQ': (0, 0, -1, 0, 0, 0, 0), 'GRAY': (2, 0, -2, 0, 0, 0, 0),
+    'SV': (2, 0, -2, 0, 0, 0, 0), 'L': (3, 0, 0, 0, 0, 0, 0), 'BAR': (-1, 1, -2, 0, 0, 0, 0),
+    'EV': (2, 1, -2, 0, 0, 0, 0), 'TONNE': (0, 1, 0, 0, 0, 0, 0), 'MIN': (0, 0, 1, 0, 0, 0, 0),
+    'HR': (0, 0, 1, 0, 0, 0, 0), 'DAY': (0, 0, 1, 0, 0, 0, 0), 'YR': (0, 0, 1, 0, 0, 0, 0),
+    'DEG_C': (0, 0, 0, 0, 1, 0, 0), 'RAD': DIMENSIONLESS, 'SR': DIMENSIONLESS, 'DEG': DIMENSIONLESS,
+    'PERCENT': DIMENSIONLESS, 'DeciB': DIMENSIONLESS, 'DeciB_Z': DIMENSIONLESS, 'PIXEL': DIMENSIONLESS,
+    'UNITLESS': DIMENSIONLESS, 'NUM': DIMENSIONLESS,
+}
+# scale and offset of the (unprefixed) QUDT units to the coherent SI unit
+_SCALES: Dict[str, float] = {
+    'GM': 1e-3, 'L': 1e-3, 'BAR': 1e5, 'EV': 1.602176634e-19, 'TONNE': 1e3, 'MIN': 60., 'HR': 3600.,
+    'DAY': 86400., 'YR': 31557600., 'DEG': 0.017453292519943295, 'PERCENT': 1e-2,
+}
+_OFFSETS: Dict[str, float] = {'DEG_C': 273.15}
+_LOGARITHMIC: FrozenSet[str] = frozenset(('DeciB', 'DeciB_Z'))
+_PREFIX_SCALES: Dict[str, float] = {
+    'Yotta': 1e24, 'Zetta': 1e21, 'Exa': 1e18, 'Peta': 1e15, 'Tera': 1e12, 'Giga': 1e9, 'Mega': 1e6,
+    'Kilo': 1e3, 'Hecto': 1e2, 'Deca': 1e1, 'Deci': 1e-1, 'Centi': 1e-2, 'Milli': 1e-3, 'Micro': 1e-6,
+    'Nano': 1e-9, 'Pico': 1e-12, 'Femto': 1e-15, 'Atto': 1e-18,
+}
+_PREFIX_NAMES: Tuple[str, ...] = tuple(sorted(set(_PREFIXES.values()), key=len, reverse=True))
+_POWER_PATTERN = re.compile(r'^(?P<unit>.*?)(?P<power>\d*)$')
+
+_TOKEN_PATTERN = re.compile(
+    r'(?P<space>\s*)(?:(?P<symbol>(?:[^\W\d]|[°%Ω])+)|(?P<number>[+-]?\d+)|(?P<op>\*\*|[\^*/.·()]))'
+)
+
+Factor = Tuple[str, int]
+
+# Units of which the factor order differs from the canonical (sorted) order, as
+# returned by the previous lookup table (`ontolutils.parse_unit`):
+_PREFERRED_NAMES = frozenset({'PA-M-PER-SEC'})
+
+
+@functools.lru_cache(maxsize=None)
+def _qudt_units() -> FrozenSet[str]:
+    """Return the local names of the QUDT units"""
+    ns = str(QUDT_UNIT._NS)
+    return frozenset(str(v)[len(ns):] for v in vars(QUDT_UNIT).values() if isinstance(v, URIRef))
+
+
+def _sorted_local_name(local_name: str) -> str:
+    """Return the local name with sorted factors, e.g. "PER-SEC-M3" -> "PER-M3-SEC" """
+    return '-PER-'.join('-'.join(sorted(part.split('-'))) for part in f'-{local_name}'.split('-PER-'))[1:]
+
+
+@functools.lru_cache(maxsize=None)
+def _canonical_names() -> Dict[str, str]:
+    """Return a map of QUDT local names to their canonical name. Some units exist
+    with their factors in different orders (e.g. "PER-M3-SEC" and "PER-SEC-M3").
+    Mapping them to one name makes the result independent of the order of the
+    factors in the unit string."""
+    groups: Dict[str, List[str]] = {}
+    for local_name in _qudt_units():
+        groups.setdefault(_sorted_local_name(local_name), []).append(local_name)
+    canonical_names = {}
+    for sorted_name, local_names in groups.items():
+        if len(local_names) < 2:
+            continue
+        preferred = [n for n in local_names if n in _PREFERRED_NAMES]
+        canonical = preferred[0] if preferred else (sorted_name if sorted_name in local_names else min(local_names))
+        canonical_names.update({n: canonical for n in local_names if n != canonical})
+    return canonical_names
+
+
+def tokenize(unit_str: str) -> List[Tuple[str, str, bool]]:
+    """Split a unit string into tokens (kind, value, preceded_by_space), where
+    kind is one of "symbol", "number" or "op"."""
+    tokens = []
+    pos = 0
+    unit_str = unit_str.rstrip()
+    while pos < len(unit_str):
+        m = _TOKEN_PATTERN.match(unit_str, pos)
+        if m is None or m.end() == pos:
+            raise KeyError(f'Invalid character in unit "{unit_str}" at position {pos}.')
+        kind = m.lastgroup
+        tokens.append((kind, m.group(kind), bool(m.group('space'))))
+        pos = m.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive descent parser of a tokenized unit string (see module docstring)"""
+
+    def __init__(self, unit_str: str):
+        self.unit_str = unit_str
+        self.tokens = tokenize(unit_str)
+        self.pos = 0
+
+    def _peek(self):
+        if self.pos < len(self.tokens):
+            return self.tokens[self.pos]
+        return None, None, False
+
+    def _error(self, msg: str) -> KeyError:
+        return KeyError(f'Cannot parse unit "{self.unit_str}": {msg}')
+
+    def parse(self) -> List[Factor]:
+        factors = self._expression()
+        if self.pos != len(self.tokens):
+            raise self._error(f'unexpected "{self.tokens[self.pos][1]}"')
+        return factors
+
+    def _expression(self) -> List[Factor]:
+        factors = self._term()
+        while self._peek()[:2] == ('op', '/'):
+            self.pos += 1
+            factors += [(symbol, -power) for symbol, power in self._term()]
+        return factors
+
+    def _term(self) -> List[Factor]:
+        factors = self._factor()
+        while True:
+            kind, value, _ = self._peek()
+            if kind == 'op' and value in ('*', '.', '·'):
+                self.pos += 1
+            elif kind not in ('symbol', 'number') and (kind, value) != ('op', '('):
+                return factors
+            factors += self._factor()
+
+    def _factor(self) -> List[Factor]:
+        kind, value, _ = self._peek()
+        self.pos += 1
+        if kind == 'symbol':
+            factors = [(value, 1)]
+        elif kind == 'number':
+            if int(value) != 1:
+                raise self._error(f'unexpected number "{value}"')
+            factors = []
+        elif (kind, value) == ('op', '('):
+            factors = self._expression()
+            if self._peek()[:2] != ('op', ')'):
+                raise self._error('missing ")"')
+            self.pos += 1
+        else:
+            raise self._error(f'unexpected "{value}"' if value else 'unexpected end')
+        power = self._power()
+        return [(symbol, p * power) for symbol, p in factors]
+
+    def _power(self) -> int:
+        kind, value, space = self._peek()
+        if kind == 'op' and value in ('^', '**'):
+            self.pos += 1
+            kind, value, _ = self._peek()
+            if kind != 'number':
+                raise self._error(f'expected a power after "{value}"')
+            self.pos += 1
+            return int(value)
+        if kind == 'number' and not space:
+            # e.g. "m2" or "s-1"
+            self.pos += 1
+            return int(value)
+        return 1
+
+
+def parse(unit_str: str) -> List[Factor]:
+    """Parse a unit string into its factors, e.g. "kg/m^3" -> [("kg", 1), ("m", -3)]"""
+    return _Parser(unit_str).parse()
+
+
+def resolve_symbol(symbol: str) -> str:
+    """Return the QUDT local name of a (prefixed) unit symbol, e.g. "kg" -> "KiloGM"
+
+    Raises
+    ------
+    KeyError
+        If the symbol is unknown
+    """
+    local_name = _UNITS.get(symbol, None) or _UNIT_NAMES.get(symbol.lower(), None)
+    if local_name is not None:
+        return local_name
+    for n in (2, 1):
+        prefix, base = symbol[:n], symbol[n:]
+        if prefix in _PREFIXES and base in _PREFIXABLE:
+            return _PREFIXES[prefix] + _UNITS[base]
+    raise KeyError(f'Unknown unit symbol "{symbol}".')
+
+
+def _local_name(numerator: List[Factor], denominator: List[Factor]) -> str:
+    def _join(factors):
+        return '-'.join(f'{name}{abs(p) if abs(p) != 1 else ""}' for name, p in factors)
+
+    if not numerator and not denominator:
+        return 'UNITLESS'
+    if not denominator:
+        return _join(numerator)
+    if not numerator:
+        return f'PER-{_join(denominator)}'
+    return f'{_join(numerator)}-PER-{_join(denominator)}'
+
+
+def _orderings(factors: List[Factor]) -> Iterator[Tuple[Factor, ...]]:
+    if len(factors) > _MAX_PERMUTED_FACTORS:
+        return iter((tuple(factors),))
+    return itertools.permutations(factors)
+
+
+def _combine(factors: List[Factor]) -> List[Factor]:
+    """Combine the powers of equal units, e.g. [("M", -2), ("M", -1)] -> [("M", -3)]"""
+    powers: Dict[str, int] = {}
+    for name, p in factors:
+        powers[name] = powers.get(name, 0) + p
+    return [(name, p) for name, p in powers.items() if p != 0]
+
+
+def _candidates(factors: List[Factor]) -> Iterator[str]:
+    """Yield the possible QUDT local names of the factors. The factors are tried
+    in the given order first, then in all orders (QUDT does not prescribe an
+    order of the factors) and finally with combined powers of equal units."""
+    for fs in (factors, _combine(factors)):
+        numerator = [f for f in fs if f[1] > 0]
+        denominator = [f for f in fs if f[1] < 0]
+        yield _local_name(numerator, denominator)
+        for num in _orderings(numerator):
+            for den in _orderings(denominator):
+                yield _local_name(list(num), list(den))
+
+
+def normalize(unit_str: str) -> str:
+    """Return the QUDT local name of a unit string, e.g. "kg m-3" -> "KiloGM-PER-M3"
+
+    Raises
+    ------
+    KeyError
+        If the unit cannot be parsed or is not part of the QUDT vocabulary
+    """
+    if unit_str.strip().lower() in _DIMENSIONLESS_STRINGS:
+        return 'UNITLESS'
+    factors = [(resolve_symbol(symbol), p) for symbol, p in parse(unit_str) if p != 0]
+    qudt_units = _qudt_units()
+    for local_name in _candidates(factors):
+        if local_name in qudt_units or local_name in _EXTRA_UNITS:
+            return _canonical_names().get(local_name, local_name)
+    raise KeyError(f'Unit "{unit_str}" is not part of the QUDT unit vocabulary.')
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_unit(unit_str: str) -> URIRef:
+    """Return IRI for a unit str. E.g. 'm/s' returns QUDT_UNIT.M_PER_SEC.
+
+    Products ("m s", "m*s", "m.s"), powers ("m2", "m^2", "m**2", "s-1"),
+    division ("m/s", "1/s"), parentheses ("W/(m2 sr)") and SI prefixes
+    ("mm", "kg", "dbar") are supported. The results are cached, thus every
+    distinct unit string is parsed only once.
+
+    Parameters
+    ----------
+    unit_str: str
+        Input unit string, e.g. 'm/s'
+
+    Returns
+    -------
+    rdflib.URIRef
+        IRI for the unit string
+
+    Raises
+    ------
+    KeyError
+        If the unit string cannot be parsed or the unit is unknown
+    """
+    local_name = normalize(unit_str)
+    if local_name in _EXTRA_UNITS:
+        return URIRef(_EXTRA_UNITS[local_name])
+    return QUDT_UNIT._NS[local_name]
+
+
+def _split_factor(factor: str) -> Tuple[str, str, int]:
+    """Split a factor of a QUDT local name into prefix, unit and power, e.g. "KiloM3" -> ("Kilo", "M", 3)"""
+    m = _POWER_PATTERN.match(factor)
+    unit, power = m.group('unit'), int(m.group('power') or 1)
+    if unit in _DIMENSIONS:
+        return '', unit, power
+    for prefix in _PREFIX_NAMES:
+        if unit.startswith(prefix) and unit[len(prefix):] in _DIMENSIONS:
+            return prefix, unit[len(prefix):], power
+    raise KeyError(f'Unknown dimension of unit "{unit}".')
+
+
+def _factors(local_name: str) -> Iterator[Tuple[str, str, int]]:
+    """Yield the (prefix, unit, power) of a QUDT local name. Powers of the
+    factors following "PER" are negative."""
+    numerator, _, denominator = f'-{local_name}'.partition('-PER-')
+    for sign, factors in ((1, numerator), (-1, denominator)):
+        for factor in filter(None, factors.split('-')):
+            prefix, unit, power = _split_factor(factor)
+            yield prefix, unit, sign * power
+
+
+def _local_name_dimension(local_name: str) -> Dimension:
+    dimension = [0] * len(DIMENSIONS)
+    for _, unit, power in _factors(local_name):
+        for i, d in enumerate(_DIMENSIONS[unit]):
+            dimension[i] += power * d
+    return tuple(dimension)
+
+
+def _local_name_conversion(local_name: str) -> Tuple[float, float]:
+    """Return scale and offset of a unit to its coherent SI unit (SI = value * scale + offset)"""
+    factors = list(_factors(local_name))
+    scale = 1.
+    for prefix, unit, power in factors:
+        if unit in _LOGARITHMIC:
+            raise KeyError(f'Cannot convert the logarithmic unit "{local_name}".')
+        scale *= (_PREFIX_SCALES.get(prefix, 1.) * _SCALES.get(unit, 1.)) ** power
+    offset = 0.
+    if len(factors) == 1 and factors[0][2] == 1:
+        # offsets only apply to absolute values, e.g. "degree_C", but not "degree_C m-1"
+        offset = _OFFSETS.get(factors[0][1], 0.) * scale
+    return scale, offset
+
+
+@functools.lru_cache(maxsize=1024)
+def _units_local_name(units: Union[str, URIRef]) -> str:
+    """Return the QUDT local name of a unit string or a unit IRI"""
+    units = str(units)
+    if units.startswith('http'):
+        return re.split('[/#]', units)[-1]
+    return normalize(units)
+
+
+@functools.lru_cache(maxsize=1024)
+def get_dimension(units: Union[str, URIRef]) -> Optional[Dimension]:
+    """Return the SI dimension vector of a unit string or a unit IRI (see `DIMENSIONS`),
+    e.g. "Pa" or "http://qudt.org/vocab/unit/PA" -> (-1, 1, -2, 0, 0, 0, 0). None is
+    returned if the dimension is unknown."""
+    if units is None:
+        return DIMENSIONLESS
+    try:
+        return _local_name_dimension(_units_local_name(units))
+    except KeyError:
+        return None
+
+
+@functools.lru_cache(maxsize=1024)
+def get_conversion(source_units: Union[str, URIRef], target_units: Union[str, URIRef]) -> Tuple[float, float]:
+    """Return scale and offset to convert values from the source to the target units
+    (target = source * scale + offset). The result is cached per pair of units.
+
+    Parameters
+    ----------
+    source_units: Union[str, URIRef]
+        The units of the values, e.g. "hPa" or "http://qudt.org/vocab/unit/HectoPA"
+    target_units: Union[str, URIRef]
+        The units to convert to, e.g. "Pa"
+
+    Returns
+    -------
+    Tuple[float, float]
+        The scale and the offset
+
+    Raises
+    ------
+    KeyError
+        If a unit is unknown
+    ValueError
+        If the units have different dimensions
+    """
+    source, target = _units_local_name(source_units), _units_local_name(target_units)
+    if source == target:
+        return 1., 0.
+    if _local_name_dimension(source) != _local_name_dimension(target):
+        raise ValueError(f'Cannot convert "{source_units}" to "{target_units}": The dimensions differ.')
+    source_scale, source_offset = _local_name_conversion(source)
+    target_scale, target_offset = _local_name_conversion(target)
+    return source_scale / target_scale, (source_offset - target_offset) / target_scale
+
+
+def convert(data, source_units: Union[str, URIRef], target_units: Union[str, URIRef], out=None):
+    """Convert array data from the source to the target units.
+
+    Parameters
+    ----------
+    data: array_like
+        The values in the source units
+    source_units: Union[str, URIRef]
+        The units of the values
+    target_units: Union[str, URIRef]
+        The units to convert to
+    out: Optional[np.ndarray]
+        The array to write the result to. Pass `data` itself to convert in place
+        (requires a floating point array). If None, a new array is returned unless
+        no conversion is needed, in which case `data` is returned as is.
+
+    Returns
+    -------
+    np.ndarray
+        The converted values
+    """
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise ImportError('Package "numpy" is missing, but required to convert units.') from e
+    scale, offset = get_conversion(source_units, target_units)
+    if scale == 1. and offset == 0.:
+        if out is None:
+            return data
+        np.copyto(out, data)
+        return out
+    out = np.multiply(data, scale, out=out)
+    if offset != 0.:
+        np.add(out, offset, out=out)
+    return out
+
+
+def iter_convert(data,
+                 source_units: Union[str, URIRef],
+                 target_units: Union[str, URIRef],
+                 chunk_size: int = 2 ** 20) -> Iterator[Tuple]:
+    """Convert array data chunk-wise along the first axis, e.g. a large HDF5 dataset,
+    which is then read chunk by chunk. Only one chunk is held in memory at a time.
+
+    Parameters
+    ----------
+    data: array_like
+        The values in the source units (e.g. a numpy array or a h5py dataset)
+    source_units: Union[str, URIRef]
+        The units of the values
+    target_units: Union[str, URIRef]
+        The units to convert to
+    chunk_size: int=2**20
+        Approximate number of values per chunk
+
+    Yields
+    ------
+    Tuple[slice, np.ndarray]
+        The slice of the first axis and the converted values of the chunk
+    """
+    import numpy as np
+    get_conversion(source_units, target_units)  # fail early
+    shape = data.shape
+    if not shape:
+        yield slice(None), convert(np.asarray(data), source_units, target_units)
+        return
+    row_size = int(np.prod(shape[1:], dtype=np.int64))
+    rows = max(1, chunk_size // max(row_size, 1))
+    for start in range(0, shape[0], rows):
+        sl = slice(start, min(start + rows, shape[0]))
+        chunk = np.asarray(data[sl])
+        if np.issubdtype(chunk.dtype, np.floating) and chunk.flags.writeable and chunk.base is None:
+            # the chunk is a fresh copy (e.g. read from HDF5), convert it in place
+            yield sl, convert(chunk, source_units, target_units, out=chunk)
+        else:
+            yield sl, convert(chunk, source_units, target_units)
+
+
+class DimensionIndex:
+    """Dimension vectors of the canonical units of the standard names, stored as one
+    NumPy array (one row per standard name), so that dimension queries are vectorized.
+
+    Parameters
+    ----------
+    standard_names: StandardNameList
+        The standard names to index
+    """
+
+    def __init__(self, standard_names):
+        self._dimensions: List[Optional[Dimension]] = []
+        self._array = None
+        self._known = None
+        for i, sn in enumerate(standard_names.iter_raw()):
+            self.add(i, sn)
+
+    def __len__(self):
+        return len(self._dimensions)
+
+    def add(self, position: int, standard_name):
+        """Add a standard name at the given position of the list"""
+        if isinstance(standard_name, dict):
+            units = standard_name.get('canonical_units', standard_name.get('canonicalUnits', None))
+        else:
+            units = standard_name.canonical_units
+        self._dimensions.append(get_dimension(units))
+        self._array = None
+
+    @property
+    def array(self):
+        """The dimension vectors as integer array of shape (n, len(DIMENSIONS)).
+        Rows of unknown dimension are zero (see `known`)."""
+        if self._array is None:
+            try:
+                import numpy as np
+            except ImportError as e:
+                raise ImportError('Package "numpy" is missing, but required for dimension queries.') from e
+            self._known = np.fromiter((d is not None for d in self._dimensions), dtype=bool,
+                                      count=len(self._dimensions))
+            self._array = np.array([d or DIMENSIONLESS for d in self._dimensions],
+                                   dtype=np.int8).reshape(-1, len(DIMENSIONS))
+        return self._array
+
+    @property
+    def known(self):
+        """Boolean mask of the standard names of known dimension"""
+        _ = self.array
+        return self._known
+
+    def compatible(self, dimension: Dimension):
+        """Return the positions of the standard names with the given dimension"""
+        import numpy as np
+        array = self.array
+        return np.flatnonzero(self._known & (array == np.asarray(dimension, dtype=array.dtype)).all(axis=1))
+
+    def groups(self) -> Dict[Dimension, List[int]]:
+        """Return the positions of the standard names grouped by their dimension"""
+        import numpy as np
+        array = self.array
+        if not len(array):
+            return {}
+        dimensions, inverse = np.unique(array[self._known], axis=0, return_inverse=True)
+        positions = np.flatnonzero(self._known)
+        order = np.argsort(inverse.ravel(), kind='stable')
+        splits = np.cumsum(np.bincount(inverse.ravel(), minlength=len(dimensions)))[:-1]
+        return {tuple(int(d) for d in dimension): group.tolist()
+                for dimension, group in zip(dimensions, np.split(positions[order], splits))}
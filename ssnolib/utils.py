@@ -1,11 +1,35 @@
 import pathlib
+import threading
 import uuid
+from collections import OrderedDict
 from typing import Optional, Union
 
 import appdirs
 import requests
 
 
+class LRUCache(OrderedDict):
+    """Dictionary with a bounded size, which drops the least recently used items"""
+
+    def __init__(self, maxsize: int = 128):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def get(self, key, default=None):
+        try:
+            value = self[key]
+        except KeyError:
+            return default
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
 def get_cache_dir() -> pathlib.Path:
     """Get the cache directory and create it if it does not exist"""
     cache_dir = pathlib.Path(appdirs.user_cache_dir('ssnolib'))
@@ -18,19 +42,40 @@ def download_file(url,
                   dest_filename: Optional[Union[str, pathlib.Path]] = None,
                   known_hash: Optional[str] = None,
                   exist_ok: bool = False,
+                  use_cache: bool = True,
+                  byte_size: Optional[int] = None,
+                  session: Optional[requests.Session] = None,
+                  cancel: Optional[threading.Event] = None,
                   **kwargs) -> pathlib.Path:
     """Download a file from a URL and check its hash
     
+    The file is streamed in chunks into a temporary file, which is renamed to
+    the destination if the download is complete, so that the memory usage does
+    not depend on the size of the file.
+
     Parameter
     ---------
     url: str
         The URL of the file to download
     dest_filename: str or pathlib.Path
-        The destination filename
+        The destination filename. If None and the download cache is used, the
+        path of the cached file is returned, which must not be modified.
     known_hash: str
         The expected hash of the file
     exist_ok: bool
         Whether to return an existing file. Otherwise, it is overwritten.
+    use_cache: bool
+        Whether to use the download cache (see `ssnolib.download`). A cached file
+        is revalidated with the server and only downloaded again if it changed.
+        Interrupted downloads are resumed with Range requests. The destination
+        is a read-only hard link to the cached file (or a copy, if a link is not
+        possible), which may be replaced or deleted, but not modified in place.
+    byte_size: int
+        The expected size of the file in bytes
+    session: requests.Session
+        The session to use, e.g. one shared by several threads
+    cancel: threading.Event
+        If set, the download is stopped (see `ssnolib.download.DownloadCancelled`)
     **kwargs
         Additional keyword arguments passed to requests.get()
     
@@ -39,33 +84,27 @@ def download_file(url,
     pathlib.Path
         The path to the downloaded file
     """
-    if dest_filename is None:
-        dest_filename = get_cache_dir() / uuid.uuid4().hex
-    response = requests.get(url, stream=True, **kwargs)
-    response.raise_for_status()
-    if response.status_code == 200:
-        content = response.content
-
-        # Calculate the hash of the downloaded content
-        if known_hash:
-            import hashlib
-            calculated_hash = hashlib.sha256(content).hexdigest()
-            if not calculated_hash == known_hash:
-                raise ValueError('File does not match the expected has')
-
-        # Save the content to a file
+    if dest_filename is not None:
         dest_filename = pathlib.Path(dest_filename)
-        dest_parent = dest_filename.parent
-        if not dest_parent.exists():
-            dest_parent.mkdir(parents=True)
-
         if dest_filename.exists() and exist_ok:
             return dest_filename
 
-        dest_filename.unlink(missing_ok=True)
+    if use_cache:
+        from .download import get_download_cache, link_file
+        cached_filename = get_download_cache().fetch(url, known_hash=known_hash, byte_size=byte_size,
+                                                        session=session, cancel=cancel, **kwargs)
+        if dest_filename is None:
+            return cached_filename
+        return link_file(cached_filename, dest_filename)
 
-        with open(dest_filename, "wb") as f:
-            f.write(content)
-
-        return dest_filename
-    raise RuntimeError(f'Failed to download the file from {url}')
+    from .download import download_to_file
+    if dest_filename is None:
+        dest_filename = get_cache_dir() / uuid.uuid4().hex
+    response = (session or requests).get(url, stream=True, **kwargs)
+    try:
+        response.raise_for_status()
+    except requests.HTTPError:
+        response.close()
+        raise
+    download_to_file(response, dest_filename, known_hash=known_hash, byte_size=byte_size, cancel=cancel)
+    return dest_filename
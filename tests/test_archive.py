@@ -0,0 +1,63 @@
+import pathlib
+import unittest
+import zipfile
+
+from ssnolib import StandardNameTable
+from ssnolib.archive import Archive
+from ssnolib.dcat import Distribution
+from utils import use_temporary_snapshot_dir
+
+__this_dir__ = pathlib.Path(__file__).parent
+
+
+class TestArchive(unittest.TestCase):
+
+    def setUp(self):
+        use_temporary_snapshot_dir(self)
+        self.snt_filename = __this_dir__ / 'data/test_snt.yaml'
+        self.zip_filename = __this_dir__ / 'tables.zip'
+        self.snt = StandardNameTable.parse(self.snt_filename, use_cache=False)
+        with zipfile.ZipFile(self.zip_filename, 'w', compression=zipfile.ZIP_DEFLATED) as z:
+            z.write(self.snt_filename, 'tables/test_snt.yaml')
+            z.writestr('tables/test_snt.jsonld', self.snt.model_dump_jsonld())
+            z.writestr('README.md', '# Tables')
+
+    def tearDown(self):
+        self.zip_filename.unlink(missing_ok=True)
+
+    def test_archive(self):
+        with Archive(__this_dir__ / 'data/piv_dataset.zip') as archive:
+            self.assertEqual(archive.members(), ['piv_dataset.json'])
+            self.assertEqual(archive.info('piv_dataset.json').file_size, 1632)
+            with archive.open('piv_dataset.json') as f:
+                self.assertEqual(f.read(1), b'{')
+            with self.assertRaises(KeyError):
+                archive.open('unknown.json')
+
+        archive = Distribution(downloadURL=self.zip_filename, media_type='application/zip').archive()
+        self.assertEqual(len(archive), 3)
+        self.assertIn('README.md', archive)
+        self.assertEqual(archive.find('*.yaml'), ['tables/test_snt.yaml'])
+        self.assertEqual(archive.read('tables/test_snt.yaml'), self.snt_filename.read_bytes())
+        archive.close()
+
+        with self.assertRaises(ValueError):
+            Archive(self.snt_filename)
+
+    def test_parse_member(self):
+        names = [sn.standard_name for sn in self.snt.standard_names]
+        distribution = Distribution(downloadURL=self.zip_filename, media_type='application/zip')
+        for source in (self.zip_filename, distribution):
+            for member in ('tables/test_snt.yaml', 'tables/test_snt.jsonld'):
+                snt = StandardNameTable.parse(source, member=member)
+                self.assertEqual(snt.title, self.snt.title)
+                self.assertEqual([sn.standard_name for sn in snt.standard_names], names)
+
+        # a file object of a member
+        with distribution.archive() as archive:
+            with archive.open('tables/test_snt.yaml') as f:
+                snt = StandardNameTable.parse(f, lazy=True)
+        self.assertEqual([sn.standard_name for sn in snt.standard_names], names)
+        with self.assertRaises(ValueError):
+            StandardNameTable.parse(self.zip_filename, member='README.md')
+        self.assertEqual(list(__this_dir__.glob('tables')), [])
@@ -8,6 +8,7 @@ import rdflib
 
 import ssnolib
 from ssnolib import dcat
+from utils import use_temporary_snapshot_dir
 
 __this_dir__ = pathlib.Path(__file__).parent
 CACHE_DIR = ssnolib.utils.get_cache_dir()
@@ -28,6 +29,7 @@ class TestClasses(unittest.TestCase):
     def setUp(self) -> None:
         warnings.filterwarnings("ignore", category=UserWarning)
         _delete_test_data()
+        use_temporary_snapshot_dir(self)
 
     def tearDown(self) -> None:
         _delete_test_data()
@@ -0,0 +1,125 @@
+import json
+import pathlib
+import shutil
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import rdflib
+
+from ssnolib import context
+
+__this_dir__ = pathlib.Path(__file__).parent
+
+PIVMETA_CONTEXT = 'https://raw.githubusercontent.com/matthiasprobst/pivmeta/main/pivmeta_context.jsonld'
+PIVMETA_DOCUMENT = {'@context': {'dcat': 'http://www.w3.org/ns/dcat#',
+                                 'dcterms': 'http://purl.org/dc/terms/',
+                                 'prov': 'http://www.w3.org/ns/prov#',
+                                 'label': 'http://www.w3.org/2000/01/rdf-schema#label'}}
+
+
+class _ContextHandler(BaseHTTPRequestHandler):
+    document = {'@context': {'ex': 'https://example.org/'}}
+    etag = '"v1"'
+    requests = []
+
+    def do_GET(self):
+        self.requests.append(dict(self.headers))
+        if self.headers.get('If-None-Match', None) == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        content = json.dumps(self.document).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/ld+json')
+        self.send_header('Content-Length', str(len(content)))
+        self.send_header('ETag', self.etag)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestContextResolver(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = __this_dir__ / 'contexts'
+        _ContextHandler.requests = []
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _ContextHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}/context.jsonld'
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_load(self):
+        resolver = context.ContextResolver(self.directory, ttl=3600)
+        self.assertEqual(resolver.load(self.url), _ContextHandler.document)
+        self.assertEqual(resolver.load(self.url), _ContextHandler.document)
+        self.assertEqual(resolver.stats, {'hits': 1, 'misses': 1, 'revalidated': 0, 'stale': 0})
+        self.assertEqual(len(_ContextHandler.requests), 1)
+
+        # a new resolver reads the store
+        resolver = context.ContextResolver(self.directory, offline=True)
+        self.assertEqual(resolver.load(self.url), _ContextHandler.document)
+        self.assertEqual(resolver.stats['hits'], 1)
+        with self.assertRaises(KeyError):
+            resolver.load(self.url + '?other')
+        self.assertEqual(resolver.stats['misses'], 1)
+        self.assertEqual(len(_ContextHandler.requests), 1)
+
+    def test_revalidation(self):
+        resolver = context.ContextResolver(self.directory, ttl=0.1)
+        resolver.load(self.url)
+        time.sleep(0.2)
+        self.assertEqual(resolver.load(self.url), _ContextHandler.document)
+        self.assertEqual(resolver.stats['revalidated'], 1)
+        self.assertEqual(_ContextHandler.requests[-1]['If-None-Match'], '"v1"')
+
+        # the stored context is used, if the server is not reachable
+        time.sleep(0.2)
+        self.server.shutdown()
+        self.server.server_close()
+        with self.assertWarns(UserWarning):
+            self.assertEqual(resolver.load(self.url), _ContextHandler.document)
+        self.assertEqual(resolver.stats['stale'], 1)
+
+    def test_resolve(self):
+        resolver = context.ContextResolver(self.directory, offline=True)
+        resolver.preload(PIVMETA_CONTEXT, PIVMETA_DOCUMENT)
+        resolver.preload(self.url, {'@context': {'@import': PIVMETA_CONTEXT, 'ex': 'https://example.org/'}})
+
+        with open(__this_dir__ / 'data/piv_dataset.jsonld') as f:
+            data = json.load(f)
+        resolved = resolver.resolve(data)
+        self.assertEqual(resolved['@context'], PIVMETA_DOCUMENT['@context'])
+        self.assertEqual(data['@context'], {'@import': PIVMETA_CONTEXT})
+        g = rdflib.Graph().parse(data=json.dumps(resolved), format='json-ld')
+        self.assertIn((rdflib.URIRef('https://www.pivchallenge.org/pub/index.html#a'),
+                       rdflib.RDF.type,
+                       rdflib.URIRef('http://www.w3.org/ns/dcat#Dataset')), g)
+
+        # nested imports and lists of contexts, local definitions override imported ones
+        resolved = resolver.resolve({'@context': [self.url, {'@import': self.url, 'ex': 'https://example.com/'}],
+                                     'ex:a': 1})
+        self.assertEqual(resolved['@context'], [{**PIVMETA_DOCUMENT['@context'], 'ex': 'https://example.org/'},
+                                                {**PIVMETA_DOCUMENT['@context'], 'ex': 'https://example.com/'}])
+        self.assertEqual(resolver.stats['misses'], 0)
+        self.assertEqual(len(_ContextHandler.requests), 0)
+
+        resolver.clear()
+        with self.assertRaises(KeyError):
+            resolver.resolve(data)
+
+    def test_set_resolver(self):
+        resolver = context.ContextResolver(self.directory, offline=True)
+        previous = context.set_resolver(resolver)
+        try:
+            self.assertIs(context.get_resolver(), resolver)
+        finally:
+            context.set_resolver(previous)
+        self.assertIs(context.get_resolver(), previous)
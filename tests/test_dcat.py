@@ -97,6 +97,27 @@ class TestDcat(utils.ClassTest):
 
         filename.unlink(missing_ok=True)
 
+    def test_Distribution_open(self):
+        filename = __this_dir__ / 'data/piv_dataset.jsonld'
+        local_dist = dcat.Distribution(downloadURL=filename)
+        self.assertEqual(local_dist.local_path().resolve(), filename.resolve())
+
+        content = filename.read_bytes()
+        with local_dist.open() as f:
+            self.assertEqual(f.read(), content)
+        with local_dist.open('mmap') as m:
+            self.assertEqual(m[:20], content[:20])
+            self.assertEqual(m.find(b'Challenge1A'), content.find(b'Challenge1A'))
+        buffer = local_dist.buffer()
+        self.assertTrue(buffer.readonly)
+        self.assertEqual(bytes(buffer[-10:]), content[-10:])
+        buffer.release()
+
+        with self.assertRaises(ValueError):
+            local_dist.open('w')
+        with self.assertRaises(ValueError):
+            dcat.Distribution(title='no download URL').open()
+
     def test_Dataset(self):
         dataset1 = dcat.Dataset(
             id='_:b3',
@@ -135,3 +156,10 @@ class TestDcat(utils.ClassTest):
         self.assertEqual(str(dataset1.distribution[0].identifier), 'http://example.com/distribution')
         self.assertEqual(str(dataset1.distribution[0].access_URL), 'http://example.com/distribution')
         self.assertEqual(str(dataset1.distribution[0].download_URL), 'http://example.com/distribution/download')
+
+    def test_Catalog(self):
+        dataset = dcat.Dataset(title='Dataset title')
+        self.assertEqual(dcat.Catalog(title='Catalog', dataset=dataset).dataset, [dataset])
+        self.assertEqual(dcat.Catalog(title='Catalog', dataset=[dataset]).dataset, [dataset])
+        self.assertIsNone(dcat.Catalog(title='Catalog', dataset=None).dataset)
+        self.assertIsNone(dcat.Catalog(title='Catalog').dataset)
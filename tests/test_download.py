@@ -0,0 +1,431 @@
+import asyncio
+import hashlib
+import os
+import pathlib
+import shutil
+import stat
+import threading
+import time
+import tracemalloc
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import requests
+
+from ssnolib import StandardNameTable, download
+from ssnolib.dcat import Catalog, Dataset, Distribution
+from ssnolib.utils import download_file
+
+__this_dir__ = pathlib.Path(__file__).parent
+
+LAST_MODIFIED = 'Wed, 21 Oct 2015 07:28:00 GMT'
+
+
+class _FileHandler(BaseHTTPRequestHandler):
+    """Serves `content` at every path. Supports ETag and Last-Modified validation."""
+    content = b''
+    etag = None
+    last_modified = None
+    send_length = True
+    delay = 0.
+    chunk_delay = 0.
+    accept_ranges = False
+    fail_after = []  # number of bytes after which the connection breaks (one per request)
+    requests = []
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with self.lock:
+            _FileHandler.active += 1
+            _FileHandler.max_active = max(_FileHandler.max_active, _FileHandler.active)
+        try:
+            self._get()
+        finally:
+            with self.lock:
+                _FileHandler.active -= 1
+
+    def _get(self):
+        self.requests.append((self.path, dict(self.headers)))
+        time.sleep(self.delay)
+        if self.path.startswith('/missing'):
+            self.send_error(404)
+            return
+        if self.etag and self.headers.get('If-None-Match', None) == self.etag or \
+                self.last_modified and self.headers.get('If-Modified-Since', None) == self.last_modified:
+            self.send_response(304)
+            self.end_headers()
+            return
+        content = self.content
+        range_header = self.headers.get('Range', None)
+        if_range = self.headers.get('If-Range', None)
+        if self.accept_ranges and range_header and (if_range is None or if_range in (self.etag, self.last_modified)):
+            start = int(range_header[len('bytes='):].split('-')[0])
+            if start >= len(content):
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{len(content)}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            content = content[start:]
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{len(self.content) - 1}/{len(self.content)}')
+        else:
+            self.send_response(200)
+        if self.accept_ranges:
+            self.send_header('Accept-Ranges', 'bytes')
+        if self.send_length:
+            self.send_header('Content-Length', str(len(content)))
+        if self.etag:
+            self.send_header('ETag', self.etag)
+        if self.last_modified:
+            self.send_header('Last-Modified', self.last_modified)
+        self.end_headers()
+        if self.fail_after:
+            self.wfile.write(content[:self.fail_after.pop(0)])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        if not self.chunk_delay:
+            self.wfile.write(content)
+            return
+        try:
+            for i in range(0, len(content), 2 ** 16):
+                self.wfile.write(content[i:i + 2 ** 16])
+                time.sleep(self.chunk_delay)
+        except ConnectionError:
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestDownloadCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = __this_dir__ / 'downloads'
+        self.cache = download.DownloadCache(self.directory)
+        self.previous_cache = download.set_download_cache(self.cache)
+        _FileHandler.content = b'standard_name: x_velocity\n'
+        _FileHandler.etag = '"v1"'
+        _FileHandler.last_modified = None
+        _FileHandler.send_length = True
+        _FileHandler.delay = 0.
+        _FileHandler.chunk_delay = 0.
+        _FileHandler.accept_ranges = False
+        _FileHandler.fail_after = []
+        _FileHandler.max_active = 0
+        _FileHandler.requests = []
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _FileHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+
+    def tearDown(self):
+        download.set_download_cache(self.previous_cache)
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_etag(self):
+        filename = self.cache.fetch(f'{self.url}/table.yaml')
+        self.assertEqual(filename.read_bytes(), _FileHandler.content)
+        self.assertEqual(filename.name, hashlib.sha256(_FileHandler.content).hexdigest())
+        self.assertNotIn('If-None-Match', _FileHandler.requests[-1][1])
+
+        self.assertEqual(self.cache.fetch(f'{self.url}/table.yaml'), filename)
+        self.assertEqual(_FileHandler.requests[-1][1]['If-None-Match'], '"v1"')
+
+        # the content changed
+        _FileHandler.content = b'standard_name: y_velocity\n'
+        _FileHandler.etag = '"v2"'
+        new_filename = self.cache.fetch(f'{self.url}/table.yaml')
+        self.assertNotEqual(new_filename, filename)
+        self.assertEqual(new_filename.read_bytes(), _FileHandler.content)
+        self.assertEqual(self.cache.get_entry(f'{self.url}/table.yaml')['etag'], '"v2"')
+
+        with self.assertRaises(ValueError):
+            self.cache.fetch(f'{self.url}/table.yaml', known_hash='0' * 64)
+        with self.assertRaises(requests.exceptions.HTTPError):
+            self.cache.fetch(f'{self.url}/missing.yaml')
+
+    def test_last_modified(self):
+        _FileHandler.etag = None
+        _FileHandler.last_modified = LAST_MODIFIED
+        filename = self.cache.fetch(f'{self.url}/table.yaml')
+        _FileHandler.content = b'changed, but not served'
+        self.assertEqual(self.cache.fetch(f'{self.url}/table.yaml'), filename)
+        self.assertEqual(_FileHandler.requests[-1][1]['If-Modified-Since'], LAST_MODIFIED)
+        self.assertEqual(filename.read_bytes(), b'standard_name: x_velocity\n')
+
+        # a removed cache file is downloaded again
+        self.cache.clear()
+        self.assertIsNone(self.cache.get_entry(f'{self.url}/table.yaml'))
+        self.assertEqual(self.cache.fetch(f'{self.url}/table.yaml').read_bytes(), _FileHandler.content)
+
+    def test_download_file(self):
+        dest_filename = self.directory / 'dest' / 'table.yaml'
+        self.assertEqual(download_file(f'{self.url}/table.yaml', dest_filename), dest_filename)
+        self.assertEqual(dest_filename.read_bytes(), _FileHandler.content)
+        self.assertEqual(download_file(f'{self.url}/table.yaml', dest_filename, exist_ok=True), dest_filename)
+        self.assertEqual(len(_FileHandler.requests), 1)
+
+        distribution = Distribution(download_URL=f'{self.url}/table.yaml')
+        self.assertEqual(distribution.download(dest_filename), dest_filename)
+        self.assertEqual(_FileHandler.requests[-1][1]['If-None-Match'], '"v1"')
+        self.assertEqual(len(list((self.directory / 'objects').iterdir())), 1)
+
+        # the destination is a read-only hard link to the cached file
+        cached_filename = self.cache.object_path(self.cache.get_entry(f'{self.url}/table.yaml')['sha256'])
+        self.assertTrue(os.path.samefile(dest_filename, cached_filename))
+        self.assertFalse(dest_filename.stat().st_mode & stat.S_IWUSR)
+        with mock.patch('os.link', side_effect=OSError('cross-device link')):
+            other_filename = download_file(f'{self.url}/table.yaml', dest_filename.with_name('copy.yaml'))
+        self.assertFalse(os.path.samefile(other_filename, cached_filename))
+        self.assertEqual(other_filename.read_bytes(), _FileHandler.content)
+
+        # the cached file is mapped, no copy is made
+        with distribution.open('mmap') as m:
+            self.assertEqual(m[:], _FileHandler.content)
+        self.assertEqual(bytes(distribution.buffer()[:13]), b'standard_name')
+        self.assertEqual(distribution.local_path().parent, self.directory / 'objects')
+
+        filename = download_file(f'{self.url}/other.yaml', use_cache=False)
+        self.assertEqual(filename.read_bytes(), _FileHandler.content)
+        filename.unlink()
+
+    def test_evict(self):
+        def age(url, seconds):
+            filename = self.cache.object_path(self.cache.get_entry(url)['sha256'])
+            os.utime(filename, (time.time() - seconds, time.time() - seconds))
+            return filename
+
+        # the file changed: the previous file is not referenced any more
+        url = f'{self.url}/table.yaml'
+        previous_filename = self.cache.fetch(url)
+        os.utime(previous_filename, (time.time() - 120, time.time() - 120))
+        _FileHandler.content = b'standard_name: y_velocity\n'
+        _FileHandler.etag = '"v2"'
+        filename = self.cache.fetch(url)
+        self.assertFalse(previous_filename.exists())
+        self.assertTrue(filename.exists())
+
+        # files not used for max_age seconds
+        self.cache.evict(max_age=60)
+        self.assertTrue(filename.exists())  # recently written
+        age(url, 120)
+        self.cache.evict(max_age=60)
+        self.assertFalse(filename.exists())
+        self.assertIsNone(self.cache.get_entry(url))
+        self.assertEqual(list((self.directory / 'urls').iterdir()), [])
+
+        # the least recently used files, until the cache is small enough
+        urls = [f'{self.url}/{i}.yaml' for i in range(3)]
+        for i, url in enumerate(urls):
+            _FileHandler.content = f'standard_name: velocity_{i}\n'.encode()
+            self.cache.fetch(url)
+            age(url, 300 - i)
+        age(urls[0], 100)  # used recently
+        size = len(_FileHandler.content)
+        self.cache.evict(max_size=2 * size)
+        self.assertEqual([self.cache.get_entry(url) is not None for url in urls], [True, False, True])
+
+        # a stale partial file
+        _FileHandler.accept_ranges = True
+        _FileHandler.content = bytes(range(256)) * 4096
+        _FileHandler.fail_after = [2 ** 16]
+        with self.assertRaises(requests.exceptions.RequestException):
+            self.cache.fetch(f'{self.url}/archive.zip', retries=0)
+        partial = self.cache._partial_path(f'{self.url}/archive.zip')
+        os.utime(partial, (time.time() - 120, time.time() - 120))
+        self.cache.evict(max_age=60)
+        self.assertFalse(partial.exists())
+        self.assertEqual(list((self.directory / 'partial').iterdir()), [])
+
+    def test_streaming(self):
+        _FileHandler.content = bytes(range(256)) * 4096 * 8  # 8 MiB
+        dest_filename = self.directory / 'dest' / 'large.bin'
+        tracemalloc.start()
+        try:
+            download_file(f'{self.url}/large.bin', dest_filename, use_cache=False,
+                          known_hash=hashlib.sha256(_FileHandler.content).hexdigest())
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, len(_FileHandler.content) // 4)
+        self.assertEqual(dest_filename.read_bytes(), _FileHandler.content)
+
+        size = len(_FileHandler.content)
+        self.assertEqual(self.cache.fetch(f'{self.url}/large.bin', byte_size=size).stat().st_size, size)
+        # revalidated (304)
+        with self.assertRaises(ValueError):
+            self.cache.fetch(f'{self.url}/large.bin', byte_size=size - 1)
+
+        # the destination is not touched if the download fails
+        for send_length in (True, False):
+            _FileHandler.send_length = send_length
+            for byte_size in (size - 1, size + 1):
+                with self.assertRaises(ValueError):
+                    download_file(f'{self.url}/large.bin', dest_filename, use_cache=False, byte_size=byte_size)
+                with self.assertRaises(ValueError):
+                    Distribution(download_URL=f'{self.url}/new.bin', byte_size=byte_size).download(dest_filename)
+        with self.assertRaises(ValueError):
+            download_file(f'{self.url}/large.bin', dest_filename, use_cache=False, known_hash='0' * 64)
+        self.assertEqual(dest_filename.read_bytes(), _FileHandler.content)
+        self.assertEqual([f.name for f in dest_filename.parent.iterdir()], ['large.bin'])
+        self.assertEqual(len(list((self.directory / 'objects').iterdir())), 1)
+
+    def test_download_all(self):
+        _FileHandler.delay = 0.3
+        urls = [f'{self.url}/data/{i}/table.yaml' for i in range(7)] + [f'{self.url}/missing.yaml']
+        dataset = Dataset(title='PIV dataset', distribution=[Distribution(download_URL=url) for url in urls])
+        progress = []
+        t0 = time.perf_counter()
+        results = dataset.download_all(self.directory / 'dataset', max_workers=8,
+                                       progress=lambda result, n, total: progress.append((n, total)))
+        self.assertLess(time.perf_counter() - t0, 7 * _FileHandler.delay)
+        self.assertEqual(progress, [(n, 8) for n in range(1, 9)])
+        self.assertEqual([r.distribution for r in results], dataset.distribution)
+        self.assertEqual([r.filename.name for r in results[:7]], ['table.yaml'] + [f'{i}_table.yaml' for i in range(1, 7)])
+        for result in results[:7]:
+            self.assertIsNone(result.error)
+            self.assertEqual(result.filename.read_bytes(), _FileHandler.content)
+        self.assertIsNone(results[7].filename)
+        self.assertIsInstance(results[7].error, requests.exceptions.HTTPError)
+
+        catalog = Catalog(title='PIV challenge', dataset=[dataset, Dataset(distribution=Distribution(
+            download_URL=f'{self.url}/other.yaml'))])
+        results = catalog.download_all(self.directory / 'catalog')
+        self.assertEqual(len(results), 9)
+        self.assertEqual(results[8].filename.name, 'other.yaml')
+        self.assertEqual(sum(r.error is not None for r in results), 1)
+
+        # a fallback name may collide with the name of another URL:
+        dataset = Dataset(distribution=[Distribution(download_URL=f'{self.url}/{path}')
+                                        for path in ('a.txt', '2_a.txt', 'b/a.txt')])
+        results = dataset.download_all(self.directory / 'collisions')
+        self.assertEqual([r.filename.name for r in results], ['a.txt', '2_a.txt', '3_a.txt'])
+        for result in results:
+            self.assertEqual(result.filename.read_bytes(), _FileHandler.content)
+
+    def test_adownload(self):
+        _FileHandler.delay = 0.2
+        distributions = [Distribution(download_URL=f'{self.url}/{i}/table.yaml') for i in range(6)]
+
+        async def download_all():
+            semaphore = asyncio.Semaphore(2)
+            return await asyncio.gather(*[d.adownload(self.directory / f'{i}.yaml', semaphore=semaphore)
+                                          for i, d in enumerate(distributions)])
+
+        filenames = asyncio.run(download_all())
+        self.assertEqual(filenames, [self.directory / f'{i}.yaml' for i in range(6)])
+        self.assertEqual(_FileHandler.max_active, 2)
+
+    def test_adownload_cancel(self):
+        _FileHandler.content = bytes(1024 ** 2)
+        _FileHandler.chunk_delay = 0.05
+        dest_filename = self.directory / 'large.bin'
+
+        async def cancel():
+            task = asyncio.ensure_future(Distribution(download_URL=f'{self.url}/large.bin').adownload(dest_filename))
+            await asyncio.sleep(0.2)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            # the download stopped before the task finished
+            self.assertLess(time.perf_counter() - t0, 16 * _FileHandler.chunk_delay)
+
+        t0 = time.perf_counter()
+        asyncio.run(cancel())
+        self.assertFalse(dest_filename.exists())
+        self.assertFalse((self.directory / 'objects').exists())
+        # the partial file is kept to resume the download
+        self.assertEqual(len(list((self.directory / 'partial').glob('*.json'))), 1)
+
+    def test_aparse(self):
+        _FileHandler.content = (__this_dir__ / 'data/test_snt.yaml').read_bytes()
+        _FileHandler.etag = None
+        snt = StandardNameTable.parse(__this_dir__ / 'data/test_snt.yaml', use_cache=False)
+
+        async def parse():
+            return await asyncio.gather(
+                StandardNameTable.aparse(Distribution(download_URL=f'{self.url}/async_snt.yaml'), use_cache=False),
+                StandardNameTable.aparse(__this_dir__ / 'data/test_snt.yaml', use_cache=False)
+            )
+
+        for parsed in asyncio.run(parse()):
+            self.assertEqual(parsed.title, snt.title)
+            self.assertEqual([sn.standard_name for sn in parsed.standard_names],
+                             [sn.standard_name for sn in snt.standard_names])
+        self.assertFalse(pathlib.Path('async_snt.yaml').exists())
+
+    def test_resume(self):
+        _FileHandler.content = bytes(range(256)) * 4096  # 1 MiB
+        _FileHandler.accept_ranges = True
+        size = len(_FileHandler.content)
+        url = f'{self.url}/archive.zip'
+
+        # the connection breaks after the 5th chunk (data of incomplete chunks is lost)
+        _FileHandler.fail_after = [5 * 2 ** 16]
+        with self.assertRaises(requests.exceptions.RequestException):
+            self.cache.fetch(url, retries=0)
+        self.assertIsNone(self.cache.get_entry(url))
+        self.assertEqual(self.cache._partial_path(url).stat().st_size, 5 * 2 ** 16)
+
+        # resumed with a range request
+        filename = self.cache.fetch(url, byte_size=size)
+        self.assertEqual(_FileHandler.requests[-1][1]['Range'], f'bytes={5 * 2 ** 16}-')
+        self.assertEqual(_FileHandler.requests[-1][1]['If-Range'], '"v1"')
+        self.assertEqual(filename.read_bytes(), _FileHandler.content)
+        self.assertEqual(filename.name, hashlib.sha256(_FileHandler.content).hexdigest())
+        self.assertFalse(self.cache._partial_path(url).exists())
+
+        # broken transfers are resumed automatically, if data was received
+        self.cache.clear()
+        _FileHandler.requests = []
+        _FileHandler.fail_after = [2 * 2 ** 16, 3 * 2 ** 16]
+        self.assertEqual(self.cache.fetch(url).read_bytes(), _FileHandler.content)
+        self.assertEqual([r[1].get('Range', None) for r in _FileHandler.requests],
+                         [None, f'bytes={2 * 2 ** 16}-', f'bytes={5 * 2 ** 16}-'])
+
+        # the file changed in between: If-Range fails and the complete file is sent
+        self.cache.clear()
+        _FileHandler.fail_after = [5 * 2 ** 16]
+        with self.assertRaises(requests.exceptions.RequestException):
+            self.cache.fetch(url, retries=0)
+        _FileHandler.content = bytes(reversed(_FileHandler.content))
+        _FileHandler.etag = '"v2"'
+        self.assertEqual(self.cache.fetch(url).read_bytes(), _FileHandler.content)
+
+        # the server does not support ranges
+        self.cache.clear()
+        _FileHandler.fail_after = [5 * 2 ** 16]
+        with self.assertRaises(requests.exceptions.RequestException):
+            self.cache.fetch(url, retries=0)
+        _FileHandler.accept_ranges = False
+        self.assertEqual(self.cache.fetch(url).read_bytes(), _FileHandler.content)
+
+        # a partial file of another size than byte_size is discarded
+        self.cache.clear()
+        _FileHandler.accept_ranges = True
+        _FileHandler.fail_after = [5 * 2 ** 16]
+        with self.assertRaises(requests.exceptions.RequestException):
+            self.cache.fetch(url, retries=0)
+        with self.assertRaises(ValueError):
+            self.cache.fetch(url, byte_size=size + 1)
+        self.assertFalse(self.cache._partial_path(url).exists())
+        self.assertEqual(self.cache.fetch(url, byte_size=size).read_bytes(), _FileHandler.content)
+        self.assertEqual([f.name for f in (self.directory / 'partial').iterdir()], [])
+
+        # the range of the partial file cannot be satisfied (the file shrank, but the
+        # ETag did not change): the partial file is discarded and the file is requested again
+        self.cache.clear()
+        _FileHandler.fail_after = [5 * 2 ** 16]
+        with self.assertRaises(requests.exceptions.RequestException):
+            self.cache.fetch(url, retries=0)
+        _FileHandler.content = _FileHandler.content[:4 * 2 ** 16]
+        _FileHandler.requests = []
+        self.assertEqual(self.cache.fetch(url).read_bytes(), _FileHandler.content)
+        self.assertEqual([r[1].get('Range', None) for r in _FileHandler.requests], [f'bytes={5 * 2 ** 16}-', None])
+        self.assertEqual([f.name for f in (self.directory / 'partial').iterdir()], [])
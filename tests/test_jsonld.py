@@ -0,0 +1,82 @@
+import json
+import unittest
+
+import rdflib
+from ontolutils import Thing
+from rdflib.compare import isomorphic
+
+from ssnolib import StandardName, StandardNameTable, jsonld
+from ssnolib.prov import Organization
+from ssnolib.standard_name_table import Location
+
+
+class TestJSONLD(unittest.TestCase):
+
+    def setUp(self):
+        self.snt = StandardNameTable(
+            title='Table',
+            version='v1',
+            standard_names=[StandardName(standard_name='x_velocity', description='x component of the velocity',
+                                         canonical_units='m/s', comment='extra field'),
+                            StandardName(standard_name='static_pressure', description='Static pressure',
+                                         canonical_units='Pa')],
+            locations=[Location(name='fan_inlet', description='The inlet of the fan')]
+        )
+
+    def test_to_jsonld_dict(self):
+        generic = Thing.get_jsonld_dict(self.snt, resolve_keys=True)
+        direct = jsonld.to_jsonld_dict(self.snt)
+        self.assertEqual(direct, generic)
+        self.assertEqual(direct['ssno:standardNames'][0]['comment'], 'extra field')
+        self.assertEqual(jsonld.to_jsonld_dict(self.snt, context={'foo': 'https://example.org/'})['@context']['foo'],
+                         'https://example.org/')
+        with self.assertRaises(TypeError):
+            jsonld.to_jsonld_dict(self.snt, context='https://example.org/context.jsonld')
+
+    def test_same_graph(self):
+        generic = json.dumps(Thing.get_jsonld_dict(self.snt, resolve_keys=True))
+        g1 = rdflib.Graph().parse(data=generic, format='json-ld')
+        g2 = rdflib.Graph().parse(data=jsonld.dump_jsonld(self.snt), format='json-ld')
+        g3 = rdflib.Graph().parse(data=self.snt.model_dump_jsonld(), format='json-ld')
+        self.assertTrue(len(g1) > 0)
+        self.assertTrue(isomorphic(g1, g2))
+        self.assertTrue(isomorphic(g1, g3))
+
+        # Organization and Location map the prefix "schema" to different namespaces:
+        snt = StandardNameTable(title='Table',
+                                creator=Organization(name='KIT', mbox='x@kit.edu'),
+                                standard_names=self.snt.standard_names,
+                                locations=[Location(name='fan_inlet', description='inlet')])
+        generic = json.dumps(Thing.get_jsonld_dict(snt, resolve_keys=True))
+        g1 = rdflib.Graph().parse(data=generic, format='json-ld')
+        g2 = rdflib.Graph().parse(data=jsonld.dump_jsonld(snt), format='json-ld')
+        g3 = rdflib.Graph().parse(data=snt.model_dump_jsonld(), format='json-ld')
+        self.assertIn(rdflib.URIRef('http://schema.org/name'), set(g1.predicates()))
+        self.assertTrue(isomorphic(g1, g2))
+        self.assertTrue(isomorphic(g1, g3))
+
+    def test_from_jsonld_dict(self):
+        data = jsonld.to_jsonld_dict(self.snt)
+        fields = jsonld.from_jsonld_dict(data, StandardNameTable)
+        self.assertEqual(fields['title'], 'Table')
+        self.assertEqual(StandardNameTable(**fields).model_dump(exclude_none=True),
+                         self.snt.model_dump(exclude_none=True))
+        # the same node in a @graph:
+        graph = {'@context': data['@context'], '@graph': [{k: v for k, v in data.items() if k != '@context'}]}
+        self.assertEqual(jsonld.from_jsonld_dict(graph, StandardNameTable), fields)
+
+        # unexpected shapes:
+        self.assertIsNone(jsonld.from_jsonld_dict({**data, '@type': 'ssno:StandardName'}, StandardNameTable))
+        self.assertIsNone(jsonld.from_jsonld_dict({**data, 'ssno:unknown': 1}, StandardNameTable))
+        self.assertIsNone(jsonld.from_jsonld_dict({**data, 'dcterms:title': {'foo': 'bar'}}, StandardNameTable))
+        self.assertIsNone(jsonld.from_jsonld_dict({'@graph': [graph['@graph'][0]] * 2}, StandardNameTable))
+        self.assertIsNone(jsonld.from_jsonld_dict([data], StandardNameTable))
+
+        # keys of an undefined prefix are matched by their local name:
+        title = {k: v for k, v in data.items() if k != 'dcterms:title'}
+        self.assertEqual(jsonld.from_jsonld_dict({**title, 'foo:title': 'Table'}, StandardNameTable), fields)
+        # ... but not keys of another vocabulary with the same local name:
+        foreign = {**title, '@context': {**data['@context'], 'foaf': 'http://xmlns.com/foaf/0.1/'},
+                   'foaf:title': 'Wrong vocab'}
+        self.assertIsNone(jsonld.from_jsonld_dict(foreign, StandardNameTable))
+        self.assertIsNone(jsonld.from_jsonld_dict({**data, 'schema:version': 'v9'}, StandardNameTable))
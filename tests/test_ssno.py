@@ -4,6 +4,7 @@ import unittest
 
 import h5rdmtoolbox as h5tbx
 import ontolutils
+import pydantic
 import requests.exceptions
 import yaml
 from ontolutils import QUDT_UNIT
@@ -12,6 +13,7 @@ import ssnolib
 from ssnolib import StandardName, StandardNameTable
 from ssnolib.dcat import Distribution
 from ssnolib.qudt import parse_unit
+from utils import use_temporary_snapshot_dir
 
 # ignore User Warnings:
 
@@ -61,13 +63,52 @@ SNT_JSONLD = """{
   ]
 }"""
 
+SNT_XML = """<?xml version="1.0"?>
+<standard_name_table xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+                     xsi:noNamespaceSchemaLocation="cf-standard-name-table-1.1.xsd">
+   <version_number>84</version_number>
+   <last_modified>2024-01-19T15:55:10Z</last_modified>
+   <institution>Centre for Environmental Data Analysis</institution>
+   <contact>support@ceda.ac.uk</contact>
+   <entry id="air_pressure">
+      <canonical_units>Pa</canonical_units>
+      <grib>1</grib>
+      <amip>plev</amip>
+      <description>Air pressure is the force per unit area which would be exerted when the moving gas molecules of which the air is composed strike a theoretical surface of any orientation.</description>
+   </entry>
+   <entry id="air_temperature">
+      <canonical_units>K</canonical_units>
+      <grib>11</grib>
+      <amip>ta</amip>
+      <description>Air temperature is the bulk temperature of the air, not the surface (skin) temperature.</description>
+   </entry>
+   <entry id="area_fraction">
+      <canonical_units>1</canonical_units>
+      <grib></grib>
+      <amip></amip>
+      <description></description>
+   </entry>
+   <alias id="atmosphere_content_of_sulfate_aerosol">
+      <entry_id>atmosphere_mass_content_of_sulfate_dry_aerosol_particles</entry_id>
+   </alias>
+</standard_name_table>"""
+
+
+def _table_content(snt):
+    return (snt.title, snt.version,
+            [(sn.standard_name, sn.canonical_units, sn.description) for sn in snt.standard_names])
+
 
 class TestSSNO(unittest.TestCase):
 
+    def setUp(self):
+        self.snapshot_dir = use_temporary_snapshot_dir(self)
+
     def tearDown(self):
         pathlib.Path('snt.json').unlink(missing_ok=True)
         pathlib.Path('snt.yaml').unlink(missing_ok=True)
         pathlib.Path('snt2.yaml').unlink(missing_ok=True)
+        pathlib.Path('snt.xml').unlink(missing_ok=True)
 
     def test_standard_name(self):
         sn = StandardName(standard_name='x_velocity',
@@ -142,14 +183,244 @@ class TestSSNO(unittest.TestCase):
         self.assertEqual(snt_loaded.standard_names[1].canonical_units, str(parse_unit('m s-1')))
         pathlib.Path('snt.json').unlink(missing_ok=True)
 
+    def test_standard_name_table_lookup(self):
+        snt = StandardNameTable()
+        self.assertIsNone(snt.get_standard_name('x_velocity'))
+        self.assertEqual(snt.contains(['x_velocity']), [False])
+
+        snt = StandardNameTable(standard_names=[
+            StandardName(standard_name='x_velocity', description='x component of velocity', canonical_units='m s-1'),
+            StandardName(standard_name='y_velocity', description='y component of velocity', canonical_units='m s-1')
+        ])
+        self.assertEqual(snt.get_standard_name('x_velocity').description, 'x component of velocity')
+        self.assertIsNone(snt.get_standard_name('z_velocity'))
+
+        # appending updates the index:
+        snt.standard_names.append(StandardName(standard_name='z_velocity',
+                                               description='z component of velocity',
+                                               canonical_units='m s-1'))
+        self.assertEqual(snt.get_standard_name('z_velocity').description, 'z component of velocity')
+
+        # reassigning rebuilds the index:
+        snt.standard_names = [StandardName(standard_name='static_pressure', description='Static pressure',
+                                           canonical_units='Pa')]
+        self.assertIsNone(snt.get_standard_name('x_velocity'))
+        self.assertEqual(snt.get_standard_name('static_pressure').canonical_units, str(parse_unit('Pa')))
+
+        # renaming in place is detected on lookup:
+        snt.standard_names[0].standard_name = 'absolute_pressure'
+        self.assertIsNone(snt.get_standard_name('static_pressure'))
+        self.assertEqual(snt.get_standard_name('absolute_pressure').description, 'Static pressure')
+
+        self.assertEqual(snt.contains(['absolute_pressure', 'x_velocity']), [True, False])
+        sns = snt.get_many(['x_velocity', 'absolute_pressure'])
+        self.assertIsNone(sns[0])
+        self.assertEqual(sns[1].standard_name, 'absolute_pressure')
+
+    def test_standard_name_table_sorted_queries(self):
+        names = ['y_velocity', 'x_velocity_at_fan_inlet', 'static_pressure_at_fan_inlet', 'x_velocity',
+                 'static_pressure']
+        snt = StandardNameTable(standard_names=[StandardName(standard_name=n, description='', canonical_units='')
+                                                for n in names])
+        self.assertEqual([sn.standard_name for sn in snt.iter_sorted()], sorted(names))
+        self.assertEqual([sn.standard_name for sn in snt.standard_names], names)
+        self.assertEqual([sn.standard_name for sn in snt.get_by_prefix('x_velocity')],
+                         ['x_velocity', 'x_velocity_at_fan_inlet'])
+        self.assertEqual([sn.standard_name for sn in snt.get_by_prefix('x_velocity_')],
+                         ['x_velocity_at_fan_inlet'])
+        self.assertEqual(snt.get_by_prefix('z_'), [])
+        self.assertEqual([sn.standard_name for sn in snt.get_by_suffix('_at_fan_inlet')],
+                         ['static_pressure_at_fan_inlet', 'x_velocity_at_fan_inlet'])
+        self.assertEqual([sn.standard_name for sn in snt.get_by_range('static_pressure_at', 'y')],
+                         ['static_pressure_at_fan_inlet', 'x_velocity', 'x_velocity_at_fan_inlet'])
+
+        snt.standard_names.append(StandardName(standard_name='x_coordinate', description='', canonical_units='m'))
+        self.assertEqual([sn.standard_name for sn in snt.get_by_prefix('x_')],
+                         ['x_coordinate', 'x_velocity', 'x_velocity_at_fan_inlet'])
+        del snt.standard_names[0]
+        self.assertEqual([sn.standard_name for sn in snt.get_by_prefix('y_')], [])
+
+    def test_standard_name_table_decompose(self):
+        from ssnolib.standard_name_table import Location, Device, ReferenceFrame, Component
+        snt = StandardNameTable(
+            standard_names=[StandardName(standard_name=n, description='', canonical_units='')
+                            for n in ('velocity', 'static_pressure_difference', 'pressure_at_sea_level')],
+            locations=[Location(name='fan_inlet', description='Fan inlet'),
+                       Location(name='fan', description='The fan'),
+                       Location(name='sea_level', description='Sea level')],
+            devices=[Device(name='fan', description='The test fan')],
+            reference_frames=[ReferenceFrame(name='rotating_frame', description='Rotating frame',
+                                             components=[Component(name='x', description='x-component'),
+                                                         Component(name='y', description='y-component')])]
+        )
+        qn = snt.decompose('static_pressure_difference_across_fan_at_fan_inlet')
+        self.assertEqual(qn.standard_name, 'static_pressure_difference')
+        self.assertEqual(qn.device, 'fan')
+        self.assertEqual(qn.location, 'fan_inlet')
+        self.assertIsNone(qn.component)
+
+        qn = snt.decompose('x_velocity_in_rotating_frame')
+        self.assertEqual((qn.component, qn.standard_name, qn.reference_frame), ('x', 'velocity', 'rotating_frame'))
+
+        # the base name contains a qualification itself:
+        qn = snt.decompose('pressure_at_sea_level_across_fan')
+        self.assertEqual((qn.standard_name, qn.device, qn.location), ('pressure_at_sea_level', 'fan', None))
+
+        self.assertIsNone(snt.decompose('temperature_at_fan_inlet'))
+        self.assertEqual(snt.decompose('temperature_at_fan_inlet', validate=False).standard_name, 'temperature')
+        self.assertIsNone(snt.decompose('velocity_at_fan_outlet'))
+        self.assertIsNone(snt.decompose('velocity_in_rotating_frame_at_fan_inlet'))  # wrong order
+
+        decomposer = snt._get_decomposer()
+        self.assertIs(snt._get_decomposer(), decomposer)
+        snt.locations.append(Location(name='fan_outlet', description='Fan outlet'))
+        self.assertIsNot(snt._get_decomposer(), decomposer)
+        results = snt.decompose_many(['velocity_at_fan_outlet', 'unknown', 'velocity_at_fan_outlet'])
+        self.assertEqual(results[0].location, 'fan_outlet')
+        self.assertIsNone(results[1])
+        self.assertEqual(results[0], results[2])
+
+    def test_standard_name_table_validate_names(self):
+        from ssnolib.standard_name_table import Location, NameValidationResult
+        snt = StandardNameTable()
+        result = snt.validate_names(['velocity', 'velocity'])
+        self.assertEqual(result.codes.tolist(), [0, 0])
+        self.assertEqual(result.failures.tolist(), [0, 1])
+
+        snt = StandardNameTable(
+            standard_names=[StandardName(standard_name=n, description='', canonical_units='')
+                            for n in ('velocity', 'static_pressure')],
+            locations=[Location(name='fan_inlet', description='Fan inlet')]
+        )
+        names = ['velocity', 'velocity_at_fan_inlet', 'temperature', 'velocity', 'static_pressure_at_fan_outlet']
+        result = snt.validate_names(iter(names))
+        self.assertEqual(result.codes.tolist(), [NameValidationResult.EXACT,
+                                                 NameValidationResult.QUALIFIED,
+                                                 NameValidationResult.UNKNOWN,
+                                                 NameValidationResult.EXACT,
+                                                 NameValidationResult.UNKNOWN])
+        self.assertEqual(result.valid.tolist(), [True, True, False, True, False])
+        self.assertEqual(result.failures.tolist(), [2, 4])
+
+        # changes of the table are reflected:
+        snt.locations.append(Location(name='fan_outlet', description='Fan outlet'))
+        snt.standard_names.append(StandardName(standard_name='temperature', description='', canonical_units='K'))
+        result = snt.validate_names(names)
+        self.assertEqual(result.failures.tolist(), [])
+        self.assertEqual(snt.validate_names([]).codes.tolist(), [])
+
+    def test_standard_name_table_search(self):
+        snt = StandardNameTable()
+        self.assertEqual(snt.search('pressure'), [])
+        snt = StandardNameTable(standard_names=[
+            StandardName(standard_name='air_pressure', description='Air pressure is the force per unit area.',
+                         canonical_units='Pa'),
+            StandardName(standard_name='surface_air_pressure', description='Air pressure at the surface.',
+                         canonical_units='Pa'),
+            StandardName(standard_name='air_temperature', description='Bulk temperature of the air.',
+                         canonical_units='K'),
+        ])
+        results = snt.search('pressure at the surface')
+        self.assertEqual([sn.standard_name for sn in results[:2]], ['surface_air_pressure', 'air_pressure'])
+        self.assertEqual([sn.standard_name for sn in snt.search('TEMPERATURE')], ['air_temperature'])
+        self.assertEqual(len(snt.search('air', k=2)), 2)
+        self.assertEqual(snt.search('velocity'), [])
+
+        # the index is updated incrementally:
+        index = snt._get_index('text', None)
+        snt.standard_names.append(StandardName(standard_name='x_velocity', description='x component of velocity',
+                                               canonical_units='m/s'))
+        self.assertIs(snt._get_index('text', None), index)
+        self.assertEqual([sn.standard_name for sn in snt.search('velocity')], ['x_velocity'])
+
+    def test_standard_name_table_suggest(self):
+        from ssnolib.search import levenshtein
+        self.assertEqual(levenshtein('air_temperature', 'air_temprature'), 1)
+        self.assertEqual(levenshtein('air_pressure', 'air_temperature', max_distance=20), 7)
+        self.assertIsNone(levenshtein('air_pressure', 'air_temperature', max_distance=2))
+
+        snt = StandardNameTable()
+        self.assertEqual(snt.suggest('air_temprature'), [])
+        snt = StandardNameTable(standard_names=[
+            StandardName(standard_name=n, description='A description.', canonical_units='K')
+            for n in ('air_temperature', 'air_potential_temperature', 'sea_water_temperature', 'sea_temperature')
+        ])
+        self.assertEqual([sn.standard_name for sn in snt.suggest('air_temprature')], ['air_temperature'])
+        self.assertEqual([sn.standard_name for sn in snt.suggest('sea_water_temprature', max_distance=7)],
+                         ['sea_water_temperature', 'sea_temperature'])
+        self.assertEqual(len(snt.suggest('sea_water_temprature', max_distance=7, k=1)), 1)
+        self.assertEqual(snt.suggest('velocity'), [])
+        # short names are compared with all names:
+        self.assertEqual(snt.suggest('x', max_distance=1), [])
+
+        index = snt._get_index('fuzzy', None)
+        snt.standard_names.append(StandardName(standard_name='x_velocity', description='A description.',
+                                               canonical_units='m/s'))
+        self.assertIs(snt._get_index('fuzzy', None), index)
+        suggestions = snt.suggest_many(['x_velocty', 'air_temprature', 'x_velocty'])
+        self.assertEqual([[sn.standard_name for sn in s] for s in suggestions],
+                         [['x_velocity'], ['air_temperature'], ['x_velocity']])
+
+    def test_standard_name_table_dimensions(self):
+        snt = StandardNameTable()
+        self.assertEqual(snt.compatible_with('Pa'), [])
+        self.assertEqual(snt.group_by_dimension(), {})
+        snt = StandardNameTable(standard_names=[
+            StandardName(standard_name=n, description='', canonical_units=u)
+            for n, u in (('static_pressure', 'Pa'), ('x_velocity', 'm s-1'), ('dynamic_pressure', 'N m-2'),
+                         ('y_velocity', 'm/s'), ('temperature', 'K'), ('unknown', 'foo'))
+        ])
+        self.assertEqual([sn.standard_name for sn in snt.compatible_with('kPa')],
+                         ['static_pressure', 'dynamic_pressure'])
+        self.assertEqual([sn.standard_name for sn in snt.compatible_with(snt.standard_names[1])],
+                         ['x_velocity', 'y_velocity'])
+        self.assertEqual(snt.compatible_with('mol'), [])
+        with self.assertRaises(KeyError):
+            snt.compatible_with('foo')
+        groups = snt.group_by_dimension()
+        self.assertEqual({k: [sn.standard_name for sn in v] for k, v in groups.items()},
+                         {(-1, 1, -2, 0, 0, 0, 0): ['static_pressure', 'dynamic_pressure'],
+                          (1, 0, -1, 0, 0, 0, 0): ['x_velocity', 'y_velocity'],
+                          (0, 0, 0, 0, 1, 0, 0): ['temperature']})
+
+        snt.standard_names.append(StandardName(standard_name='total_pressure', description='', canonical_units='Pa'))
+        self.assertEqual([sn.standard_name for sn in snt.compatible_with('Pa')],
+                         ['static_pressure', 'dynamic_pressure', 'total_pressure'])
+
+    def test_standard_name_convert(self):
+        import numpy as np
+        sn = StandardName(standard_name='static_pressure', description='', canonical_units='Pa')
+        data = np.array([1., 2.])
+        np.testing.assert_allclose(sn.convert(data, 'hPa'), [100., 200.])
+        sn.convert(data, 'kPa', out=data)
+        np.testing.assert_allclose(data, [1000., 2000.])
+        with self.assertRaises(ValueError):
+            sn.convert(data, 'K')
+
     def test_standard_name_table_from_jsonld(self):
+        from unittest import mock
         snt_jsonld_filename = pathlib.Path(__this_dir__, 'snt.json')
         with open(snt_jsonld_filename, 'w') as f:
             json.dump(json.loads(SNT_JSONLD), f)
-        snt = StandardNameTable.parse(snt_jsonld_filename, fmt='jsonld')
+        # the document is mapped directly to the fields, the generic (rdflib) reader is not used:
+        with mock.patch.object(StandardNameTable, 'from_jsonld', side_effect=AssertionError) as from_jsonld:
+            snt = StandardNameTable.parse(snt_jsonld_filename, fmt='jsonld', use_cache=False)
+            from_jsonld.assert_not_called()
+        self.assertEqual(snt.title, 'OpenCeFaDB Fan Standard Name Table')
+        self.assertEqual(len(snt.standard_names), 4)
+        self.assertEqual(snt.get_standard_name('ambient_temperature').canonical_units, str(parse_unit('K')))
+        self.assertEqual(snt.standard_names[0].id, 'local:39257b94-d31c-480e-a43c-8ae7f57fae6d')
 
-        snt_jsonld_filename.unlink(missing_ok=True)
+        # unexpected documents are read via the generic reader:
+        data = json.loads(SNT_JSONLD)
+        data['ssnolib:unknown_field'] = 'value'
+        with open(snt_jsonld_filename, 'w') as f:
+            json.dump(data, f)
+        snt = StandardNameTable.parse(snt_jsonld_filename, fmt='jsonld', use_cache=False)
         self.assertEqual(snt.title, 'OpenCeFaDB Fan Standard Name Table')
+        self.assertEqual(len(snt.standard_names), 4)
+
+        snt_jsonld_filename.unlink(missing_ok=True)
 
     def test_standard_name_table_from_yaml(self):
         pathlib.Path('snt.yaml').unlink(missing_ok=True)
@@ -176,6 +447,145 @@ class TestSSNO(unittest.TestCase):
         snt = StandardNameTable.parse('snt.yaml', fmt=None)
         self.assertEqual(snt.title, 'SNT')
 
+    def test_standard_name_table_from_xml_file(self):
+        snt_xml_filename = pathlib.Path('snt.xml')
+        with open(snt_xml_filename, 'w') as f:
+            f.write(SNT_XML)
+
+        snt = StandardNameTable.parse(snt_xml_filename)
+        self.assertEqual(snt.version, '84')
+        self.assertEqual(snt.title, 'snt')
+        self.assertEqual(snt.creator.mbox, 'support@ceda.ac.uk')
+        self.assertEqual([sn.standard_name for sn in snt.standard_names],
+                         ['air_pressure', 'air_temperature', 'area_fraction'])
+        self.assertEqual(snt.get_standard_name('air_temperature').canonical_units, str(parse_unit('K')))
+        self.assertEqual(snt.get_standard_name('area_fraction').description, '')
+
+        sns = StandardNameTable.iter_parse(snt_xml_filename)
+        self.assertNotIsInstance(sns, list)
+        sns = list(sns)
+        self.assertEqual(len(sns), 3)
+        self.assertIsInstance(sns[0], StandardName)
+        self.assertEqual(sns[0].canonical_units, str(parse_unit('Pa')))
+
+        snt_xml_filename.unlink(missing_ok=True)
+
+    def test_standard_name_table_lazy(self):
+        import pydantic
+        from ssnolib.index import LazyStandardNameList
+        snt_xml_filename = pathlib.Path('snt.xml')
+        with open(snt_xml_filename, 'w') as f:
+            f.write(SNT_XML)
+
+        snt = StandardNameTable.parse(snt_xml_filename, lazy=True, use_cache=False)
+        self.assertIsInstance(snt.standard_names, LazyStandardNameList)
+        self.assertEqual(len(snt.standard_names), 3)
+        self.assertTrue(all(isinstance(sn, dict) for sn in snt.standard_names.iter_raw()))
+
+        # lookups only validate the requested standard name:
+        self.assertEqual(snt.contains(['air_pressure', 'x_velocity']), [True, False])
+        sn = snt.get_standard_name('air_temperature')
+        self.assertIsInstance(sn, StandardName)
+        self.assertEqual(sn.canonical_units, str(parse_unit('K')))
+        self.assertEqual([type(sn) for sn in snt.standard_names.iter_raw()], [dict, StandardName, dict])
+        self.assertIs(snt.standard_names[1], sn)
+
+        self.assertEqual([sn.standard_name for sn in snt.standard_names],
+                         ['air_pressure', 'air_temperature', 'area_fraction'])
+        self.assertTrue(all(isinstance(sn, StandardName) for sn in snt.standard_names.iter_raw()))
+        self.assertEqual(snt.model_dump()['standard_names'][0]['standard_name'], 'air_pressure')
+
+        invalid_snt = StandardNameTable(standard_names=LazyStandardNameList([{'standard_name': 'x',
+                                                                               'description': 123}]))
+        with self.assertRaises(pydantic.ValidationError):
+            invalid_snt.validate_standard_names()
+        snt_xml_filename.unlink(missing_ok=True)
+
+    def test_standard_name_table_snapshot_cache(self):
+        from unittest import mock
+        from ssnolib import plugins, snapshot
+        snt_xml_filename = pathlib.Path('snt.xml')
+        with open(snt_xml_filename, 'w') as f:
+            f.write(SNT_XML)
+        key = snapshot.get_key(snt_xml_filename, 'XMLReader')
+        snapshot_filename = self.snapshot_dir / f'{key}{snapshot.SNAPSHOT_SUFFIX}'
+        self.assertEqual(snapshot.get_snapshot_dir(), self.snapshot_dir)
+
+        snt = StandardNameTable.parse(snt_xml_filename, use_cache=False)
+        self.assertFalse(snapshot_filename.exists())
+
+        snt = StandardNameTable.parse(snt_xml_filename)
+        self.assertTrue(snapshot_filename.exists())
+
+        with mock.patch.object(plugins.XMLReader, 'parse', side_effect=RuntimeError('not cached')):
+            cached_snt = StandardNameTable.parse(snt_xml_filename)
+            with self.assertRaises(RuntimeError):
+                StandardNameTable.parse(snt_xml_filename, use_cache=False)
+        self.assertEqual(cached_snt.model_dump(), snt.model_dump())
+        self.assertEqual(cached_snt.get_standard_name('air_temperature').canonical_units, str(parse_unit('K')))
+
+        # a changed file is not read from the cache:
+        with open(snt_xml_filename, 'w') as f:
+            f.write(SNT_XML.replace('<version_number>84</version_number>', '<version_number>85</version_number>'))
+        self.assertEqual(StandardNameTable.parse(snt_xml_filename).version, '85')
+
+        snapshot.evict(max_size=snapshot_filename.stat().st_size - 1)
+        self.assertFalse(snapshot_filename.exists())
+        snt_xml_filename.unlink(missing_ok=True)
+
+    def test_standard_name_table_parse_many(self):
+        snt_xml_filename = pathlib.Path('snt_many.xml')
+        with open(snt_xml_filename, 'w') as f:
+            f.write(SNT_XML)
+        snt_yaml_filename = __this_dir__ / 'data/test_snt.yaml'
+        invalid_filename = pathlib.Path('snt_invalid.yaml')
+        with open(invalid_filename, 'w') as f:
+            f.write('standard_names:\n  x_velocity:\n    units: m/s\n    description: 3\n')
+        sources = [snt_xml_filename, snt_yaml_filename, 'missing.xml', invalid_filename,
+                   Distribution(download_URL=snt_yaml_filename)]
+        try:
+            for max_workers in (1, 3):
+                results = StandardNameTable.parse_many(sources, max_workers=max_workers, use_cache=False)
+                self.assertEqual(len(results), 5)
+                for result, source in zip(results[:2], sources):
+                    self.assertIsInstance(result, StandardNameTable)
+                    self.assertEqual(_table_content(result),
+                                     _table_content(StandardNameTable.parse(source, use_cache=False)))
+                self.assertIsInstance(results[2], AssertionError)
+                self.assertIsInstance(results[3], pydantic.ValidationError)
+                self.assertEqual(_table_content(results[4]), _table_content(results[1]))
+                self.assertEqual(results[0].get_standard_name('air_temperature').canonical_units,
+                                 str(parse_unit('K')))
+        finally:
+            snt_xml_filename.unlink(missing_ok=True)
+            invalid_filename.unlink(missing_ok=True)
+
+    def test_standard_name_table_validation_workers(self):
+        snt_filename = pathlib.Path('snt_workers.yaml')
+        standard_names = {f'x_velocity_{i}': {'units': 'm/s', 'description': f'Velocity {i}'} for i in range(300)}
+        with open(snt_filename, 'w') as f:
+            yaml.safe_dump({'name': 'Large table', 'standard_names': standard_names}, f, sort_keys=False)
+        try:
+            snt = StandardNameTable.parse(snt_filename, use_cache=False)
+            parallel_snt = StandardNameTable.parse(snt_filename, use_cache=False, validation_workers=2)
+            self.assertEqual(_table_content(parallel_snt), _table_content(snt))
+            self.assertEqual(parallel_snt.get_standard_name('x_velocity_299').description, 'Velocity 299')
+
+            for i in (7, 150, 299):
+                standard_names[f'x_velocity_{i}']['description'] = i
+            with open(snt_filename, 'w') as f:
+                yaml.safe_dump({'name': 'Large table', 'standard_names': standard_names}, f, sort_keys=False)
+            with self.assertRaises(pydantic.ValidationError) as serial_error:
+                StandardNameTable.parse(snt_filename, use_cache=False)
+            with self.assertRaises(pydantic.ValidationError) as parallel_error:
+                StandardNameTable.parse(snt_filename, use_cache=False, validation_workers=3)
+            self.assertEqual([e['loc'] for e in parallel_error.exception.errors()],
+                             [('standard_names', i, 'description') for i in (7, 150, 299)])
+            self.assertEqual([(e['loc'], e['type']) for e in parallel_error.exception.errors()],
+                             [(e['loc'], e['type']) for e in serial_error.exception.errors()])
+        finally:
+            snt_filename.unlink(missing_ok=True)
+
     def test_standard_name_table_from_xml(self):
         from ssnolib.utils import download_file
         cf_contention = 'http://cfconventions.org/Data/cf-standard-names/current/src/cf-standard-name-table.xml'
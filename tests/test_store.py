@@ -0,0 +1,80 @@
+import pathlib
+import unittest
+
+from ssnolib import StandardName, StandardNameTable
+from ssnolib.qudt import parse_unit
+from ssnolib.standard_name_table import Location
+from ssnolib.store import SQLiteStore
+
+__this_dir__ = pathlib.Path(__file__).parent
+
+
+def _build_table(title, names) -> StandardNameTable:
+    return StandardNameTable(
+        title=title,
+        standard_names=[StandardName(standard_name=n, description=d, canonical_units=u) for n, d, u in names],
+        locations=[Location(name='fan_inlet', description='The inlet of the fan')]
+    )
+
+
+class TestSQLiteStore(unittest.TestCase):
+
+    def setUp(self):
+        self.snt1 = _build_table('Table 1', [
+            ('air_pressure', 'Air pressure is the force per unit area of the air.', 'Pa'),
+            ('surface_air_pressure', 'Air pressure at the surface of the earth.', 'Pa'),
+            ('air_temperature', 'Bulk temperature of the air.', 'K'),
+        ])
+        self.snt2 = _build_table('Table 2', [
+            ('x_velocity', 'x component of the velocity.', 'm/s'),
+            ('static_pressure', 'Static pressure of a fluid.', 'Pa'),
+        ])
+
+    def tearDown(self):
+        pathlib.Path(__this_dir__ / 'snt.db').unlink(missing_ok=True)
+
+    def test_store(self):
+        db_filename = __this_dir__ / 'snt.db'
+        with SQLiteStore(db_filename) as store:
+            self.assertEqual(store.add(self.snt1), 'Table 1')
+            self.assertEqual(store.add(self.snt2, name='t2'), 't2')
+            with self.assertRaises(ValueError):
+                store.add(self.snt2, name='t2')
+            self.assertEqual(store.tables(), ['Table 1', 't2'])
+
+        with SQLiteStore(db_filename) as store:
+            sn = store.get_standard_name('air_temperature')
+            self.assertIsInstance(sn, StandardName)
+            self.assertEqual(sn.canonical_units, str(parse_unit('K')))
+            self.assertIsNone(store.get_standard_name('air_temperature', table='t2'))
+            self.assertIsNone(store.get_standard_name('unknown'))
+
+            self.assertEqual([sn.standard_name for sn in store.filter_by_units('Pa')],
+                             ['air_pressure', 'surface_air_pressure', 'static_pressure'])
+            self.assertEqual([sn.standard_name for sn in store.filter_by_units(str(parse_unit('Pa')), table='t2')],
+                             ['static_pressure'])
+
+            results = store.search('pressure at the surface')
+            self.assertEqual(results[0].standard_name, 'surface_air_pressure')
+            self.assertIn('air_pressure', [sn.standard_name for sn in results])
+            self.assertEqual(len(store.search('pressure', limit=1)), 1)
+            self.assertEqual([sn.standard_name for sn in store.search('pressure', table='t2')], ['static_pressure'])
+            self.assertEqual(store.search('...'), [])
+
+            self.assertTrue(store.has_qualification('fan_inlet', field='locations', table='t2'))
+            self.assertFalse(store.has_qualification('fan_inlet', field='devices'))
+
+            snt = store.get_table('Table 1')
+            self.assertEqual(snt.title, 'Table 1')
+            self.assertEqual([sn.standard_name for sn in snt.standard_names],
+                             [sn.standard_name for sn in self.snt1.standard_names])
+            self.assertEqual(snt.locations[0].name, 'fan_inlet')
+            self.assertEqual(snt.get_standard_name('air_pressure').description,
+                             'Air pressure is the force per unit area of the air.')
+
+            store.add(self.snt1, name='t2', overwrite=True)
+            self.assertEqual([sn.standard_name for sn in store.search('static')], [])
+            store.remove('t2')
+            self.assertEqual(store.tables(), ['Table 1'])
+            with self.assertRaises(KeyError):
+                store.get_table('t2')
@@ -0,0 +1,95 @@
+import unittest
+
+from ontolutils import QUDT_UNIT
+
+from ssnolib import units
+from ssnolib.units import parse_unit
+
+
+class TestUnits(unittest.TestCase):
+
+    def test_tokenize(self):
+        self.assertEqual(units.parse('m s-1'), [('m', 1), ('s', -1)])
+        self.assertEqual(units.parse('kg/m^3'), [('kg', 1), ('m', -3)])
+        self.assertEqual(units.parse('W/(m**2 sr)'), [('W', 1), ('m', -2), ('sr', -1)])
+        self.assertEqual(units.parse('1/s'), [('s', -1)])
+        for invalid in ('m/', 'm 2', '(m', 'm^', 'm#s'):
+            with self.assertRaises(KeyError):
+                units.parse(invalid)
+
+    def test_resolve_symbol(self):
+        self.assertEqual(units.resolve_symbol('kg'), 'KiloGM')
+        self.assertEqual(units.resolve_symbol('mm'), 'MilliM')
+        self.assertEqual(units.resolve_symbol('min'), 'MIN')
+        self.assertEqual(units.resolve_symbol('Kelvin'), 'K')
+        with self.assertRaises(KeyError):
+            units.resolve_symbol('kday')
+
+    def test_parse_unit(self):
+        for unit_str in ('m/s', 'm s-1', 'm*s-1', 'm*s^-1', 'm*s**-1', 'm s**-1', 'm.s-1', 'm·s-1'):
+            self.assertEqual(parse_unit(unit_str), QUDT_UNIT.M_PER_SEC)
+        for unit_str in ('kg/m**3', 'kg/m^3', 'kg/m3', 'kg m-3', 'kg*m^-3'):
+            self.assertEqual(parse_unit(unit_str), QUDT_UNIT.KiloGM_PER_M3)
+        self.assertEqual(parse_unit('1/s^2'), QUDT_UNIT.PER_SEC2)
+        self.assertEqual(parse_unit('kg s-1 m-1'), QUDT_UNIT.KiloGM_PER_M_SEC)
+        self.assertEqual(parse_unit('kg degree_C m-2'), QUDT_UNIT.DEG_C_KiloGM_PER_M2)
+        self.assertEqual(parse_unit('mol m-2 s-1 m-1'), QUDT_UNIT.MOL_PER_M2_SEC_M)
+        self.assertEqual(parse_unit('(m/s)^2'), QUDT_UNIT.M2_PER_SEC2)
+        self.assertEqual(parse_unit('dbar'), QUDT_UNIT.DeciBAR)
+        # units defined with different factor orders have one IRI, as in the previous lookup table:
+        for unit_str in ('s-1 m-3', 'm-3 s-1', '1/(s m3)'):
+            self.assertEqual(parse_unit(unit_str), QUDT_UNIT.PER_M3_SEC)
+        for unit_str in ('Pa m s-1', 'm Pa s-1'):
+            self.assertEqual(parse_unit(unit_str), QUDT_UNIT.PA_M_PER_SEC)
+        self.assertEqual(parse_unit('W sr-1 m-2'), parse_unit('W m-2 sr-1'))
+        for unit_str in ('', ' ', '1', 'None', 'dimensionless'):
+            self.assertEqual(parse_unit(unit_str), QUDT_UNIT.UNITLESS)
+        self.assertEqual(str(parse_unit('1/pixel')), 'https://matthiasprobst.github.io/pivmeta#PER-PIXEL')
+        with self.assertRaises(KeyError):
+            parse_unit('m2 s')  # valid, but not part of QUDT
+        with self.assertRaises(KeyError):
+            parse_unit('foo')
+
+    def test_parse_unit_cached(self):
+        parse_unit.cache_clear()
+        for _ in range(3):
+            parse_unit('W m-2 sr-1')
+        info = parse_unit.cache_info()
+        self.assertEqual((info.hits, info.misses), (2, 1))
+
+    def test_get_dimension(self):
+        pressure = (-1, 1, -2, 0, 0, 0, 0)
+        for unit in ('Pa', 'N m-2', 'kg m-1 s-2', 'hPa', 'dbar', str(QUDT_UNIT.PA)):
+            self.assertEqual(units.get_dimension(unit), pressure)
+        self.assertEqual(units.get_dimension('m/s'), (1, 0, -1, 0, 0, 0, 0))
+        self.assertEqual(units.get_dimension(str(QUDT_UNIT.KiloGM_PER_M3)), (-3, 1, 0, 0, 0, 0, 0))
+        self.assertEqual(units.get_dimension(''), units.DIMENSIONLESS)
+        self.assertEqual(units.get_dimension('rad'), units.DIMENSIONLESS)
+        self.assertIsNone(units.get_dimension('foo'))
+        self.assertIsNone(units.get_dimension('http://example.org/units/FOO'))
+
+    def test_convert(self):
+        import numpy as np
+        self.assertEqual(units.get_conversion('hPa', 'Pa'), (100., 0.))
+        self.assertEqual(units.get_conversion('degree_C', 'K'), (1., 273.15))
+        self.assertEqual(units.get_conversion('K m-1', 'degree_C m-1'), (1., 0.))
+        scale, offset = units.get_conversion('km/h', str(QUDT_UNIT.M_PER_SEC))
+        self.assertAlmostEqual(scale, 1 / 3.6)
+        with self.assertRaises(ValueError):
+            units.get_conversion('m', 's')
+        with self.assertRaises(KeyError):
+            units.get_conversion('dB', 'dBZ')
+
+        data = np.array([1., 2., 3.])
+        np.testing.assert_allclose(units.convert(data, 'mm', 'm'), [0.001, 0.002, 0.003])
+        np.testing.assert_allclose(data, [1., 2., 3.])
+        self.assertIs(units.convert(data, 'm', 'm'), data)
+        result = units.convert(data, 'degree_C', 'K', out=data)
+        self.assertIs(result, data)
+        np.testing.assert_allclose(data, [274.15, 275.15, 276.15])
+
+        data = np.arange(12.).reshape(6, 2)
+        chunks = list(units.iter_convert(data, 'hPa', 'Pa', chunk_size=4))
+        self.assertEqual([sl for sl, _ in chunks], [slice(0, 2), slice(2, 4), slice(4, 6)])
+        np.testing.assert_allclose(np.concatenate([c for _, c in chunks]), data * 100)
+        np.testing.assert_allclose(data[0], [0., 1.])
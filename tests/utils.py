@@ -1,7 +1,24 @@
+import pathlib
+import shutil
+import tempfile
 import unittest
+from unittest import mock
 
 import rdflib
 
+from ssnolib import snapshot
+
+
+def use_temporary_snapshot_dir(testcase: unittest.TestCase) -> pathlib.Path:
+    """Let the snapshot cache of `StandardNameTable.parse()` use a temporary directory
+    until the end of the test, so that the user cache directory is not touched."""
+    snapshot_dir = pathlib.Path(tempfile.mkdtemp(prefix='ssnolib_snapshots_'))
+    patcher = mock.patch.object(snapshot, 'get_snapshot_dir', return_value=snapshot_dir)
+    patcher.start()
+    testcase.addCleanup(patcher.stop)
+    testcase.addCleanup(shutil.rmtree, snapshot_dir, ignore_errors=True)
+    return snapshot_dir
+
 
 class ClassTest(unittest.TestCase):
     test_jsonld_filename = 'https://raw.githubusercontent.com/matthiasprobst/SSNOlib/dev/tests/data/piv_dataset.jsonld'